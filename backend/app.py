@@ -2,6 +2,7 @@ from flask import Flask
 from config.config import Config
 from config.cors import init_cors
 from routes import register_routes
+from utils.resources import registry
 
 
 def create_app(config_class=Config):
@@ -14,6 +15,17 @@ def create_app(config_class=Config):
     # Register routes (blueprints)
     register_routes(app)
 
+    # Lexicons, indexes and models are shared by every service of the
+    # process; the blueprints' services have registered them by now
+    app.extensions["resources"] = registry
+    if app.config.get("PRELOAD_RESOURCES"):
+        stats = registry.preload(freeze=app.config.get("PRELOAD_FREEZE_GC", False))
+        budget = app.config.get("RESOURCE_LOAD_BUDGET")
+        if budget and stats["total_seconds"] > budget:
+            slowest = max(stats["resources"], key=lambda r: r["seconds"])
+            app.logger.warning("Loading resources took %.2f s (budget %.2f s); slowest: %s (%.2f s)",
+                               stats["total_seconds"], budget, slowest["name"], slowest["seconds"])
+
     @app.route("/")
     def index():
         return {"service": "TP_clinique backend", "status": "ok"}
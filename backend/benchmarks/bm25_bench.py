@@ -0,0 +1,49 @@
+"""Query latency of models.bm25_index as the corpus grows
+
+The article corpus is replicated 1x, 4x and 16x (each copy is a distinct
+set of passages) and the same queries are run with MaxScore pruning and
+with exhaustive scoring.
+
+Run from backend/: python -m benchmarks.bm25_bench
+"""
+import random
+import time
+
+import numpy as np
+
+from models.bm25_index import BM25Index, tokenize
+from utils.dataset import load_json, load_lines
+
+
+def latencies(fn, queries, k):
+    times = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q, k)
+        times.append(time.perf_counter() - start)
+    return np.array(times) * 1000
+
+
+def main(scales=(1, 4, 16), n_queries=200, k=5, seed=0):
+    articles = load_json("corpus", "articles_clean.json")
+    random.seed(seed)
+    queries = []
+    for line in random.sample(load_lines("corpus", "sentences.txt"), n_queries):
+        tokens = tokenize(line)
+        queries.append(" ".join(random.sample(tokens, min(4, len(tokens)))))
+
+    print(f"{len(queries)} queries, top {k}")
+    for scale in scales:
+        start = time.perf_counter()
+        index = BM25Index.build(articles * scale)
+        build = time.perf_counter() - start
+        print(f"\n  x{scale}: {len(index):,} passages, {index.postings.nbytes / 1e6:.1f} MB postings, "
+              f"built in {build:.1f} s")
+        for label, fn in (("maxscore", index.search), ("exhaustive", index.search_exhaustive)):
+            t = latencies(fn, queries, k)
+            print(f"    {label:<12} mean {t.mean():>7.3f} ms   p50 {np.percentile(t, 50):>7.3f} ms"
+                  f"   p95 {np.percentile(t, 95):>7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
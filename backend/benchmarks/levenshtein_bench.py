@@ -0,0 +1,48 @@
+"""Micro-benchmark for utils.levenshtein
+
+Run from backend/: python -m benchmarks.levenshtein_bench
+"""
+import random
+import time
+
+from utils.dataset import load_json
+from utils.levenshtein import (
+    MALAGASY_WEIGHTS,
+    bounded_distance,
+    distance,
+    distance_many,
+    myers_distance,
+)
+
+
+def timed(label, fn, n_pairs):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<32} {elapsed * 1000:>9.1f} ms  {n_pairs / elapsed:>12,.0f} pairs/s")
+    return elapsed
+
+
+def main(n_queries=20, seed=0):
+    words = load_json("lexiques", "dictionnaire_mg.json")
+    random.seed(seed)
+    queries = random.sample(words, n_queries)
+    n_pairs = n_queries * len(words)
+    print(f"{n_queries} queries x {len(words)} dictionary words")
+
+    base = timed("distance", lambda: [distance(q, w) for q in queries for w in words], n_pairs)
+    for k in (1, 2):
+        t = timed(f"bounded_distance(max={k})",
+                  lambda: [bounded_distance(q, w, k) for q in queries for w in words], n_pairs)
+        print(f"  {'':<32} x{base / t:.1f}")
+    t = timed("myers_distance", lambda: [myers_distance(q, w) for q in queries for w in words], n_pairs)
+    print(f"  {'':<32} x{base / t:.1f}")
+    t = timed("distance_many", lambda: [distance_many(q, words) for q in queries], n_pairs)
+    print(f"  {'':<32} x{base / t:.1f}")
+    t = timed("distance_many(MALAGASY_WEIGHTS)",
+              lambda: [distance_many(q, words, MALAGASY_WEIGHTS) for q in queries], n_pairs)
+    print(f"  {'':<32} x{base / t:.1f}")
+
+
+if __name__ == "__main__":
+    main()
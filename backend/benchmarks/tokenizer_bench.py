@@ -0,0 +1,48 @@
+"""Throughput of utils.text_processor on sentences.txt
+
+Compares the tokenizer with the ad-hoc tokenizations it replaces
+(str.split, the ASCII word regex of the old corpus cleaner), on the whole
+file at once and line by line.
+
+Run from backend/: python -m benchmarks.tokenizer_bench
+"""
+import re
+import time
+
+from utils.dataset import dataset_path
+from utils.text_processor import iter_words, tokenize
+
+ASCII_WORD_RE = re.compile(r"\b[a-zA-Z]{2,}\b")
+
+
+def timed(label, fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        n = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<36} {best * 1000:>8.1f} ms  {n / best:>12,.0f} tokens/s  ({n:,} tokens)")
+
+
+def main():
+    with open(dataset_path("corpus", "sentences.txt"), "r", encoding="utf-8") as f:
+        text = f.read()
+    lines = text.splitlines()
+    print(f"sentences.txt: {len(text):,} characters, {len(lines):,} lines")
+
+    print("\nwhole file")
+    timed("str.split", lambda: len(text.split()))
+    timed("ASCII regex findall (old cleaner)", lambda: len(ASCII_WORD_RE.findall(text)))
+    timed("tokenize (offsets, kinds, links)", lambda: len(tokenize(text)))
+    timed("tokenize + forms", lambda: len(tokenize(text).forms()[1]))
+    timed("tokenize + words", lambda: len(tokenize(text).words()))
+    timed("tokenize + compounds", lambda: len(tokenize(text).compounds()))
+
+    print("\nline by line")
+    timed("str.split", lambda: sum(len(line.split()) for line in lines))
+    timed("tokenize", lambda: sum(len(tokenize(line)) for line in lines))
+    timed("iter_words", lambda: sum(1 for line in lines for _ in iter_words(line)))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,32 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
 class Config:
     DEBUG = os.getenv("FLASK_DEBUG", "1") == "1"
     SECRET_KEY = os.getenv("SECRET_KEY", "changeme")
     JSON_SORT_KEYS = False
+
+    # Data locations (lexicons/corpus produced by scrapers, trained artifacts)
+    DATASET_DIR = os.getenv("DATASET_DIR", os.path.join(BASE_DIR, "data", "dataset"))
+    MODELS_DIR = os.getenv("MODELS_DIR", os.path.join(BASE_DIR, "data", "models"))
+
+    # Build/load heavy NLP resources in create_app instead of on first request
+    # (run prefork servers with the app preloaded, e.g. gunicorn --preload, so
+    # workers share them); a warning is logged when loading takes longer than
+    # RESOURCE_LOAD_BUDGET seconds (0 = no budget)
+    PRELOAD_RESOURCES = os.getenv("PRELOAD_RESOURCES", "1") == "1"
+    RESOURCE_LOAD_BUDGET = float(os.getenv("RESOURCE_LOAD_BUDGET", "0"))
+    # Prefork servers only: gc.freeze() after preloading so forked workers
+    # do not touch (and copy) the preloaded objects' pages
+    PRELOAD_FREEZE_GC = os.getenv("PRELOAD_FREEZE_GC", "0") == "1"
+
+    # Spell check: texts longer than this are checked in document mode,
+    # split into chunks of SPELLCHECK_CHUNK_CHARS across a process pool
+    # (SPELLCHECK_WORKERS=0 means one worker per CPU)
+    SPELLCHECK_DOCUMENT_THRESHOLD = int(os.getenv("SPELLCHECK_DOCUMENT_THRESHOLD", "100000"))
+    SPELLCHECK_CHUNK_CHARS = int(os.getenv("SPELLCHECK_CHUNK_CHARS", "65536"))
+    SPELLCHECK_WORKERS = int(os.getenv("SPELLCHECK_WORKERS", "0"))
     # Add other configuration values here
@@ -0,0 +1,288 @@
+"""BM25 passage index
+
+Articles are cut into passages of whole sentences, and every passage is a
+document of an inverted index scored with BM25 (``k1``, ``b``).
+
+Postings are compressed: for each term, the (doc id delta, tf) pairs are
+varint-encoded (7 bits per byte, high bit set on all but the last byte) in
+blocks of ``BLOCK`` postings. Per block the index keeps the last doc id
+and byte offset, so a block is decoded on its own: deltas restart from the
+previous block's last doc. Decoding a block is vectorized (terminator
+bytes -> group ids -> ``bincount`` of shifted 7-bit digits, then a
+``cumsum`` of the deltas).
+
+Queries run term-at-a-time MaxScore: terms are taken by decreasing
+maximum score; once the k-th best accumulated score exceeds the sum of the
+remaining terms' maxima, no unseen document can enter the top k, so the
+remaining terms only update the current candidates -- decoding just the
+blocks that contain them -- and candidates that cannot reach the k-th
+score are dropped.
+
+The index is saved in the ``utils.artifact`` format and memory-mapped.
+"""
+import re
+
+import numpy as np
+
+from utils.artifact import StringTable, open_artifact, write_artifact
+from utils.text_processor import iter_words
+
+BLOCK = 128
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def tokenize(text: str):
+    return [w.lower() for w, _, _ in iter_words(text)]
+
+
+def split_passages(text: str, max_words: int = 60):
+    """Consecutive sentences grouped into passages of about max_words words."""
+    passages, current, size = [], [], 0
+    for sentence in SENTENCE_END_RE.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        n = len(sentence.split())
+        if current and size + n > max_words:
+            passages.append(" ".join(current))
+            current, size = [], 0
+        current.append(sentence)
+        size += n
+    if current:
+        passages.append(" ".join(current))
+    return passages
+
+
+def encode_varints(values) -> bytes:
+    out = bytearray()
+    for v in values:
+        while v >= 0x80:
+            out.append((v & 0x7F) | 0x80)
+            v >>= 7
+        out.append(v)
+    return bytes(out)
+
+
+def decode_varints(data: np.ndarray) -> np.ndarray:
+    """All varints of a uint8 array, vectorized."""
+    if not len(data):
+        return np.zeros(0, dtype=np.int64)
+    last = data < 0x80
+    group = np.concatenate(([0], np.cumsum(last[:-1])))
+    starts = np.flatnonzero(np.concatenate(([True], last[:-1])))
+    shift = 7 * (np.arange(len(data)) - starts[group])
+    digits = (data & 0x7F).astype(np.int64) << shift
+    return np.bincount(group, weights=digits).astype(np.int64)
+
+
+class BM25Index:
+    def __init__(self, terms, term_blocks, term_df, term_max, block_last, block_offset,
+                 postings, doc_length, doc_article, passages, titles, k1: float = 1.2, b: float = 0.75):
+        self.terms = terms
+        # blocks of term i: term_blocks[i]:term_blocks[i + 1]
+        self.term_blocks = term_blocks
+        self.term_df = term_df
+        self.term_max = term_max
+        self.block_last = block_last
+        self.block_offset = block_offset
+        self.postings = postings
+        self.doc_length = doc_length
+        self.doc_article = doc_article
+        self.passages = passages
+        self.titles = titles
+        self.k1 = k1
+        self.b = b
+        self.avg_length = float(doc_length.mean()) if len(doc_length) else 0.0
+        self._norm = None
+
+    # ============================================
+    # BUILD / LOAD
+    # ============================================
+
+    @classmethod
+    def build(cls, articles, k1: float = 1.2, b: float = 0.75, max_words: int = 60):
+        """Index articles ({"title", "content_clean"}) passage by passage."""
+        passages, doc_article, titles = [], [], []
+        postings = {}
+        lengths = []
+        for a, article in enumerate(articles):
+            titles.append(article["title"])
+            for passage in split_passages(article.get("content_clean", ""), max_words):
+                tokens = tokenize(passage)
+                if not tokens:
+                    continue
+                doc = len(passages)
+                passages.append(passage)
+                doc_article.append(a)
+                lengths.append(len(tokens))
+                counts = {}
+                for token in tokens:
+                    counts[token] = counts.get(token, 0) + 1
+                for token, tf in counts.items():
+                    postings.setdefault(token, []).append((doc, tf))
+
+        doc_length = np.array(lengths, dtype=np.int32)
+        avg_length = float(doc_length.mean()) if lengths else 0.0
+        n_docs = len(passages)
+        terms = sorted(postings, key=lambda t: t.encode("utf-8"))
+
+        blob = bytearray()
+        term_blocks, block_last, block_offset = [0], [], []
+        term_df = np.zeros(len(terms), dtype=np.int32)
+        term_max = np.zeros(len(terms), dtype=np.float32)
+        for i, term in enumerate(terms):
+            plist = postings[term]
+            docs = np.array([d for d, _ in plist], dtype=np.int64)
+            tfs = np.array([tf for _, tf in plist], dtype=np.int64)
+            term_df[i] = len(docs)
+            idf = np.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = k1 * (1 - b + b * doc_length[docs] / avg_length)
+            term_max[i] = float((idf * tfs * (k1 + 1) / (tfs + norm)).max())
+            previous = 0
+            for start in range(0, len(docs), BLOCK):
+                block_docs = docs[start:start + BLOCK]
+                deltas = np.diff(block_docs, prepend=previous)
+                pairs = np.empty(2 * len(block_docs), dtype=np.int64)
+                pairs[0::2] = deltas
+                pairs[1::2] = tfs[start:start + BLOCK]
+                block_offset.append(len(blob))
+                blob += encode_varints(pairs.tolist())
+                previous = int(block_docs[-1])
+                block_last.append(previous)
+            term_blocks.append(len(block_last))
+        block_offset.append(len(blob))
+
+        return cls(
+            StringTable.from_strings(terms, sort=True),
+            np.array(term_blocks, dtype=np.int64),
+            term_df,
+            term_max,
+            np.array(block_last, dtype=np.int32),
+            np.array(block_offset, dtype=np.int64),
+            np.frombuffer(bytes(blob), dtype=np.uint8),
+            doc_length,
+            np.array(doc_article, dtype=np.int32),
+            StringTable.from_strings(passages),
+            StringTable.from_strings(titles),
+            k1, b,
+        )
+
+    def save(self, path: str):
+        arrays = {
+            "term_blocks": self.term_blocks,
+            "term_df": self.term_df,
+            "term_max": self.term_max,
+            "block_last": self.block_last,
+            "block_offset": self.block_offset,
+            "postings": self.postings,
+            "doc_length": self.doc_length,
+            "doc_article": self.doc_article,
+        }
+        write_artifact(path, arrays, meta={"k1": self.k1, "b": self.b, "block": BLOCK}, strings={
+            "terms": self.terms,
+            "passages": self.passages,
+            "titles": self.titles,
+        })
+
+    @classmethod
+    def load(cls, path: str):
+        artifact = open_artifact(path)
+        return cls(
+            artifact.strings("terms"),
+            artifact["term_blocks"],
+            artifact["term_df"],
+            artifact["term_max"],
+            artifact["block_last"],
+            artifact["block_offset"],
+            artifact["postings"],
+            artifact["doc_length"],
+            artifact["doc_article"],
+            artifact.strings("passages"),
+            artifact.strings("titles"),
+            artifact.meta["k1"],
+            artifact.meta["b"],
+        )
+
+    def __len__(self):
+        return len(self.doc_length)
+
+    # ============================================
+    # QUERIES
+    # ============================================
+
+    def decode_blocks(self, blocks):
+        """(doc ids, tfs) of the given blocks, concatenated in order."""
+        blocks = np.asarray(blocks, dtype=np.int64)
+        if not len(blocks):
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        starts, stops = self.block_offset[blocks], self.block_offset[blocks + 1]
+        sizes = stops - starts
+        index = np.arange(int(sizes.sum()), dtype=np.int64) + np.repeat(starts - np.cumsum(sizes) + sizes, sizes)
+        data = self.postings[index]
+        pairs = decode_varints(data)
+        deltas, tfs = pairs[0::2], pairs[1::2]
+        # Postings per block (two varints each), then doc ids: deltas restart
+        # at each block from the previous block's last doc (0 for a term's first)
+        byte_block = np.repeat(np.arange(len(blocks)), sizes)
+        counts = np.bincount(byte_block[data < 0x80], minlength=len(blocks)) // 2
+        posting_block = np.repeat(np.arange(len(blocks)), counts)
+        term = np.searchsorted(self.term_blocks, blocks, side="right") - 1
+        bases = np.where(blocks > self.term_blocks[term], self.block_last[blocks - 1], 0)
+        total = np.cumsum(deltas)
+        before = np.concatenate(([0], total))[np.cumsum(counts) - counts]
+        return bases[posting_block] + total - before[posting_block], tfs
+
+    def _scores(self, term: int, docs, tfs):
+        if self._norm is None:
+            self._norm = self.k1 * (1 - self.b + self.b * self.doc_length / self.avg_length)
+        n_docs = len(self.doc_length)
+        df = int(self.term_df[term])
+        idf = np.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+        return idf * tfs * (self.k1 + 1) / (tfs + self._norm[docs])
+
+    def search(self, query: str, k: int = 5):
+        """Top k (doc id, score), best first, with MaxScore pruning."""
+        ids = {self.terms.find(t) for t in tokenize(query)}
+        ids = sorted((i for i in ids if i >= 0), key=lambda i: -self.term_max[i])
+        if not ids:
+            return []
+        remaining = np.cumsum([float(self.term_max[i]) for i in ids][::-1])[::-1]
+
+        docs = np.zeros(0, dtype=np.int64)
+        scores = np.zeros(0)
+        threshold = 0.0
+        for n, term in enumerate(ids):
+            blocks = np.arange(self.term_blocks[term], self.term_blocks[term + 1])
+            if len(docs) >= k and remaining[n] < threshold:
+                # Non-essential term: only candidates that can still reach the top k
+                keep = scores + remaining[n] >= threshold
+                docs, scores = docs[keep], scores[keep]
+                needed = np.unique(np.searchsorted(self.block_last[blocks], docs))
+                blocks = blocks[needed[needed < len(blocks)]]
+                term_docs, tfs = self.decode_blocks(blocks)
+                pos = np.searchsorted(term_docs, docs)
+                pos = np.minimum(pos, max(len(term_docs) - 1, 0))
+                hit = (term_docs[pos] == docs) if len(term_docs) else np.zeros(len(docs), dtype=bool)
+                scores[hit] += self._scores(term, docs[hit], tfs[pos[hit]])
+            else:
+                term_docs, tfs = self.decode_blocks(blocks)
+                merged = np.union1d(docs, term_docs)
+                total = np.zeros(len(merged))
+                total[np.searchsorted(merged, docs)] += scores
+                total[np.searchsorted(merged, term_docs)] += self._scores(term, term_docs, tfs)
+                docs, scores = merged, total
+            if len(scores) >= k:
+                threshold = float(np.partition(scores, len(scores) - k)[len(scores) - k])
+
+        top = np.lexsort((docs, -scores))[:k]
+        return [(int(docs[i]), float(scores[i])) for i in top]
+
+    def search_exhaustive(self, query: str, k: int = 5):
+        """Reference scoring of every posting of every query term."""
+        scores = np.zeros(len(self.doc_length))
+        for term in {self.terms.find(t) for t in tokenize(query)} - {-1}:
+            docs, tfs = self.decode_blocks(np.arange(self.term_blocks[term], self.term_blocks[term + 1]))
+            scores[docs] += self._scores(term, docs, tfs)
+        top = np.lexsort((np.arange(len(scores)), -scores))[:k]
+        return [(int(i), float(scores[i])) for i in top if scores[i] > 0]
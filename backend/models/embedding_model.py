@@ -0,0 +1,214 @@
+"""Word embeddings and approximate nearest-neighbour index
+
+Vectors are learned offline from the cleaned corpus:
+
+1. word/context co-occurrences inside a symmetric window (weight 1/distance,
+   never across sentences), counted with NumPy over the flat token array
+2. positive PMI with context-distribution smoothing (counts ** 0.75)
+3. truncated SVD of the sparse PPMI matrix by randomized range finding, so
+   the dense V x V matrix is never formed; vectors are ``U * sqrt(S)``,
+   L2-normalized and stored as float16
+
+Neighbours are served by random-projection LSH: every vector gets one
+``bits``-bit signature per table (signs of projections on random
+hyperplanes) and each table is a sorted signature array. A query probes its
+own bucket and the buckets one bit away in every table, then ranks only the
+candidates found by exact cosine. Everything is saved in the
+``utils.artifact`` format and used straight from the memory-mapped file.
+"""
+import numpy as np
+
+from utils.artifact import StringTable, open_artifact, write_artifact
+
+
+def _sparse_dot(rows, cols, vals, n_rows, dense):
+    """(n_rows x n) sparse matrix given as COO sorted by row, times dense (n x k)."""
+    out = np.zeros((n_rows, dense.shape[1]), dtype=np.float32)
+    if len(vals):
+        starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+        out[rows[starts]] = np.add.reduceat(vals[:, None] * dense[cols], starts, axis=0)
+    return out
+
+
+def cooccurrences(sentences, vocab: dict, window: int = 4):
+    """Weighted (word, context, weight) triples of a tokenized corpus."""
+    ids, sentence = [], []
+    for s, tokens in enumerate(sentences):
+        for token in tokens:
+            i = vocab.get(token)
+            if i is not None:
+                ids.append(i)
+                sentence.append(s)
+    ids = np.array(ids, dtype=np.int64)
+    sentence = np.array(sentence, dtype=np.int64)
+    size = len(vocab)
+
+    keys, weights = [], []
+    for d in range(1, window + 1):
+        same = sentence[d:] == sentence[:-d]
+        a, b = ids[:-d][same], ids[d:][same]
+        keys.extend((a * size + b, b * size + a))
+        w = np.full(len(a), 1.0 / d, dtype=np.float64)
+        weights.extend((w, w))
+    if not keys:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0)
+    keys, inverse = np.unique(np.concatenate(keys), return_inverse=True)
+    counts = np.bincount(inverse, weights=np.concatenate(weights))
+    return keys // size, keys % size, counts
+
+
+def ppmi(rows, cols, counts, size: int, cds: float = 0.75):
+    """Positive PMI of COO co-occurrence counts (entries <= 0 dropped)."""
+    row_sum = np.bincount(rows, weights=counts, minlength=size)
+    ctx = np.bincount(cols, weights=counts, minlength=size) ** cds
+    pmi = np.log(counts * ctx.sum() / (row_sum[rows] * ctx[cols]))
+    keep = pmi > 0
+    return rows[keep], cols[keep], pmi[keep].astype(np.float32)
+
+
+def truncated_svd(rows, cols, vals, size: int, dim: int, iterations: int = 4, seed: int = 0):
+    """Top ``dim`` singular triplets of a sparse square matrix (randomized SVD)."""
+    rng = np.random.default_rng(seed)
+    order = np.lexsort((cols, rows))
+    r, c, v = rows[order], cols[order], vals[order]
+    order = np.lexsort((rows, cols))
+    rt, ct, vt = cols[order], rows[order], vals[order]
+
+    k = min(dim + 10, size)
+    q = _sparse_dot(r, c, v, size, rng.standard_normal((size, k)).astype(np.float32))
+    q, _ = np.linalg.qr(q)
+    for _ in range(iterations):
+        q, _ = np.linalg.qr(_sparse_dot(rt, ct, vt, size, q))
+        q, _ = np.linalg.qr(_sparse_dot(r, c, v, size, q))
+    b = _sparse_dot(rt, ct, vt, size, q).T
+    u, s, _ = np.linalg.svd(b, full_matrices=False)
+    return (q @ u)[:, :dim], s[:dim]
+
+
+class EmbeddingModel:
+    def __init__(self, words, vectors, planes, keys, members):
+        self.words = words
+        self.vectors = vectors
+        self.planes = planes
+        # All tables in one sorted array: key = table << bits | signature,
+        # members[i] is the word id of keys[i]
+        self.keys = keys
+        self.members = members
+        self.vocab = words if isinstance(words, StringTable) else {w: i for i, w in enumerate(words)}
+        self.bits = planes.shape[2]
+        self._weights = (1 << np.arange(self.bits)).astype(np.int64)
+        self._offsets = np.arange(planes.shape[0], dtype=np.int64)[:, None] << self.bits
+
+    # ============================================
+    # BUILD / LOAD
+    # ============================================
+
+    @classmethod
+    def from_sentences(cls, sentences, dim: int = 100, window: int = 4, min_count: int = 2,
+                       max_vocab: int = 50000, tables: int = 12, bits: int = None, seed: int = 0):
+        """Train on tokenized sentences (lists of lower-cased words)."""
+        sentences = [list(s) for s in sentences]
+        counts = {}
+        for tokens in sentences:
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+        kept = sorted((w for w, c in counts.items() if c >= min_count), key=lambda w: (-counts[w], w))
+        words = sorted(kept[:max_vocab], key=lambda w: w.encode("utf-8"))
+        vocab = {w: i for i, w in enumerate(words)}
+
+        rows, cols, weights = cooccurrences(sentences, vocab, window)
+        rows, cols, vals = ppmi(rows, cols, weights, len(words))
+        u, s = truncated_svd(rows, cols, vals, len(words), dim, seed=seed)
+        vectors = u * np.sqrt(s)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return cls.index(StringTable.from_strings(words, sort=True), vectors.astype(np.float16),
+                         tables, bits, seed)
+
+    @classmethod
+    def index(cls, words, vectors, tables: int = 12, bits: int = None, seed: int = 0):
+        """Build the LSH tables over vectors; about 3 words per bucket by default."""
+        if bits is None:
+            bits = int(np.clip(round(np.log2(max(len(vectors), 1) / 3)), 4, 20))
+        rng = np.random.default_rng(seed + 1)
+        planes = rng.standard_normal((tables, vectors.shape[1], bits)).astype(np.float32)
+        model = cls(words, vectors, planes, None, None)
+        keys = (model._hash(vectors.astype(np.float32)) + model._offsets).ravel()
+        order = np.argsort(keys, kind="stable")
+        model.keys = keys[order]
+        model.members = (order % len(vectors)).astype(np.int32)
+        return model
+
+    def save(self, path: str):
+        arrays = {
+            "vectors": self.vectors,
+            "planes": self.planes,
+            "keys": self.keys,
+            "members": self.members,
+        }
+        write_artifact(path, arrays, strings={"words": self.words})
+
+    @classmethod
+    def load(cls, path: str):
+        artifact = open_artifact(path)
+        return cls(
+            artifact.strings("words"),
+            artifact["vectors"],
+            artifact["planes"],
+            artifact["keys"],
+            artifact["members"],
+        )
+
+    # ============================================
+    # QUERIES
+    # ============================================
+
+    def _hash(self, vectors):
+        """(tables, n) int64 signatures of row vectors."""
+        bits = np.einsum("nd,tdb->tnb", vectors, self.planes) > 0
+        return bits @ self._weights
+
+    def word_id(self, word: str) -> int:
+        i = self.vocab.get(word)
+        return -1 if i is None else int(i)
+
+    def vector(self, word: str):
+        i = self.word_id(word)
+        return None if i < 0 else self.vectors[i].astype(np.float32)
+
+    def candidates(self, query):
+        """Word ids sharing a bucket, or a bucket one bit away, in some table."""
+        keys = self._hash(query[None, :])
+        probes = np.concatenate((keys, keys ^ self._weights), axis=1) + self._offsets
+        lo = np.searchsorted(self.keys, probes.ravel(), side="left")
+        hi = np.searchsorted(self.keys, probes.ravel(), side="right")
+        sizes = hi - lo
+        total = int(sizes.sum())
+        if not total:
+            return np.zeros(0, dtype=np.int32)
+        # concatenated ranges lo[i]:hi[i]
+        index = np.arange(total) + np.repeat(lo - np.cumsum(sizes) + sizes, sizes)
+        return np.unique(self.members[index])
+
+    def nearest(self, query, limit: int = 10, exclude=()):
+        """(word, cosine) of the best approximate neighbours of a query vector."""
+        norm = np.linalg.norm(query)
+        if not norm:
+            return []
+        query = (query / norm).astype(np.float32)
+        ids = self.candidates(query)
+        if exclude:
+            ids = ids[~np.isin(ids, list(exclude))]
+        if not len(ids):
+            return []
+        scores = self.vectors[ids].astype(np.float32) @ query
+        top = np.argsort(-scores, kind="stable")[:limit]
+        return [(self.words[int(ids[i])], float(scores[i])) for i in top]
+
+    def exact_nearest(self, query, limit: int = 10, exclude=()):
+        """Brute-force reference for ``nearest`` (full matrix product)."""
+        query = query / np.linalg.norm(query)
+        scores = self.vectors.astype(np.float32) @ query
+        scores[list(exclude)] = -np.inf
+        top = np.argsort(-scores, kind="stable")[:limit]
+        return [(self.words[int(i)], float(scores[i])) for i in top]
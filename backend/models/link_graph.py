@@ -0,0 +1,237 @@
+"""Article link graph
+
+Pages and categories are nodes with integer ids, following the sorted
+normalized titles (``title_key``: case-folded words joined by spaces), so a
+title lookup is a binary search in a ``StringTable``. Edges are stored in
+compressed sparse row form, both ways:
+
+- out-edges of ``n``: ``out_indices[out_indptr[n]:out_indptr[n + 1]]``
+  (page -> linked page, page -> category, category -> member page)
+- in-edges of ``n``: ``in_indices[in_indptr[n]:in_indptr[n + 1]]``
+
+Neighbour, two-hop and personalized PageRank queries are array operations
+over these slices (gathers, ``bincount``) rather than walks over Python
+containers. A saved graph (``utils.artifact`` format) is used straight from
+the memory-mapped file.
+"""
+import numpy as np
+
+from utils.artifact import StringTable, open_artifact, write_artifact
+from utils.text_processor import iter_words
+
+PAGE, CATEGORY = 0, 1
+# Longest title, in words, looked up when linking text to nodes
+MAX_TITLE_WORDS = 6
+
+
+def title_key(title: str) -> str:
+    return " ".join(w.casefold() for w, _, _ in iter_words(title))
+
+
+def _ranges(starts, stops):
+    """Indices of the concatenated ranges starts[i]:stops[i]."""
+    sizes = stops - starts
+    total = int(sizes.sum())
+    return np.arange(total, dtype=np.int64) + np.repeat(starts - np.cumsum(sizes) + sizes, sizes)
+
+
+def _csr(sources, targets, n_nodes):
+    order = np.lexsort((targets, sources))
+    indptr = np.searchsorted(sources[order], np.arange(n_nodes + 1)).astype(np.int64)
+    return indptr, targets[order].astype(np.int32)
+
+
+def find_mentions(tokens, lookup, max_words: int = MAX_TITLE_WORDS):
+    """Greedy longest title matches over case-folded tokens: yields node ids."""
+    i = 0
+    while i < len(tokens):
+        for size in range(min(max_words, len(tokens) - i), 0, -1):
+            node = lookup(" ".join(tokens[i:i + size]))
+            if node is not None:
+                yield node
+                i += size
+                break
+        else:
+            i += 1
+
+
+class LinkGraph:
+    def __init__(self, keys, titles, kinds, out_indptr, out_indices, in_indptr, in_indices):
+        self.keys = keys
+        self.titles = titles
+        self.kinds = kinds
+        self.out_indptr = out_indptr
+        self.out_indices = out_indices
+        self.in_indptr = in_indptr
+        self.in_indices = in_indices
+        self._walk = None
+
+    # ============================================
+    # BUILD / LOAD
+    # ============================================
+
+    @classmethod
+    def from_articles(cls, articles):
+        """Build from scraped articles ({"title", "links", "categories"}).
+
+        Articles scraped before links were collected have no "links": their
+        edges are the other article titles mentioned in their text instead.
+        """
+        titles = {}
+        kinds = {}
+
+        def intern(title, kind):
+            key = title_key(title)
+            if key:
+                titles.setdefault(key, title)
+                kinds[key] = min(kinds.get(key, kind), kind)
+            return key
+
+        for article in articles:
+            intern(article["title"], PAGE)
+            for link in article.get("links", []):
+                intern(link, PAGE)
+            for category in article.get("categories", []):
+                intern(category, CATEGORY)
+
+        edges = []
+        for article in articles:
+            source = title_key(article["title"])
+            if not source:
+                continue
+            if "links" in article:
+                targets = [title_key(link) for link in article["links"]]
+            else:
+                text = article.get("content", article.get("content_clean", ""))
+                tokens = [w.casefold() for w, _, _ in iter_words(text)]
+                targets = list(find_mentions(tokens, lambda k: k if k in titles else None))
+            edges.extend((source, t) for t in targets if t and t != source)
+            for category in article.get("categories", []):
+                key = title_key(category)
+                edges.append((source, key))
+                edges.append((key, source))
+
+        keys = sorted(titles, key=lambda k: k.encode("utf-8"))
+        ids = {k: i for i, k in enumerate(keys)}
+        n = len(keys)
+        pairs = np.array(sorted({(ids[a], ids[b]) for a, b in edges}), dtype=np.int64).reshape(-1, 2)
+        out_indptr, out_indices = _csr(pairs[:, 0], pairs[:, 1], n)
+        in_indptr, in_indices = _csr(pairs[:, 1], pairs[:, 0], n)
+        return cls(
+            StringTable.from_strings(keys, sort=True),
+            StringTable.from_strings(titles[k] for k in keys),
+            np.array([kinds[k] for k in keys], dtype=np.uint8),
+            out_indptr, out_indices, in_indptr, in_indices,
+        )
+
+    def save(self, path: str):
+        arrays = {
+            "kinds": self.kinds,
+            "out_indptr": self.out_indptr,
+            "out_indices": self.out_indices,
+            "in_indptr": self.in_indptr,
+            "in_indices": self.in_indices,
+        }
+        write_artifact(path, arrays, strings={"keys": self.keys, "titles": self.titles})
+
+    @classmethod
+    def load(cls, path: str):
+        artifact = open_artifact(path)
+        return cls(
+            artifact.strings("keys"),
+            artifact.strings("titles"),
+            artifact["kinds"],
+            artifact["out_indptr"],
+            artifact["out_indices"],
+            artifact["in_indptr"],
+            artifact["in_indices"],
+        )
+
+    def __len__(self):
+        return len(self.kinds)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.out_indices)
+
+    # ============================================
+    # QUERIES
+    # ============================================
+
+    def node(self, title: str) -> int:
+        """Node id of a title (any casing / punctuation), or -1."""
+        return self.keys.find(title_key(title))
+
+    def nodes_in_text(self, text: str):
+        """Node ids of the titles mentioned in text, in order, without repeats."""
+        tokens = [w.casefold() for w, _, _ in iter_words(text)]
+
+        def lookup(key):
+            i = self.keys.find(key)
+            return None if i < 0 else i
+
+        return list(dict.fromkeys(find_mentions(tokens, lookup)))
+
+    def neighbors(self, nodes):
+        """Sorted ids linked to or from any of nodes."""
+        nodes = np.atleast_1d(np.asarray(nodes, dtype=np.int64))
+        found = np.concatenate((
+            self.out_indices[_ranges(self.out_indptr[nodes], self.out_indptr[nodes + 1])],
+            self.in_indices[_ranges(self.in_indptr[nodes], self.in_indptr[nodes + 1])],
+        ))
+        return np.setdiff1d(found, nodes)
+
+    def two_hop(self, node: int, limit: int = 10):
+        """Nodes two links away, ranked by the number of paths reaching them."""
+        first = self.neighbors(node)
+        if not len(first):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        reached = np.concatenate((
+            self.out_indices[_ranges(self.out_indptr[first], self.out_indptr[first + 1])],
+            self.in_indices[_ranges(self.in_indptr[first], self.in_indptr[first + 1])],
+        ))
+        ids, counts = np.unique(reached, return_counts=True)
+        keep = ~np.isin(ids, first) & (ids != node)
+        ids, counts = ids[keep], counts[keep]
+        top = np.lexsort((ids, -counts))[:limit]
+        return ids[top], counts[top]
+
+    def pagerank(self, seeds, alpha: float = 0.15, iterations: int = 30, tol: float = 1e-8):
+        """Personalized PageRank over the undirected graph, restarting at seeds.
+
+        Each iteration is one sparse matrix-vector product done with
+        ``bincount`` over the edge arrays.
+        """
+        n = len(self)
+        if self._walk is None:
+            # Undirected walk: every edge is followed both ways
+            sources = np.repeat(np.arange(n, dtype=np.int32), np.diff(self.out_indptr))
+            src = np.concatenate((sources, self.out_indices))
+            dst = np.concatenate((self.out_indices, sources))
+            degree = np.bincount(src, minlength=n).astype(np.float64)
+            self._walk = src, dst, degree
+        src, dst, degree = self._walk
+        inv_degree = np.divide(1.0, degree, out=np.zeros(n), where=degree > 0)
+        restart = np.zeros(n)
+        restart[np.asarray(seeds, dtype=np.int64)] = 1.0 / len(seeds)
+
+        rank = restart.copy()
+        for _ in range(iterations):
+            spread = rank * inv_degree
+            dangling = rank[degree == 0].sum()
+            new = (1 - alpha) * np.bincount(dst, weights=spread[src], minlength=n)
+            new += (alpha + (1 - alpha) * dangling) * restart
+            done = np.abs(new - rank).sum() < tol
+            rank = new
+            if done:
+                break
+        return rank
+
+    def related(self, seeds, limit: int = 10, kind: int = PAGE, alpha: float = 0.15):
+        """(node, score) of the best PageRank nodes of one kind, seeds excluded."""
+        rank = self.pagerank(seeds, alpha)
+        rank[np.asarray(seeds, dtype=np.int64)] = 0
+        if kind is not None:
+            rank[self.kinds != kind] = 0
+        top = np.argsort(-rank, kind="stable")[:limit]
+        return [(int(i), float(rank[i])) for i in top if rank[i] > 0]
@@ -1,8 +1,187 @@
-"""Simple N-gram model placeholder"""
+"""N-gram next-word model
+
+Words are interned to integer ids and the bigram/trigram tables are stored
+CSR-style in NumPy arrays:
+
+- bigrams: continuations of word ``w`` are ``bi_next/bi_count[bi_start[w]:bi_start[w + 1]]``
+- trigrams: contexts are the sorted keys ``w1 * V + w2`` (binary search),
+  continuations of context ``i`` are ``tri_next/tri_count[tri_start[i]:tri_start[i + 1]]``
+
+Continuations are sorted by decreasing count, so the best predictions of a
+context are the head of its slice. Scores use stupid backoff
+(trigram -> bigram -> unigram, each step multiplied by ``alpha``).
+
+Ids follow the sorted vocabulary, kept as a sorted ``StringTable`` (word
+lookups are binary searches) whether the model is built from the JSON
+counts or used straight from a memory-mapped saved model
+(``utils.artifact`` format).
+"""
+import os
+
+import numpy as np
+
+from utils.artifact import StringTable, open_artifact, write_artifact
+from utils.dataset import NGRAMS_BIN, dataset_path, load_json
+
+ARRAYS = (
+    "unigram_count", "bi_start", "bi_next", "bi_count", "bi_total",
+    "tri_keys", "tri_start", "tri_next", "tri_count", "tri_total",
+)
+
+
+def _csr(context, following, counts, n_contexts):
+    """Sort (context, next, count) by context then count desc; return start offsets."""
+    order = np.lexsort((-counts, context))
+    context = context[order]
+    start = np.searchsorted(context, np.arange(n_contexts + 1)).astype(np.int64)
+    return start, following[order].astype(np.int32), counts[order].astype(np.int32)
+
 
 class NGramModel:
-    def __init__(self):
-        pass
+    def __init__(self, alpha: float = 0.4):
+        self.alpha = alpha
+        self.words = self.vocab = StringTable.from_strings([], sort=True)
+        self.unigram_count = np.zeros(0, dtype=np.int64)
+        self.bi_start = np.zeros(1, dtype=np.int64)
+        self.bi_next = self.bi_count = np.zeros(0, dtype=np.int32)
+        self.bi_total = np.zeros(0, dtype=np.int64)
+        self.tri_keys = np.zeros(0, dtype=np.int64)
+        self.tri_start = np.zeros(1, dtype=np.int64)
+        self.tri_next = self.tri_count = np.zeros(0, dtype=np.int32)
+        self.tri_total = np.zeros(0, dtype=np.int64)
+        self._unigram_top = np.zeros(0, dtype=np.int32)
+
+    # ============================================
+    # BUILD / LOAD
+    # ============================================
+
+    @classmethod
+    def from_counts(cls, unigrams: dict, bigrams: dict, trigrams: dict, alpha: float = 0.4):
+        """Build from {"w": n}, {"w1 w2": n} and {"w1 w2 w3": n} count dicts."""
+        model = cls(alpha)
+        keys = set(unigrams)
+        for table in (bigrams, trigrams):
+            for key in table:
+                keys.update(key.split(" "))
+        vocab = {w: i for i, w in enumerate(sorted(keys, key=lambda w: w.encode("utf-8")))}
+        intern = vocab.__getitem__
+
+        uni = [(intern(w), c) for w, c in unigrams.items()]
+        bi = [(*map(intern, k.split(" ")), c) for k, c in bigrams.items() if k.count(" ") == 1]
+        tri = [(*map(intern, k.split(" ")), c) for k, c in trigrams.items() if k.count(" ") == 2]
+        size = len(vocab)
+
+        unigram_count = np.zeros(size, dtype=np.int64)
+        if uni:
+            ids, counts = np.array(uni, dtype=np.int64).T
+            unigram_count[ids] = counts
+
+        bi = np.array(bi, dtype=np.int64).reshape(-1, 3)
+        model.bi_start, model.bi_next, model.bi_count = _csr(bi[:, 0], bi[:, 1], bi[:, 2], size)
+        model.bi_total = np.bincount(bi[:, 0], weights=bi[:, 2], minlength=size).astype(np.int64)
+
+        tri = np.array(tri, dtype=np.int64).reshape(-1, 4)
+        keys = tri[:, 0] * size + tri[:, 1]
+        model.tri_keys = np.unique(keys)
+        ctx = np.searchsorted(model.tri_keys, keys)
+        model.tri_start, model.tri_next, model.tri_count = _csr(ctx, tri[:, 2], tri[:, 3], len(model.tri_keys))
+        model.tri_total = np.bincount(ctx, weights=tri[:, 3], minlength=len(model.tri_keys)).astype(np.int64)
+
+        # The build-time dict is dropped: the model keeps only the sorted table
+        model.words = model.vocab = StringTable.from_strings(vocab, sort=True)
+        model.unigram_count = unigram_count
+        model._finish()
+        return model
+
+    @classmethod
+    def from_dataset(cls, alpha: float = 0.4):
+        """Open ``stats/ngrams.bin`` if present, else build from the JSON counts."""
+        path = dataset_path(*NGRAMS_BIN)
+        if os.path.exists(path):
+            return cls.load(path)
+        ngrams = load_json("stats", "ngrams.json")
+        unigrams = load_json("stats", "word_frequencies.json")
+        return cls.from_counts(unigrams, ngrams["bigrams"], ngrams["trigrams"], alpha)
+
+    def _finish(self):
+        self._unigram_top = np.argsort(-self.unigram_count, kind="stable").astype(np.int32)
+        self._unigram_total = max(int(self.unigram_count.sum()), 1)
+
+    def save(self, path: str):
+        arrays = {name: getattr(self, name) for name in ARRAYS}
+        write_artifact(path, arrays, meta={"alpha": self.alpha}, strings={"words": self.words})
+
+    @classmethod
+    def load(cls, path: str):
+        artifact = open_artifact(path)
+        model = cls(artifact.meta["alpha"])
+        for name in ARRAYS:
+            setattr(model, name, artifact[name])
+        model.words = model.vocab = artifact.strings("words")
+        model._finish()
+        return model
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in ARRAYS)
+
+    # ============================================
+    # QUERIES
+    # ============================================
+
+    def _ids(self, context):
+        tokens = context.lower().split() if isinstance(context, str) else list(context)
+        return [self.vocab.get(t, -1) for t in tokens[-2:]]
+
+    def _trigram_slice(self, w1, w2):
+        if w1 < 0 or w2 < 0:
+            return 0, 0, 0
+        key = w1 * len(self.words) + w2
+        i = int(np.searchsorted(self.tri_keys, key))
+        if i == len(self.tri_keys) or self.tri_keys[i] != key:
+            return 0, 0, 0
+        return int(self.tri_start[i]), int(self.tri_start[i + 1]), int(self.tri_total[i])
+
+    def _bigram_slice(self, w):
+        if w < 0:
+            return 0, 0, 0
+        return int(self.bi_start[w]), int(self.bi_start[w + 1]), int(self.bi_total[w])
+
+    def score(self, word: str, context) -> float:
+        """Stupid-backoff score of word following context."""
+        wid = self.vocab.get(word, -1)
+        if wid < 0:
+            return 0.0
+        ids = [-1, -1] + self._ids(context)
+        weight = 1.0
+        s, e, total = self._trigram_slice(ids[-2], ids[-1])
+        hits = np.flatnonzero(self.tri_next[s:e] == wid)
+        if len(hits):
+            return float(self.tri_count[s + hits[0]]) / total
+        if e > s:
+            weight *= self.alpha
+        s, e, total = self._bigram_slice(ids[-1])
+        hits = np.flatnonzero(self.bi_next[s:e] == wid)
+        if len(hits):
+            return weight * float(self.bi_count[s + hits[0]]) / total
+        if e > s:
+            weight *= self.alpha
+        return weight * float(self.unigram_count[wid]) / self._unigram_total
 
-    def predict(self, context):
-        return []
+    def predict(self, context, limit: int = 5):
+        """Most likely next words as (word, score), best first."""
+        ids = [-1, -1] + self._ids(context)
+        scores = {}
+        weight = 1.0
+        for nxt, count, (s, e, total) in (
+            (self.tri_next, self.tri_count, self._trigram_slice(ids[-2], ids[-1])),
+            (self.bi_next, self.bi_count, self._bigram_slice(ids[-1])),
+        ):
+            if e > s:
+                for wid, c in zip(nxt[s:min(e, s + limit)].tolist(), count[s:min(e, s + limit)].tolist()):
+                    scores.setdefault(wid, weight * c / total)
+                weight *= self.alpha
+        for wid in self._unigram_top[:limit].tolist():
+            scores.setdefault(wid, weight * int(self.unigram_count[wid]) / self._unigram_total)
+        best = sorted(scores.items(), key=lambda kv: -kv[1])[:limit]
+        return [(self.words[wid], score) for wid, score in best]
@@ -1,8 +1,156 @@
-"""Sentiment model placeholder"""
+"""Lexicon-based sentiment model
+
+Tokens are mapped once to lexicon ids; a whole batch of documents is then
+scored together with NumPy over the flat token array:
+
+- polarity: +1 / -1 from the positive / negative lists
+- negation: a sentiment word is flipped when an odd number of negators
+  (tsy, aza...) occur in the ``negation_window`` tokens before it
+- intensity: scaled by ``intensity`` when an intensifier (tena, tokoa,
+  mihitsy...) is within ``intensifier_window`` tokens on either side
+
+Windows never cross a sentence boundary. Sentence and document scores are
+sums of token scores; polarity is that sum divided by the number of
+sentiment words, clipped to [-1, 1].
+"""
+import re
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"([^\W\d_]+)|([.!?\n]+)")
+BREAK_RE = re.compile(r"[.!?\n]")
+
+NONE, POSITIVE, NEGATIVE, NEGATOR, INTENSIFIER = range(5)
+
+
+def label_of(polarity: float) -> str:
+    if polarity > 0.05:
+        return "positive"
+    if polarity < -0.05:
+        return "negative"
+    return "neutral"
+
 
 class SentimentModel:
-    def __init__(self):
-        pass
+    def __init__(self, lexicon: dict = None, negation_window: int = 3,
+                 intensifier_window: int = 2, intensity: float = 1.5):
+        self.negation_window = negation_window
+        self.intensifier_window = intensifier_window
+        self.intensity = intensity
+        self.vocab = {}
+        self.phrases = {}
+        kinds = [NONE]
+        for key, kind in (("positive", POSITIVE), ("negative", NEGATIVE),
+                          ("negators", NEGATOR), ("intensifiers", INTENSIFIER)):
+            for entry in (lexicon or {}).get(key, []):
+                words = tuple(entry.lower().split())
+                if not words or words in self.phrases or (len(words) == 1 and words[0] in self.vocab):
+                    continue
+                if len(words) == 1:
+                    self.vocab[words[0]] = len(kinds)
+                else:
+                    self.phrases[words] = len(kinds)
+                kinds.append(kind)
+        kinds = np.array(kinds, dtype=np.int8)
+        self.polarity = np.where(kinds == POSITIVE, 1.0, np.where(kinds == NEGATIVE, -1.0, 0.0))
+        self.is_negator = (kinds == NEGATOR).astype(np.int32)
+        self.is_intensifier = (kinds == INTENSIFIER).astype(np.int32)
+        self.max_phrase = max((len(p) for p in self.phrases), default=1)
+
+    def encode(self, text: str, spans=None):
+        """Lexicon ids and sentence numbers of the tokens of one text.
+
+        ``spans`` are the (word, start, end) words of text when already
+        tokenized; sentence breaks are then read from the gaps between them.
+        """
+        words, sentences = [], []
+        sentence = 0
+        if spans is None:
+            for m in TOKEN_RE.finditer(text):
+                if m.group(1) is None:
+                    if words and sentences[-1] == sentence:
+                        sentence += 1
+                    continue
+                words.append(m.group(1).lower())
+                sentences.append(sentence)
+        else:
+            previous = None
+            for word, start, end in spans:
+                if previous is not None and BREAK_RE.search(text, previous, start):
+                    sentence += 1
+                words.append(word.lower())
+                sentences.append(sentence)
+                previous = end
+        ids = []
+        i = 0
+        while i < len(words):
+            for size in range(min(self.max_phrase, len(words) - i), 1, -1):
+                pid = self.phrases.get(tuple(words[i:i + size]))
+                if pid is not None and sentences[i] == sentences[i + size - 1]:
+                    ids.append(pid)
+                    del sentences[i + 1:i + size]
+                    words[i:i + size] = [words[i]]
+                    break
+            else:
+                ids.append(self.vocab.get(words[i], 0))
+            i += 1
+        return ids, sentences
+
+    def predict_batch(self, texts, spans=None):
+        if not texts:
+            return []
+        encoded = [self.encode(t, s) for t, s in zip(texts, spans or [None] * len(texts))]
+        n_tokens = np.array([len(ids) for ids, _ in encoded], dtype=np.int64)
+        n_sentences = np.array([(s[-1] + 1) if s else 0 for _, s in encoded], dtype=np.int64)
+        ids = np.fromiter((i for e, _ in encoded for i in e), dtype=np.int64, count=int(n_tokens.sum()))
+        sentence_offsets = np.concatenate(([0], np.cumsum(n_sentences)[:-1]))
+        # global sentence id of every token
+        sentence = np.fromiter((s for _, ss in encoded for s in ss), dtype=np.int64, count=len(ids))
+        sentence += np.repeat(sentence_offsets, n_tokens)
+        total_sentences = int(n_sentences.sum())
+
+        pos = np.arange(len(ids))
+        first = np.searchsorted(sentence, sentence, side="left")
+        last = np.searchsorted(sentence, sentence, side="right")
+
+        negator = self.is_negator[ids]
+        neg_cum = np.concatenate(([0], np.cumsum(negator)))
+        lo = np.maximum(pos - self.negation_window, first)
+        negations = neg_cum[pos] - neg_cum[lo]
+
+        intensifier = self.is_intensifier[ids]
+        int_cum = np.concatenate(([0], np.cumsum(intensifier)))
+        lo = np.maximum(pos - self.intensifier_window, first)
+        hi = np.minimum(pos + self.intensifier_window + 1, last)
+        boosted = (int_cum[hi] - int_cum[lo] - intensifier) > 0
+
+        polarity = self.polarity[ids]
+        scores = polarity * np.where(negations % 2 == 1, -1.0, 1.0) * np.where(boosted, self.intensity, 1.0)
+        hits = (polarity != 0).astype(np.float64)
+
+        sent_score = np.bincount(sentence, weights=scores, minlength=total_sentences)
+        sent_hits = np.bincount(sentence, weights=hits, minlength=total_sentences)
+        sent_polarity = np.clip(sent_score / np.maximum(sent_hits, 1), -1, 1)
+
+        doc = np.repeat(np.arange(len(texts)), n_tokens)
+        doc_score = np.bincount(doc, weights=scores, minlength=len(texts))
+        doc_hits = np.bincount(doc, weights=hits, minlength=len(texts))
+        doc_polarity = np.clip(doc_score / np.maximum(doc_hits, 1), -1, 1)
+
+        results = []
+        for d in range(len(texts)):
+            start = sentence_offsets[d]
+            sentences = [
+                {"polarity": round(float(p), 4), "score": round(float(s), 4), "label": label_of(p)}
+                for p, s in zip(sent_polarity[start:start + n_sentences[d]], sent_score[start:start + n_sentences[d]])
+            ]
+            results.append({
+                "polarity": round(float(doc_polarity[d]), 4),
+                "score": round(float(doc_score[d]), 4),
+                "label": label_of(doc_polarity[d]),
+                "sentences": sentences,
+            })
+        return results
 
-    def predict(self, text):
-        return {"polarity": 0.0}
+    def predict(self, text, spans=None):
+        return self.predict_batch([text], None if spans is None else [spans])[0]
@@ -0,0 +1,191 @@
+"""Suffix array concordance index
+
+The corpus is kept as an array of code points (plus a lower-cased copy of
+the same length, for case-insensitive search). ``sa`` lists every suffix
+start in lexicographic order of the lower-cased text and ``lcp[i]`` is the
+longest common prefix of suffixes ``sa[i - 1]`` and ``sa[i]``.
+
+- ``sa`` is built by prefix doubling: each round sorts the pairs
+  (rank[i], rank[i + k]) packed into one int64 key, until every rank is
+  unique
+- ``lcp`` is computed with Kasai's algorithm
+
+All occurrences of a pattern of length m are one contiguous range of
+``sa``. Its start is found by binary search, O(m log n); its end is the
+first following ``lcp`` value below m, scanned for short ranges and
+binary-searched for long ones, so the exact count stays O(m log n). Each
+page of keyword-in-context lines is then read from that range. Lines come in
+suffix order, i.e. sorted by right context. The arrays (int32, or int64
+for corpora over 2**31 characters) are saved in the ``utils.artifact``
+format and memory-mapped.
+"""
+import numpy as np
+
+from utils.artifact import open_artifact, write_artifact
+
+# Longest lcp window scanned for the end of a range before binary search
+LCP_SCAN_LIMIT = 4096
+
+
+def fold(text: str) -> str:
+    """Lower-case text without changing its length (offsets stay valid)."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+def _codes(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
+def build_suffix_array(codes: np.ndarray) -> np.ndarray:
+    n = len(codes)
+    if not n:
+        return np.zeros(0, dtype=np.int64)
+    _, rank = np.unique(codes, return_inverse=True)
+    rank = rank.astype(np.int64).ravel()
+    k = 1
+    while True:
+        second = np.zeros(n, dtype=np.int64)
+        second[:n - k] = rank[k:] + 1
+        key = rank * (n + 1) + second
+        order = np.argsort(key)
+        sorted_key = key[order]
+        rank = np.empty(n, dtype=np.int64)
+        rank[order] = np.concatenate(([0], np.cumsum(sorted_key[1:] != sorted_key[:-1])))
+        if rank[order[-1]] == n - 1 or k >= n:
+            return order
+        k *= 2
+
+
+def build_lcp(text: str, sa: np.ndarray) -> np.ndarray:
+    """Kasai's algorithm; lcp[0] = 0."""
+    n = len(text)
+    sa = sa.tolist()
+    rank = [0] * n
+    for i, s in enumerate(sa):
+        rank[s] = i
+    lcp = [0] * n
+    h = 0
+    for i in range(n):
+        r = rank[i]
+        if r == 0:
+            h = 0
+            continue
+        j = sa[r - 1]
+        while i + h < n and j + h < n and text[i + h] == text[j + h]:
+            h += 1
+        lcp[r] = h
+        if h:
+            h -= 1
+    return np.array(lcp, dtype=np.int64)
+
+
+class SuffixIndex:
+    def __init__(self, text, folded, sa, lcp):
+        self.text = text
+        self.folded = folded
+        self.sa = sa
+        self.lcp = lcp
+
+    # ============================================
+    # BUILD / LOAD
+    # ============================================
+
+    @classmethod
+    def build(cls, text: str):
+        folded = fold(text)
+        codes = _codes(folded)
+        dtype = np.int32 if len(text) < 2 ** 31 else np.int64
+        sa = build_suffix_array(codes)
+        lcp = build_lcp(folded, sa)
+        return cls(_codes(text), codes, sa.astype(dtype), lcp.astype(dtype))
+
+    def save(self, path: str):
+        write_artifact(path, {"text": self.text, "folded": self.folded, "sa": self.sa, "lcp": self.lcp})
+
+    @classmethod
+    def load(cls, path: str):
+        artifact = open_artifact(path)
+        return cls(artifact["text"], artifact["folded"], artifact["sa"], artifact["lcp"])
+
+    def __len__(self):
+        return len(self.sa)
+
+    # ============================================
+    # QUERIES
+    # ============================================
+
+    def _prefix(self, start: int, m: int) -> str:
+        return self.folded[start:start + m].tobytes().decode("utf-32-le")
+
+    def _slice(self, start: int, end: int) -> str:
+        return self.text[start:end].tobytes().decode("utf-32-le")
+
+    def range(self, pattern: str):
+        """[lo, hi) range of sa whose suffixes start with pattern (case-insensitive)."""
+        pattern = fold(pattern)
+        m = len(pattern)
+        if not m:
+            return 0, 0
+        lo, hi = 0, len(self.sa)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._prefix(int(self.sa[mid]), m) < pattern:
+                lo = mid + 1
+            else:
+                hi = mid
+        start = lo
+        if start == len(self.sa) or self._prefix(int(self.sa[start]), m) != pattern:
+            return start, start
+        # The range ends at the first lcp < m: scan lcp in doubling windows
+        # for short ranges, binary search otherwise
+        lo = start + 1
+        window = 64
+        while window <= LCP_SCAN_LIMIT and lo < len(self.sa):
+            chunk = self.lcp[lo:lo + window]
+            below = np.flatnonzero(chunk < m)
+            if len(below):
+                return start, lo + int(below[0])
+            lo += len(chunk)
+            window *= 2
+        hi = len(self.sa)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._prefix(int(self.sa[mid]), m) <= pattern:
+                lo = mid + 1
+            else:
+                hi = mid
+        return start, lo
+
+    def count(self, pattern: str) -> int:
+        lo, hi = self.range(pattern)
+        return hi - lo
+
+    def _line_bounds(self, start: int, end: int, width: int):
+        """Context window around [start, end) that stays inside the line."""
+        left = self.text[max(0, start - width):start]
+        newline = np.flatnonzero(left == 10)
+        left_start = start - len(left) + (int(newline[-1]) + 1 if len(newline) else 0)
+        right = self.text[end:end + width]
+        newline = np.flatnonzero(right == 10)
+        right_end = end + (int(newline[0]) if len(newline) else len(right))
+        return left_start, right_end
+
+    def concordance(self, pattern: str, offset: int = 0, limit: int = 20, width: int = 40):
+        """(total, KWIC lines) for one page of the occurrences of pattern."""
+        lo, hi = self.range(pattern)
+        m = len(pattern)
+        lines = []
+        for start in self.sa[lo + offset:min(hi, lo + offset + limit)].tolist():
+            end = start + m
+            left_start, right_end = self._line_bounds(start, end, width)
+            lines.append({
+                "left": self._slice(left_start, start),
+                "match": self._slice(start, end),
+                "right": self._slice(end, right_end),
+                "start": start,
+                "end": end,
+            })
+        return hi - lo, lines
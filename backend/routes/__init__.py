@@ -15,6 +15,9 @@ def register_routes(app: Flask):
         semantic,
         tts,
         chatbot,
+        concordance,
+        analyze,
+        resources,
     )
 
     modules = [
@@ -28,6 +31,9 @@ def register_routes(app: Flask):
         semantic,
         tts,
         chatbot,
+        concordance,
+        analyze,
+        resources,
     ]
 
     for mod in modules:
@@ -0,0 +1,39 @@
+from flask import Blueprint, current_app, request, jsonify
+
+from services.analyzer import ANALYZERS, AnalysisPipeline
+from utils.validators import int_param, str_param
+
+bp = Blueprint("analyze", __name__)
+
+@bp.route("/analyze", methods=["POST"])
+def analyze():
+    """POST /api/analyze
+    Expects JSON {"text": "...", "analyzers": ["spelling", "lemmas"], "limit": 5} (limit 1-50)
+    Tokenizes the text once and returns the merged results of the selected
+    analyzers (all of spelling, phonotactics, lemmas, entities, sentiment
+    by default), each under its own key.
+    """
+    data = request.get_json(silent=True) or {}
+    config = current_app.config
+    try:
+        text = str_param(data, "text")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    analyzers = data.get("analyzers")
+    if analyzers is not None and not (isinstance(analyzers, list) and all(isinstance(a, str) for a in analyzers)):
+        return jsonify({"error": "analyzers must be a list of names", "analyzers": list(ANALYZERS)}), 400
+    try:
+        limit = int_param(data, "limit", 5, 1, 50)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        pipeline = AnalysisPipeline(
+            analyzers,
+            limit=limit,
+            document_threshold=config["SPELLCHECK_DOCUMENT_THRESHOLD"],
+            workers=config["SPELLCHECK_WORKERS"] or None,
+            chunk_chars=config["SPELLCHECK_CHUNK_CHARS"],
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e), "analyzers": list(ANALYZERS)}), 400
+    return jsonify(pipeline.run(text))
@@ -1,13 +1,26 @@
 from flask import Blueprint, request, jsonify
 
+from services.autocompleter import TOP_K, predict_next, suggest
+from utils.validators import int_param
+
 bp = Blueprint("autocomplete", __name__)
 
 @bp.route("/autocomplete", methods=["POST"])
 def autocomplete():
     """POST /api/autocomplete
-    Expects JSON {"prefix": "..."}
-    Returns suggestions (placeholder)
+    Expects JSON {"prefix": "...", "context": "...", "limit": 10} (limit 1-10,
+    the completions the trie keeps per prefix)
+    Returns the most frequent dictionary words starting with prefix and,
+    when context (the preceding words) is given, the likely next words
     """
     data = request.get_json(silent=True) or {}
     prefix = data.get("prefix", "")
-    return jsonify({"prefix": prefix, "suggestions": []})
+    try:
+        limit = int_param(data, "limit", TOP_K, 1, TOP_K)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    result = {"prefix": prefix, "suggestions": suggest(prefix, limit)}
+    context = data.get("context")
+    if context is not None:
+        result["next_words"] = predict_next(context, limit)
+    return jsonify(result)
@@ -1,9 +1,16 @@
 from flask import Blueprint, request, jsonify
 
+from services.chatbot import answer
+from utils.validators import int_param, str_param
+
 bp = Blueprint("chatbot", __name__)
 
 @bp.route("/chatbot", methods=["POST"])
 def chatbot():
     data = request.get_json(silent=True) or {}
-    message = data.get("message", "")
-    return jsonify({"reply": "", "message": message})
+    try:
+        message = str_param(data, "message")
+        limit = int_param(data, "limit", 3, 1, 20)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({**answer(message, limit), "message": message})
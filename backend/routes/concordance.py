@@ -0,0 +1,23 @@
+from flask import Blueprint, request, jsonify
+
+from services.concordance import MAX_PAGE, concordance
+from utils.validators import int_param
+
+bp = Blueprint("concordance", __name__)
+
+@bp.route("/concordance", methods=["POST"])
+def concordance_search():
+    """POST /api/concordance
+    Expects JSON {"query": "...", "offset": 0, "limit": 20, "width": 40}
+    Returns the exact number of occurrences (case-insensitive) and one page
+    of keyword-in-context lines, sorted by right context
+    """
+    data = request.get_json(silent=True) or {}
+    query = data.get("query", "")
+    try:
+        offset = int_param(data, "offset", 0, 0, 2 ** 62)
+        limit = int_param(data, "limit", 20, 1, MAX_PAGE)
+        width = int_param(data, "width", 40, 0, 500)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(concordance(query, offset, limit, width))
@@ -1,9 +1,15 @@
 from flask import Blueprint, request, jsonify
 
+from services.lemmatizer import lemmatize as lemmatize_text
+from utils.validators import str_param
+
 bp = Blueprint("lemmatization", __name__)
 
 @bp.route("/lemmatize", methods=["POST"])
 def lemmatize():
     data = request.get_json(silent=True) or {}
-    text = data.get("text", "")
-    return jsonify({"lemmas": [], "original": text})
+    try:
+        text = str_param(data, "text")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"lemmas": lemmatize_text(text), "original": text})
@@ -1,9 +1,15 @@
 from flask import Blueprint, request, jsonify
 
+from services.ner_detector import detect
+from utils.validators import str_param
+
 bp = Blueprint("ner", __name__)
 
 @bp.route("/ner", methods=["POST"])
 def ner():
     data = request.get_json(silent=True) or {}
-    text = data.get("text", "")
-    return jsonify({"entities": []})
+    try:
+        text = str_param(data, "text")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"entities": detect(text)})
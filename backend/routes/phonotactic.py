@@ -1,9 +1,15 @@
 from flask import Blueprint, request, jsonify
 
+from services.phonotactic_validator import validate_text
+from utils.validators import str_param
+
 bp = Blueprint("phonotactic", __name__)
 
 @bp.route("/phonotactic-check", methods=["POST"])
 def phonotactic_check():
     data = request.get_json(silent=True) or {}
-    text = data.get("text", "")
-    return jsonify({"valid": True, "issues": []})
+    try:
+        text = str_param(data, "text")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(validate_text(text))
@@ -0,0 +1,13 @@
+from flask import Blueprint, jsonify
+
+from utils.resources import registry
+
+bp = Blueprint("resources", __name__)
+
+@bp.route("/resources", methods=["GET"])
+def resources():
+    """GET /api/resources
+    Returns every shared resource with whether it is loaded, its load time
+    and resident memory growth, and the total load time and process RSS.
+    """
+    return jsonify(registry.stats())
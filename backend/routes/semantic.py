@@ -1,9 +1,21 @@
 from flask import Blueprint, request, jsonify
 
+from services.knowledge_graph import neighbors, related, suggest, two_hop
+from utils.validators import int_param, str_param
+
 bp = Blueprint("semantic", __name__)
 
 @bp.route("/semantic-suggest", methods=["POST"])
 def semantic_suggest():
     data = request.get_json(silent=True) or {}
-    text = data.get("text", "")
-    return jsonify({"suggestions": []})
+    try:
+        text = str_param(data, "text")
+        title = str_param(data, "title", None)
+        limit = int_param(data, "limit", 10, 1, 50)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    result = {"suggestions": suggest(text, limit), "related": related(text, limit)}
+    if title:
+        result["neighbors"] = neighbors(title)
+        result["two_hop"] = two_hop(title, limit)
+    return jsonify(result)
@@ -1,9 +1,21 @@
 from flask import Blueprint, request, jsonify
 
+from services.sentiment_analyzer import analyze, analyze_batch
+from utils.validators import str_param
+
 bp = Blueprint("sentiment", __name__)
 
 @bp.route("/sentiment", methods=["POST"])
 def sentiment():
     data = request.get_json(silent=True) or {}
-    text = data.get("text", "")
-    return jsonify({"polarity": 0.0, "score": 0.0, "text": text})
+    texts = data.get("texts")
+    if isinstance(texts, list):
+        bad = [i for i, t in enumerate(texts) if not isinstance(t, str)]
+        if bad:
+            return jsonify({"error": f"texts[{bad[0]}] must be a string"}), 400
+        return jsonify({"results": analyze_batch(texts)})
+    try:
+        text = str_param(data, "text")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({**analyze(text), "text": text})
@@ -1,15 +1,32 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
+
+from services.spell_checker import check_document, check_spelling
+from utils.validators import int_param, str_param
 
 bp = Blueprint("spell_check", __name__)
 
 @bp.route("/spell-check", methods=["POST"])
 def spell_check():
     """POST /api/spell-check
-    Expects JSON {"text": "..."}
-    Returns: list of suggestions (placeholder)
+    Expects JSON {"text": "...", "limit": 5, "mode": "document"} (limit 1-50)
+    Returns unknown words with character offsets and ranked suggestions.
+    Long texts (or mode "document") are checked in parallel chunks.
     """
     data = request.get_json(silent=True) or {}
-    text = data.get("text", "")
-    # Placeholder implementation
-    result = {"original": text, "corrections": []}
+    try:
+        text = str_param(data, "text")
+        limit = int_param(data, "limit", 5, 1, 50)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    config = current_app.config
+    if data.get("mode") == "document" or len(text) > config["SPELLCHECK_DOCUMENT_THRESHOLD"]:
+        corrections = check_document(
+            text,
+            limit=limit,
+            workers=config["SPELLCHECK_WORKERS"] or None,
+            chunk_chars=config["SPELLCHECK_CHUNK_CHARS"],
+        )
+    else:
+        corrections = check_spelling(text, limit=limit)
+    result = {"original": text, "corrections": corrections}
     return jsonify(result)
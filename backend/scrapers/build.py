@@ -0,0 +1,326 @@
+# build.py
+import argparse
+import glob
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+try:
+    from build_lexicons import build_ngrams, save_json, save_lexicon, static_lexicons
+    from cleaner import WORD_RE, clean_corpus, iter_articles
+    from dedup import deduplicate
+    from language_id import MODEL_FILE
+    from tenymalagasy_scraper import STORE_FILE, load_entries
+except ImportError:  # importé depuis backend/ (scrapers.build)
+    from scrapers.build_lexicons import build_ngrams, save_json, save_lexicon, static_lexicons
+    from scrapers.cleaner import WORD_RE, clean_corpus, iter_articles
+    from scrapers.dedup import deduplicate
+    from scrapers.language_id import MODEL_FILE
+    from scrapers.tenymalagasy_scraper import STORE_FILE, load_entries
+
+# ============================================
+# GRAPHE DE CONSTRUCTION INCRÉMENTAL
+# ============================================
+#
+# Chaque artefact du dataset est produit par un nœud : une fonction, ses
+# fichiers d'entrée, ses fichiers de sortie (directement dans dataset/),
+# ses paramètres et les fichiers de code dont il dépend. La clé d'un nœud
+# est le hachage (SHA-256) du contenu de ses entrées, de ses paramètres et
+# de son code : un nœud n'est reconstruit que si sa clé a changé ou si une
+# de ses sorties a disparu ou été modifiée.
+#
+# Les nœuds dont les dépendances sont prêtes tournent en parallèle (pool de
+# processus). Les clés sont calculées au dernier moment, sur les sorties
+# réelles des nœuds précédents : si un nœud reconstruit produit les mêmes
+# fichiers qu'avant, la suite du graphe reste à jour. Les hachages de
+# fichiers sont mis en cache par (taille, date de modification).
+
+BUILD_DIR = ".build"
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class Node:
+    def __init__(self, name, func, inputs=None, outputs=None, params=None, code=()):
+        self.name = name
+        self.func = func
+        self.inputs = inputs or {}     # nom -> chemin (fichier ou dossier)
+        self.outputs = outputs or {}   # nom -> chemin
+        self.params = params or {}
+        self.code = [os.path.join(HERE, c) for c in code]
+
+
+class Context:
+    """Ce que reçoit la fonction d'un nœud (envoyé au processus worker)"""
+
+    def __init__(self, node, salt, cache_dir):
+        self.inputs = node.inputs
+        self.outputs = node.outputs
+        self.params = node.params
+        self.salt = salt             # hachage de tout sauf du contenu des entrées
+        self.cache_dir = cache_dir   # cache propre au nœud, conservé entre builds
+
+
+def run_node(func, ctx):
+    for path in ctx.outputs.values():
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    started = time.perf_counter()
+    func(ctx)
+    return time.perf_counter() - started
+
+
+class Build:
+    def __init__(self, nodes, root="dataset", workers=None):
+        self.nodes = {n.name: n for n in nodes}
+        self.root = root
+        self.workers = workers or os.cpu_count() or 1
+        self.state_path = os.path.join(root, BUILD_DIR, "state.json")
+        self.state = {"files": {}, "nodes": {}}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+        producers = {path: n.name for n in nodes for path in n.outputs.values()}
+        self.deps = {n.name: {producers[p] for p in n.inputs.values() if p in producers} for n in nodes}
+
+    # ============================================
+    # HACHAGES
+    # ============================================
+
+    def file_hash(self, path):
+        """SHA-256 d'un fichier (réutilisé si taille et date inchangées)"""
+        st = os.stat(path)
+        cached = self.state["files"].get(path)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        self.state["files"][path] = [st.st_size, st.st_mtime_ns, digest.hexdigest()]
+        return digest.hexdigest()
+
+    def path_hash(self, path):
+        """Fichier, dossier (tous ses fichiers) ou absent"""
+        if os.path.isdir(path):
+            files = sorted(p for p in glob.glob(os.path.join(path, "**"), recursive=True) if os.path.isfile(p))
+            return hashlib.sha256("".join(
+                f"{os.path.relpath(p, path)}:{self.file_hash(p)}\n" for p in files
+            ).encode("utf-8")).hexdigest()
+        if os.path.exists(path):
+            return self.file_hash(path)
+        return "absent"
+
+    def salt(self, node):
+        """Hachage des paramètres et du code du nœud"""
+        return hashlib.sha256(json.dumps({
+            "name": node.name,
+            "params": node.params,
+            "code": [self.file_hash(c) for c in node.code],
+        }, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def key(self, node):
+        inputs = {name: self.path_hash(path) for name, path in sorted(node.inputs.items())}
+        return hashlib.sha256(f"{self.salt(node)}:{json.dumps(inputs, sort_keys=True)}".encode("utf-8")).hexdigest()
+
+    def is_fresh(self, node, key):
+        known = self.state["nodes"].get(node.name)
+        if not known or known["key"] != key:
+            return False
+        return all(os.path.exists(path) and self.path_hash(path) == known["outputs"].get(path)
+                   for path in node.outputs.values())
+
+    def record(self, node, key):
+        self.state["nodes"][node.name] = {
+            "key": key,
+            "outputs": {path: self.path_hash(path) for path in node.outputs.values()},
+        }
+        self.save_state()
+
+    def save_state(self):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        # Ne garder que les hachages des fichiers qui existent encore
+        self.state["files"] = {p: h for p, h in self.state["files"].items() if os.path.exists(p)}
+        tmp = self.state_path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.state_path)
+
+    # ============================================
+    # EXÉCUTION
+    # ============================================
+
+    def needed(self, targets):
+        """Les nœuds cibles et toutes leurs dépendances"""
+        todo, seen = list(targets or self.nodes), set()
+        while todo:
+            name = todo.pop()
+            if name not in seen:
+                seen.add(name)
+                todo.extend(self.deps[name])
+        return seen
+
+    def run(self, targets=None, force=False):
+        """Reconstruit les nœuds périmés ; renvoie {nœud: "à jour" | "reconstruit"}"""
+        remaining = self.needed(targets)
+        status = {}
+        running = {}
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        try:
+            while remaining or running:
+                # Un nœud à jour peut rendre prêts les suivants : on boucle
+                ready = [n for n in sorted(remaining) if self.deps[n] <= set(status)]
+                while ready:
+                    for name in ready:
+                        remaining.discard(name)
+                        node = self.nodes[name]
+                        key = self.key(node)
+                        if not force and self.is_fresh(node, key):
+                            status[name] = "à jour"
+                            print(f"  ✓ {name:<10} à jour")
+                            continue
+                        print(f"  🔨 {name:<10} ...")
+                        ctx = Context(node, self.salt(node), os.path.join(self.root, BUILD_DIR, name))
+                        if pool is None:
+                            running[name] = (key, run_node(node.func, ctx))
+                        else:
+                            running[name] = (key, pool.submit(run_node, node.func, ctx))
+                    ready = [n for n in sorted(remaining) if self.deps[n] <= set(status)]
+                if not running:
+                    if remaining:
+                        raise RuntimeError(f"Dépendances introuvables : {sorted(remaining)}")
+                    break
+                if pool is None:
+                    done = list(running)
+                else:
+                    finished, _ = wait([f for _, f in running.values()], return_when=FIRST_COMPLETED)
+                    done = [n for n, (_, f) in running.items() if f in finished]
+                for name in done:
+                    key, job = running.pop(name)
+                    elapsed = job if pool is None else job.result()
+                    self.record(self.nodes[name], key)
+                    status[name] = "reconstruit"
+                    print(f"  ✓ {name:<10} reconstruit ({elapsed:.1f}s)")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            self.save_state()
+        return status
+
+
+# ============================================
+# NŒUDS DU DATASET
+# ============================================
+
+def build_raw(ctx):
+    """Export JSON de tous les articles scrapés (écrit en flux)"""
+    with open(ctx.outputs["raw"], 'w', encoding='utf-8') as f:
+        f.write("[")
+        for i, article in enumerate(iter_articles(ctx.inputs["source"])):
+            f.write(",\n" if i else "\n")
+            f.write(json.dumps(article, ensure_ascii=False))
+        f.write("\n]\n")
+
+
+def build_dedup(ctx):
+    deduplicate(ctx.inputs["source"], ctx.outputs["articles"], ctx.outputs["report"], **ctx.params)
+
+
+def build_clean(ctx):
+    paths = {name: ctx.outputs[name] for name in ctx.outputs}
+    clean_corpus(ctx.inputs["articles"], output_dir=ctx.cache_dir, paths=paths,
+                 cache_dir=os.path.join(ctx.cache_dir, "batches"), salt=ctx.salt,
+                 model_file=ctx.inputs["model"], **ctx.params)
+
+
+def build_ngram_stats(ctx):
+    save_json(build_ngrams(ctx.inputs["sentences"], **ctx.params), ctx.outputs["ngrams.json"])
+
+
+def build_dictionary(ctx):
+    """Mots du corpus (par fréquence) puis mots-vedettes de tenymalagasy.org
+    absents du corpus ; les entrées complètes vont dans tenymalagasy.json"""
+    with open(ctx.inputs["corpus"], 'r', encoding='utf-8') as f:
+        words = json.load(f)
+    entries = load_entries(ctx.inputs["tenymalagasy"]) if os.path.exists(ctx.inputs["tenymalagasy"]) else []
+    known = set(words)
+    for entry in sorted(entries, key=lambda e: e["headword"]):
+        word = entry["headword"].lower()
+        if word not in known and WORD_RE.fullmatch(word):
+            known.add(word)
+            words.append(word)
+    save_json(words, ctx.outputs["dictionnaire_mg.json"])
+    save_json({e["headword"]: {"pos": e["pos"], "definitions": e["definitions"]}
+               for e in sorted(entries, key=lambda e: e["headword"])},
+              ctx.outputs["tenymalagasy.json"])
+
+
+def build_static(ctx):
+    for name, data in ctx.params["lexicons"].items():
+        save_lexicon(data, ctx.outputs[name])
+
+
+def dataset_nodes(source, root="dataset", model=MODEL_FILE, dictionary=STORE_FILE):
+    """Le pipeline scraping -> dataset/ (mêmes emplacements qu'organize.py)"""
+    def out(*parts):
+        return os.path.join(root, *parts)
+
+    articles = out("corpus", "articles_dedup.jsonl")
+    sentences = out("corpus", "sentences.txt")
+    corpus_words = out("stats", "dictionnaire_corpus.json")
+    lexicons = static_lexicons()
+    return [
+        Node("raw", build_raw,
+             inputs={"source": source},
+             outputs={"raw": out("corpus", "articles_raw.json")},
+             code=["build.py", "cleaner.py"]),
+        Node("dedup", build_dedup,
+             inputs={"source": source},
+             outputs={"articles": articles, "report": out("stats", "dedup_report.json")},
+             params={"threshold": 0.8},
+             code=["build.py", "dedup.py", "cleaner.py"]),
+        Node("clean", build_clean,
+             inputs={"articles": articles, "model": model},
+             outputs={
+                 "articles_clean.json": out("corpus", "articles_clean.json"),
+                 "sentences.txt": sentences,
+                 "word_frequencies.json": out("stats", "word_frequencies.json"),
+                 "dictionnaire_mg.json": corpus_words,
+             },
+             params={"batch_size": 256},
+             code=["build.py", "cleaner.py", "language_id.py", "build_lexicons.py"]),
+        Node("dictionary", build_dictionary,
+             inputs={"corpus": corpus_words, "tenymalagasy": dictionary},
+             outputs={"dictionnaire_mg.json": out("lexiques", "dictionnaire_mg.json"),
+                      "tenymalagasy.json": out("lexiques", "tenymalagasy.json")},
+             code=["build.py", "tenymalagasy_scraper.py"]),
+        Node("ngrams", build_ngram_stats,
+             inputs={"sentences": sentences},
+             outputs={"ngrams.json": out("stats", "ngrams.json")},
+             params={"max_n": 3, "min_count": 2},
+             code=["build.py", "build_lexicons.py"]),
+        Node("lexicons", build_static,
+             outputs={name: out("rules" if name == "phonotactics.json" else "lexiques", name)
+                      for name in lexicons},
+             params={"lexicons": lexicons},
+             code=["build.py", "build_lexicons.py"]),
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Construit dataset/ de façon incrémentale")
+    parser.add_argument("targets", nargs="*", help="nœuds à construire (tous par défaut)")
+    parser.add_argument("--source", default="output" if os.path.isdir("output") else "articles_raw.json")
+    parser.add_argument("--root", default="dataset")
+    parser.add_argument("--dictionary", default=STORE_FILE, help="store JSONL de tenymalagasy_scraper.py")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="tout reconstruire")
+    args = parser.parse_args()
+
+    print(f"🏗  Construction de {args.root}/ depuis {args.source}")
+    started = time.perf_counter()
+    build = Build(dataset_nodes(args.source, args.root, dictionary=args.dictionary), args.root, args.workers)
+    status = build.run(args.targets or None, force=args.force)
+    rebuilt = sum(1 for s in status.values() if s == "reconstruit")
+    print(f"\n✅ {rebuilt} reconstruit(s), {len(status) - rebuilt} à jour "
+          f"({time.perf_counter() - started:.1f}s)")
@@ -1,7 +1,14 @@
 # build_lexicons.py
+import heapq
 import json
+import math
+import os
 import re
-from collections import Counter, defaultdict
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
 # ============================================
 # CHARGEMENT
@@ -28,42 +35,167 @@ def save_text(lines, filename):
 # ============================================
 # CONSTRUCTION N-GRAMS
 # ============================================
+#
+# Comptage en flux, par morceaux du fichier (shards) répartis sur un pool
+# de processus. Chaque worker compte dans un Counter et, dès que le budget
+# mémoire est dépassé, écrit un "run" trié sur disque. Les runs sont ensuite
+# fusionnés (k-way merge) sans jamais tout charger en mémoire, puis élagués
+# par seuil de comptage et, en option, par entropie relative.
+
+NGRAM_NAMES = {2: "bigrams", 3: "trigrams", 4: "fourgrams", 5: "fivegrams"}
+
+# Estimation grossière du coût d'une entrée (clé str + entier + slot dict)
+BYTES_PER_ENTRY = 120
+
+
+def shard_offsets(filename, n_shards):
+    """Découpe le fichier en n_shards plages d'octets [début, fin)"""
+    size = os.path.getsize(filename)
+    step = max(1, size // max(1, n_shards))
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+def iter_shard_lines(filename, start, end):
+    """Lignes dont le premier octet est dans [start, end)"""
+    with open(filename, 'rb') as f:
+        if start > 0:
+            f.seek(start - 1)
+            f.readline()  # ligne entamée: elle appartient au shard précédent
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            yield line.decode('utf-8', errors='ignore')
+
+
+def spill_run(counts, tmp_dir):
+    """Écrit un run trié (clé\tcompte) et renvoie son chemin"""
+    fd, path = tempfile.mkstemp(suffix=".run", dir=tmp_dir)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        for key in sorted(counts):
+            f.write(f"{key}\t{counts[key]}\n")
+    counts.clear()
+    return path
+
+
+def count_shard(args):
+    """Worker: compte les 1..max_n-grams d'un shard, renvoie ses runs"""
+    filename, start, end, max_n, max_entries, tmp_dir = args
+    counts = Counter()
+    runs = []
+    for line in iter_shard_lines(filename, start, end):
+        words = line.lower().split()
+        for n in range(1, max_n + 1):
+            for i in range(len(words) - n + 1):
+                counts[" ".join(words[i:i + n])] += 1
+        if len(counts) > max_entries:
+            runs.append(spill_run(counts, tmp_dir))
+    if counts:
+        runs.append(spill_run(counts, tmp_dir))
+    return runs
+
+
+def read_run(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            key, _, count = line.rstrip('\n').rpartition('\t')
+            yield key, int(count)
+
+
+def merge_runs(runs):
+    """Fusionne les runs triés en sommant les clés identiques"""
+    current, total = None, 0
+    for key, count in heapq.merge(*(read_run(p) for p in runs)):
+        if key != current:
+            if current is not None:
+                yield current, total
+            current, total = key, 0
+        total += count
+    if current is not None:
+        yield current, total
+
+
+def prune_entropy(counts, threshold):
+    """Élagage à la Stolcke: retire les n-grams dont la contribution
+    p(h, w) * log(p(w|h) / p(w|h')) à l'entropie relative est < threshold.
+    counts[n] contient les n-grams d'ordre n (1 = unigrams)."""
+    total = sum(counts[1].values()) or 1
+    pruned = {1: counts[1]}
+    for n in sorted(k for k in counts if k > 1):
+        lower = counts[n - 1]
+        kept = {}
+        for key, c in counts[n].items():
+            words = key.split(" ")
+            history = " ".join(words[:-1])
+            shorter = " ".join(words[1:])
+            p = c / lower.get(history, c)
+            if n == 2:
+                p_lower = counts[1].get(words[-1], 1) / total
+            else:
+                p_lower = lower.get(shorter, 1) / counts[n - 2].get(" ".join(words[1:-1]), 1)
+            if (c / total) * math.log(p / p_lower) >= threshold:
+                kept[key] = c
+        pruned[n] = kept
+    return pruned
+
+
+def peak_rss_mb():
+    """Pic de RSS (processus + workers terminés), en Mo ; 0 là où le module
+    resource n'existe pas (Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss est en octets sous macOS, en Ko ailleurs
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def build_ngrams(sentences_file, max_n=3, min_count=2, entropy_threshold=None,
+                 workers=None, memory_budget_mb=512, tmp_dir=None):
+    """Construit les 2..max_n-grams (max_n <= 5) pour autocomplétion.
+
+    - min_count: seuil minimal de fréquence
+    - entropy_threshold: élagage supplémentaire par entropie relative
+    - memory_budget_mb: budget total des Counter avant écriture sur disque
+    """
 
-def build_ngrams(sentences_file):
-    """Construit bigrams et trigrams pour autocomplétion"""
-    
     print("📊 Construction des n-grams...")
-    
-    text = load_text(sentences_file)
-    sentences = text.strip().split('\n')
-    
-    bigrams = defaultdict(int)
-    trigrams = defaultdict(int)
-    
-    for sentence in sentences:
-        words = sentence.lower().split()
-        
-        # Bigrams
-        for i in range(len(words) - 1):
-            key = f"{words[i]} {words[i+1]}"
-            bigrams[key] += 1
-        
-        # Trigrams
-        for i in range(len(words) - 2):
-            key = f"{words[i]} {words[i+1]} {words[i+2]}"
-            trigrams[key] += 1
-    
-    # Trier par fréquence
-    bigrams_sorted = dict(sorted(bigrams.items(), key=lambda x: -x[1])[:3000])
-    trigrams_sorted = dict(sorted(trigrams.items(), key=lambda x: -x[1])[:2000])
-    
-    print(f"  ✓ {len(bigrams_sorted)} bigrams")
-    print(f"  ✓ {len(trigrams_sorted)} trigrams")
-    
-    return {
-        "bigrams": bigrams_sorted,
-        "trigrams": trigrams_sorted
-    }
+    started = time.perf_counter()
+
+    max_n = max(2, min(max_n, max(NGRAM_NAMES)))
+    workers = workers or os.cpu_count() or 1
+    max_entries = max(1000, memory_budget_mb * 1024 * 1024 // BYTES_PER_ENTRY // workers)
+    shards = shard_offsets(sentences_file, workers * 4)
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as run_dir:
+        jobs = [(sentences_file, s, e, max_n, max_entries, run_dir) for s, e in shards]
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                runs = [r for shard_runs in pool.map(count_shard, jobs) for r in shard_runs]
+        else:
+            runs = [r for job in jobs for r in count_shard(job)]
+        print(f"  ✓ {len(shards)} shards, {len(runs)} runs sur disque")
+
+        counts = {n: {} for n in range(1, max_n + 1)}
+        for key, count in merge_runs(runs):
+            if count >= min_count:
+                counts[key.count(" ") + 1][key] = count
+
+    if entropy_threshold is not None:
+        counts = prune_entropy(counts, entropy_threshold)
+
+    result = {}
+    for n in range(2, max_n + 1):
+        name = NGRAM_NAMES[n]
+        result[name] = dict(sorted(counts[n].items(), key=lambda x: (-x[1], x[0])))
+        print(f"  ✓ {len(result[name])} {name}")
+
+    elapsed = time.perf_counter() - started
+    print(f"  ⏱  {elapsed:.1f}s | RSS max: {peak_rss_mb():.0f} Mo")
+
+    return result
 
 # ============================================
 # DONNÉES STATIQUES
@@ -126,6 +258,54 @@ INVALID_PATTERNS = [
     "ck", "cz", "cx", "qw", "wx", "xz"
 ]
 
+def static_lexicons():
+    """Lexiques et règles écrits à la main : {fichier: contenu}"""
+    return {
+        "stopwords_mg.txt": STOPWORDS,
+        "sentiment.json": {
+            "positive": SENTIMENT_POSITIVE,
+            "negative": SENTIMENT_NEGATIVE,
+            "intensifiers": ["tena", "dia", "tokoa", "mihitsy", "tanteraka"],
+            "negators": ["tsy", "aza", "tsia", "sanatria"]
+        },
+        "ner_gazetteer.json": {
+            "cities": CITIES,
+            "regions": REGIONS,
+            "titles": ["Andriamatoa", "Ramatoa", "Ingahy", "Raiamandreny", "Tompoko"],
+            "org_keywords": ["Fikambanana", "Antoko", "Orinasa", "Banky", "Sekoly", "Hopitaly"]
+        },
+        "lemmatizer_rules.json": {
+            "prefixes": PREFIXES,
+            "suffixes": SUFFIXES,
+            "rules": [
+                {"pattern": "^mamp", "remove": "mamp", "type": "causatif"},
+                {"pattern": "^man", "remove": "man", "type": "actif"},
+                {"pattern": "^mi", "remove": "mi", "type": "actif"},
+                {"pattern": "^maha", "remove": "maha", "type": "potentiel"},
+                {"pattern": "^tafa", "remove": "tafa", "type": "passif"},
+                {"pattern": "^voa", "remove": "voa", "type": "passif"},
+                {"pattern": "ana$", "remove": "ana", "type": "suffixe"},
+                {"pattern": "ina$", "remove": "ina", "type": "suffixe"}
+            ]
+        },
+        "phonotactics.json": {
+            "invalid_combinations": INVALID_PATTERNS,
+            "valid_endings": ["a", "y", "o", "e", "i", "na", "ny", "tra", "ka"],
+            "invalid_endings": ["b", "c", "d", "f", "g", "h", "j", "k", "l", "m", "p", "q", "r", "s", "t", "v", "w", "x", "z"],
+            "vowels": ["a", "e", "i", "o"],
+            "consonants": ["b", "d", "f", "g", "h", "j", "k", "l", "m", "n", "p", "r", "s", "t", "v", "z"]
+        }
+    }
+
+
+def save_lexicon(data, filename):
+    """.txt : une entrée par ligne ; sinon JSON"""
+    if filename.endswith(".txt"):
+        save_text(data, filename)
+    else:
+        save_json(data, filename)
+
+
 # ============================================
 # MAIN
 # ============================================
@@ -139,65 +319,15 @@ def main():
     ngrams = build_ngrams("sentences.txt")
     save_json(ngrams, "ngrams.json")
     
-    # Stopwords
-    save_text(STOPWORDS, "stopwords_mg.txt")
-    
-    # Sentiment
-    sentiment = {
-        "positive": SENTIMENT_POSITIVE,
-        "negative": SENTIMENT_NEGATIVE,
-        "intensifiers": ["tena", "dia", "tokoa", "mihitsy", "tanteraka"],
-        "negators": ["tsy", "aza", "tsia", "sanatria"]
-    }
-    save_json(sentiment, "sentiment.json")
-    
-    # NER Gazetteer
-    ner = {
-        "cities": CITIES,
-        "regions": REGIONS,
-        "titles": ["Andriamatoa", "Ramatoa", "Ingahy", "Raiamandreny", "Tompoko"],
-        "org_keywords": ["Fikambanana", "Antoko", "Orinasa", "Banky", "Sekoly", "Hopitaly"]
-    }
-    save_json(ner, "ner_gazetteer.json")
-    
-    # Règles lemmatisation
-    lemma_rules = {
-        "prefixes": PREFIXES,
-        "suffixes": SUFFIXES,
-        "rules": [
-            {"pattern": "^mamp", "remove": "mamp", "type": "causatif"},
-            {"pattern": "^man", "remove": "man", "type": "actif"},
-            {"pattern": "^mi", "remove": "mi", "type": "actif"},
-            {"pattern": "^maha", "remove": "maha", "type": "potentiel"},
-            {"pattern": "^tafa", "remove": "tafa", "type": "passif"},
-            {"pattern": "^voa", "remove": "voa", "type": "passif"},
-            {"pattern": "ana$", "remove": "ana", "type": "suffixe"},
-            {"pattern": "ina$", "remove": "ina", "type": "suffixe"}
-        ]
-    }
-    save_json(lemma_rules, "lemmatizer_rules.json")
-    
-    # Règles phonotactiques
-    phonotactics = {
-        "invalid_combinations": INVALID_PATTERNS,
-        "valid_endings": ["a", "y", "o", "e", "i", "na", "ny", "tra", "ka"],
-        "invalid_endings": ["b", "c", "d", "f", "g", "h", "j", "k", "l", "m", "p", "q", "r", "s", "t", "v", "w", "x", "z"],
-        "vowels": ["a", "e", "i", "o"],
-        "consonants": ["b", "d", "f", "g", "h", "j", "k", "l", "m", "n", "p", "r", "s", "t", "v", "z"]
-    }
-    save_json(phonotactics, "phonotactics.json")
-    
-    # Stats finales
-    word_freq = load_json("word_frequencies.json")
-    dictionary = load_json("dictionnaire_mg.json")
+    # Stopwords, sentiment, NER, lemmatisation, phonotactique
+    for filename, data in static_lexicons().items():
+        save_lexicon(data, filename)
     
     print(f"\n{'='*50}")
     print("✅ LEXIQUES CRÉÉS")
     print(f"{'='*50}")
     print(f"""
 📁 Fichiers générés:
-  • dictionnaire_mg.json   ({len(dictionary)} mots)
-  • word_frequencies.json  (fréquences)
   • ngrams.json           ({len(ngrams['bigrams'])} bigrams, {len(ngrams['trigrams'])} trigrams)
   • stopwords_mg.txt      ({len(STOPWORDS)} mots)
   • sentiment.json        (positif/négatif)
@@ -205,6 +335,7 @@ def main():
   • lemmatizer_rules.json (préfixes/suffixes)
   • phonotactics.json     (règles orthographe)
   
+  (dictionnaire_mg.json et word_frequencies.json : cleaner.py)
 🎯 Prêt pour le backend!
 """)
 
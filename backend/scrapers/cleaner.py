@@ -1,12 +1,73 @@
 # cleaner.py
+import glob
+import hashlib
 import json
+import os
 import re
-from collections import Counter
+import tempfile
+import zlib
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 
-def load_articles(filename="articles_raw.json"):
-    """Charge les articles scrapés"""
-    with open(filename, 'r', encoding='utf-8') as f:
-        return json.load(f)
+try:
+    from build_lexicons import merge_runs, spill_run
+    from language_id import MODEL_FILE, LanguageIdentifier
+except ImportError:  # importé depuis backend/ (scrapers.cleaner)
+    from scrapers.build_lexicons import merge_runs, spill_run
+    from scrapers.language_id import MODEL_FILE, LanguageIdentifier
+
+# ============================================
+# LECTURE EN FLUX
+# ============================================
+
+def iter_jsonl(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_articles(source="articles_raw.json"):
+    """Articles scrapés, un par un : un fichier JSONL, un dossier de shards
+    JSONL (output/ de scraper_v2) ou l'ancien export JSON (chargé en bloc).
+
+    Dans un dossier de shards, une page écrite plusieurs fois (nouvelle
+    révision) n'est lue que dans sa dernière version : un premier passage
+    ne garde en mémoire que la position de la dernière ligne de chaque page."""
+    if os.path.isdir(source):
+        paths = sorted(glob.glob(os.path.join(source, "articles-*.jsonl")))
+        last = {}
+        for p, path in enumerate(paths):
+            for n, article in enumerate(iter_jsonl(path)):
+                last[article.get("id") or article["title"]] = (p, n)
+        keep = set(last.values())
+        for p, path in enumerate(paths):
+            for n, article in enumerate(iter_jsonl(path)):
+                if (p, n) in keep:
+                    yield article
+    elif source.endswith(".jsonl"):
+        yield from iter_jsonl(source)
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+
+
+# ============================================
+# NETTOYAGE
+# ============================================
+
+REFERENCE_RE = re.compile(r'\[\d+\]')
+URL_RE = re.compile(r'https?://\S+')
+SPECIAL_RE = re.compile(r'[^\w\s\.,;:!?\'\"-]')
+SPACES_RE = re.compile(r'\s+')
+# Lettres accentuées comprises ; apostrophes et tirets séparent les mots
+# (amin'ny -> amin, ny), comme utils.text_processor.tokenize
+WORD_RE = re.compile(r"[^\W\d_ʼ]{2,}")
+SENTENCE_END_RE = re.compile(r'[.!?]+')
+
+# Mots très courants en malagasy (score de repli sans modèle de langue)
+COMMON_MG = {'ny', 'sy', 'dia', 'ary', 'fa', 'izany', 'izy', 'amin',
+             'ho', 'tsy', 'na', 'ao', 'an', 'eo', 'io', 'no', 'mba'}
 
 
 def clean_text(text):
@@ -15,138 +76,333 @@ def clean_text(text):
         return ""
     
     # Supprimer références [1], [2]...
-    text = re.sub(r'\[\d+\]', '', text)
+    text = REFERENCE_RE.sub('', text)
     
     # Supprimer URLs
-    text = re.sub(r'https?://\S+', '', text)
+    text = URL_RE.sub('', text)
     
     # Supprimer caractères spéciaux (garder ponctuation de base)
-    text = re.sub(r'[^\w\s\.,;:!?\'\"-]', ' ', text)
+    text = SPECIAL_RE.sub(' ', text)
     
     # Normaliser espaces
-    text = re.sub(r'\s+', ' ', text)
+    text = SPACES_RE.sub(' ', text)
     
     return text.strip()
 
 
+def words_of(clean):
+    """Mots d'un texte déjà nettoyé"""
+    return WORD_RE.findall(clean.lower())
+
+
+def sentences_of(clean):
+    """Phrases (au moins 3 mots) d'un texte déjà nettoyé"""
+    sentences = (s.strip() for s in SENTENCE_END_RE.split(clean))
+    return [s for s in sentences if len(s.split()) >= 3]
+
+
+def malagasy_ratio(words):
+    """Part des mots malagasy très courants (score 0-1)"""
+    if not words:
+        return 0
+    return sum(1 for w in words if w in COMMON_MG) / len(words)
+
+
 def extract_words(text):
     """Extrait les mots d'un texte"""
-    text = clean_text(text).lower()
-    words = re.findall(r'\b[a-zA-Z]{2,}\b', text)
-    return words
+    return words_of(clean_text(text))
 
 
 def extract_sentences(text):
     """Extrait les phrases d'un texte"""
-    text = clean_text(text)
-    sentences = re.split(r'[.!?]+', text)
-    # Garder phrases avec au moins 3 mots
-    return [s.strip() for s in sentences if len(s.strip().split()) >= 3]
+    return sentences_of(clean_text(text))
 
 
-def detect_malagasy_quality(text):
-    """Détecte si le texte est bien en malagasy (score 0-1)"""
-    # Mots très courants en malagasy
-    common_mg = {'ny', 'sy', 'dia', 'ary', 'fa', 'izany', 'izy', 'amin', 
-                 'ho', 'tsy', 'na', 'ao', 'an', 'eo', 'io', 'no', 'mba'}
-    
-    words = extract_words(text)
-    if not words:
-        return 0
-    
-    mg_count = sum(1 for w in words if w in common_mg)
-    return mg_count / len(words)
+_language_models = {}
 
 
-def process_articles(articles):
-    """Traite tous les articles"""
-    
-    print("🧹 Nettoyage des articles...")
-    
-    clean_articles = []
-    all_words = []
-    all_sentences = []
+def get_language_model(path=MODEL_FILE):
+    """Modèle d'identification de langue (language_id.py), chargé une fois
+    par processus et par chemin ; None s'il n'a pas été entraîné"""
+    if path not in _language_models:
+        _language_models[path] = LanguageIdentifier.load(path) if os.path.exists(path) else None
+    return _language_models[path]
+
+
+def clean_batch(articles, min_probability=0.5, model_file=MODEL_FILE):
+    """Worker : nettoie un lot, renvoie (articles, phrases, Counter des mots).
+
+    Chaque article est nettoyé une seule fois. Avec le modèle de langue, les
+    phrases de tout le lot sont scorées en un seul passage : seules les
+    phrases malagasy (probabilité >= min_probability) sont gardées et
+    comptées, et quality_score est la part du texte en malagasy. Sans
+    modèle, quality_score est la part de mots-outils malagasy."""
+    cleaned = [clean_text(article.get("content", "")) for article in articles]
+    split = [sentences_of(clean) for clean in cleaned]
+    model = get_language_model(model_file)
+    flat = [s for sentences in split for s in sentences]
+    probabilities = model.probability(flat) if model is not None and flat else None
     
-    for article in articles:
-        content = article.get("content", "")
-        
-        # Vérifier qualité malagasy
-        quality = detect_malagasy_quality(content)
-        
-        # Nettoyer
-        clean_content = clean_text(content)
-        words = extract_words(content)
-        sentences = extract_sentences(content)
-        
-        # Stocker
-        clean_articles.append({
+    records, kept_sentences, counts = [], [], Counter()
+    position = 0
+    for article, clean, sentences in zip(articles, cleaned, split):
+        if model is None:
+            words = words_of(clean)
+            quality = malagasy_ratio(words)
+        else:
+            p = probabilities[position:position + len(sentences)]
+            position += len(sentences)
+            total = sum(len(s) for s in sentences)
+            sentences = [s for s, q in zip(sentences, p) if q >= min_probability]
+            quality = sum(len(s) for s in sentences) / total if total else 0
+            words = words_of(" ".join(sentences))
+        records.append({
             "id": article.get("id"),
             "title": article["title"],
-            "content_clean": clean_content,
+            "content_clean": clean,
             "word_count": len(words),
             "sentence_count": len(sentences),
-            "quality_score": round(quality, 3)
+            "quality_score": round(quality, 3),
+            "links": article.get("links", []),
+            "categories": article.get("categories", [])
         })
-        
-        all_words.extend(words)
-        all_sentences.extend(sentences)
-        
-        # Afficher statut
-        status = "✓" if quality > 0.03 else "⚠"
-        print(f"  {status} {article['title'][:40]:<40} | {len(words):>4} mots | qualité: {quality:.1%}")
+        kept_sentences.extend(sentences)
+        counts.update(words)
+    return records, kept_sentences, counts
+
+
+# ============================================
+# PIPELINE EN FLUX
+# ============================================
+#
+# Les articles sont lus un par un, groupés en lots et nettoyés par un pool
+# de processus (au plus 2 lots par worker en vol, pour que la mémoire ne
+# dépende pas de la taille du corpus). Les résultats sont écrits au fur et
+# à mesure : articles_clean.json (tableau JSON écrit élément par élément),
+# sentences.txt, et les comptes de mots en runs triés sur disque dès que
+# le budget est dépassé (mêmes runs que build_lexicons), fusionnés à la
+# fin puis re-triés par fréquence de la même façon.
+#
+# Avec un cache_dir (build.py), les lots sont découpés selon le contenu :
+# un lot se termine après un article dont le hachage tombe sur une valeur
+# donnée, donc ajouter ou modifier un article ne change que son lot. Le
+# résultat de chaque lot est gardé sous le hachage de son contenu : après
+# une petite modification du corpus, seuls les lots touchés sont nettoyés.
+
+CACHE_VERSION = "1"
+
+def batched(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def content_chunks(articles, average=256, maximum=1024):
+    """Lots découpés selon le contenu, avec le hachage de chacun"""
+    batch, digest = [], hashlib.sha1()
+    for article in articles:
+        data = json.dumps(article, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        batch.append(article)
+        digest.update(data + b"\n")
+        if zlib.crc32(data) % average == 0 or len(batch) == maximum:
+            yield batch, digest.hexdigest()
+            batch, digest = [], hashlib.sha1()
+    if batch:
+        yield batch, digest.hexdigest()
+
+
+def _cache_path(cache_dir, digest, salt):
+    key = hashlib.sha1(f"{CACHE_VERSION}:{salt}:{digest}".encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, key + ".json")
+
+
+def _read_cached(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        records, sentences, counts = json.load(f)
+    return records, sentences, Counter(counts)
+
+
+def _write_cached(path, result):
+    tmp = path + ".tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def process_articles(articles, workers=None, batch_size=256, cache_dir=None, salt="", used=None,
+                     model_file=MODEL_FILE):
+    """Nettoie un flux d'articles, dans l'ordre : génère les résultats de
+    clean_batch lot par lot. Avec cache_dir, les lots déjà nettoyés (même
+    contenu, même salt) sont relus au lieu d'être recalculés ; les chemins
+    du cache utilisés sont ajoutés à `used`."""
+    workers = workers or os.cpu_count() or 1
+    if cache_dir is None:
+        batches = ((batch, None) for batch in batched(articles, batch_size))
+    else:
+        os.makedirs(cache_dir, exist_ok=True)
+        batches = ((batch, _cache_path(cache_dir, digest, salt))
+                   for batch, digest in content_chunks(articles, batch_size, 4 * batch_size))
+    
+    def finish(path, result):
+        if path is not None:
+            if not isinstance(result, tuple):  # lot relu du cache
+                return _read_cached(path)
+            _write_cached(path, result)
+        return result
     
-    return clean_articles, all_words, all_sentences
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        pending = deque()
+        for batch, path in batches:
+            if path is not None:
+                if used is not None:
+                    used.add(path)
+                if os.path.exists(path):
+                    pending.append((path, None))
+                    continue
+            pending.append((path, pool.submit(clean_batch, batch, model_file=model_file) if pool
+                               else clean_batch(batch, model_file=model_file)))
+            while len(pending) >= 2 * workers:
+                path, job = pending.popleft()
+                yield finish(path, job.result() if pool and job is not None else job)
+        while pending:
+            path, job = pending.popleft()
+            yield finish(path, job.result() if pool and job is not None else job)
+    finally:
+        if pool is not None:
+            pool.shutdown()
 
 
-def build_word_frequencies(words):
-    """Compte fréquence des mots"""
-    return dict(Counter(words).most_common())
+MAX_COUNT = 10 ** 12 - 1
 
 
-def save_json(data, filename):
-    """Sauvegarde en JSON"""
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    print(f"💾 {filename}")
+def by_frequency(counts_runs, tmp_dir, max_entries):
+    """(mot, compte) par fréquence décroissante (puis ordre alphabétique),
+    via un second tri externe sur la clé (complément du compte, mot)"""
+    keyed, runs = {}, []
+    for word, count in merge_runs(counts_runs):
+        keyed[f"{MAX_COUNT - count:012d} {word}"] = count
+        if len(keyed) > max_entries:
+            runs.append(spill_run(keyed, tmp_dir))
+    if keyed:
+        runs.append(spill_run(keyed, tmp_dir))
+    for key, count in merge_runs(runs):
+        yield key.split(" ", 1)[1], count
 
 
-def save_text(lines, filename):
-    """Sauvegarde en texte"""
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(lines))
-    print(f"💾 {filename}")
+OUTPUTS = ("articles_clean.json", "sentences.txt", "word_frequencies.json", "dictionnaire_mg.json")
+
+
+def clean_corpus(source, output_dir=".", workers=None, batch_size=256,
+                 max_entries=1_000_000, min_quality=None, progress=10000,
+                 paths=None, cache_dir=None, salt="", model_file=MODEL_FILE):
+    """Nettoie tout le corpus en flux et écrit articles_clean.json,
+    sentences.txt, word_frequencies.json, dictionnaire_mg.json dans
+    output_dir (ou aux chemins donnés par paths, {nom: chemin}). Avec
+    cache_dir, seuls les lots modifiés depuis le dernier passage sont
+    nettoyés (voir plus haut). Les phrases sont filtrées par le modèle de
+    langue model_file. Renvoie les statistiques."""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {name: os.path.join(output_dir, name) for name in OUTPUTS} | (paths or {})
+    for path in paths.values():
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    used = set()
+    if min_quality is None:
+        # Part de texte malagasy avec le modèle, part de mots-outils sans
+        min_quality = 0.5 if get_language_model(model_file) is not None else 0.03
+    if os.path.exists(model_file):
+        # Les lots en cache dépendent du modèle de langue
+        with open(model_file, 'rb') as f:
+            salt = f"{salt}:{hashlib.sha1(f.read()).hexdigest()}"
+    stats = {"articles": 0, "words": 0, "unique_words": 0, "sentences": 0, "top_words": []}
+    
+    with tempfile.TemporaryDirectory(dir=output_dir) as tmp_dir:
+        counts, runs = Counter(), []
+        with open(paths["articles_clean.json"], 'w', encoding='utf-8') as articles_f, \
+             open(paths["sentences.txt"], 'w', encoding='utf-8') as sentences_f:
+            articles_f.write("[")
+            for records, sentences, batch_counts in process_articles(iter_articles(source), workers, batch_size,
+                                                                     cache_dir, salt, used, model_file):
+                for record in records:
+                    articles_f.write(",\n" if stats["articles"] else "\n")
+                    articles_f.write(json.dumps(record, ensure_ascii=False))
+                    stats["articles"] += 1
+                    stats["words"] += record["word_count"]
+                    if record["quality_score"] <= min_quality:
+                        print(f"  ⚠ {record['title'][:40]:<40} | {record['word_count']:>4} mots"
+                              f" | qualité: {record['quality_score']:.1%}")
+                    if progress and stats["articles"] % progress == 0:
+                        print(f"  … {stats['articles']} articles")
+                for sentence in sentences:
+                    sentences_f.write(("\n" if stats["sentences"] else "") + sentence)
+                    stats["sentences"] += 1
+                counts.update(batch_counts)
+                if len(counts) > max_entries:
+                    runs.append(spill_run(counts, tmp_dir))
+            articles_f.write("\n]\n")
+        if counts:
+            runs.append(spill_run(counts, tmp_dir))
+        
+        with open(paths["word_frequencies.json"], 'w', encoding='utf-8') as freq_f, \
+             open(paths["dictionnaire_mg.json"], 'w', encoding='utf-8') as dict_f:
+            freq_f.write("{")
+            dict_f.write("[")
+            for word, count in by_frequency(runs, tmp_dir, max_entries):
+                sep = ",\n" if stats["unique_words"] else "\n"
+                freq_f.write(f"{sep}  {json.dumps(word, ensure_ascii=False)}: {count}")
+                dict_f.write(f"{sep}  {json.dumps(word, ensure_ascii=False)}")
+                if len(stats["top_words"]) < 20:
+                    stats["top_words"].append((word, count))
+                stats["unique_words"] += 1
+            freq_f.write("\n}\n")
+            dict_f.write("\n]\n")
+    
+    # Le cache ne garde que les lots du corpus actuel
+    if cache_dir is not None:
+        for path in glob.glob(os.path.join(cache_dir, "*.json")):
+            if path not in used:
+                os.remove(path)
+        stats["batches"] = len(used)
+    
+    for name in OUTPUTS:
+        print(f"💾 {paths[name]}")
+    return stats
 
 
 if __name__ == "__main__":
     
-    # Charger articles
-    print("📂 Chargement articles_raw.json...")
-    articles = load_articles("articles_raw.json")
-    print(f"   {len(articles)} articles chargés\n")
+    from dedup import deduplicate
+    
+    # Shards JSONL de scraper_v2 si présents, sinon l'export JSON
+    source = "output" if os.path.isdir("output") else "articles_raw.json"
+    
+    # Quasi-doublons (articles et phrases répétées) retirés avant nettoyage
+    print(f"🔍 Quasi-doublons (MinHash-LSH) dans {source}...")
+    deduplicate(source, "articles_dedup.jsonl")
+    source = "articles_dedup.jsonl"
+    print(f"📂 Lecture en flux de {source}...")
     
     # Traiter
-    clean_articles, all_words, all_sentences = process_articles(articles)
+    print("🧹 Nettoyage des articles...")
+    if get_language_model() is None:
+        print(f"  ⚠ {MODEL_FILE} absent (python language_id.py) : phrases non filtrées par langue")
+    stats = clean_corpus(source)
     
     # Stats
-    word_freq = build_word_frequencies(all_words)
-    unique_words = list(word_freq.keys())
-    
     print(f"\n📊 Statistiques:")
-    print(f"   Articles: {len(clean_articles)}")
-    print(f"   Mots totaux: {len(all_words)}")
-    print(f"   Mots uniques: {len(unique_words)}")
-    print(f"   Phrases: {len(all_sentences)}")
+    print(f"   Articles: {stats['articles']}")
+    print(f"   Mots totaux: {stats['words']}")
+    print(f"   Mots uniques: {stats['unique_words']}")
+    print(f"   Phrases: {stats['sentences']}")
     
     # Top 20 mots
     print(f"\n📈 Top 20 mots:")
-    for word, count in list(word_freq.items())[:20]:
+    for word, count in stats["top_words"]:
         print(f"   {word:<15} {count}")
     
-    # Sauvegarder
-    print(f"\n💾 Sauvegarde...")
-    save_json(clean_articles, "articles_clean.json")
-    save_json(word_freq, "word_frequencies.json")
-    save_json(unique_words, "dictionnaire_mg.json")
-    save_text(all_sentences, "sentences.txt")
-    
     print(f"\n✅ Nettoyage terminé!")
\ No newline at end of file
@@ -0,0 +1,310 @@
+# dedup.py
+import json
+import re
+import zlib
+
+import numpy as np
+
+try:
+    from cleaner import iter_articles
+except ImportError:  # importé depuis backend/ (scrapers.dedup)
+    from scrapers.cleaner import iter_articles
+
+# ============================================
+# DÉDUPLICATION MINHASH-LSH
+# ============================================
+#
+# Étape entre le scraping et le nettoyage. Chaque document (puis chaque
+# phrase) devient un ensemble de shingles (k mots consécutifs, hachés en
+# 32 bits), résumé par une signature MinHash : pour num_perm fonctions
+# h(x) = (a*x + b) >> 32 sur 64 bits (multiply-shift, sans division), le
+# minimum sur les shingles. La part de positions égales entre deux
+# signatures estime leur similarité de Jaccard.
+#
+# LSH par bandes : la signature est coupée en `bands` bandes de `rows`
+# valeurs ; deux documents qui ont une bande identique sont candidats
+# (probabilité 1 - (1 - s^rows)^bands pour une similarité s). Seules les
+# paires candidates sont vérifiées, jamais toutes les paires : le coût reste
+# quasi linéaire. Tout est vectorisé avec NumPy (hachage des shingles,
+# minimums par document avec minimum.reduceat, tri des clés de bande,
+# composantes connexes par propagation d'étiquettes).
+
+SHIFT = np.uint64(32)
+MAX_HASH = np.uint64(0xFFFFFFFF)
+WORD_RE = re.compile(r"\w+")
+SENTENCE_RE = re.compile(r"[^.!?\n]*[.!?]+\s*|[^.!?\n]+\s*|\n+")
+
+
+def token_hashes(text, cache):
+    """Hachages 32 bits des mots (minuscules) d'un texte, et leurs positions
+    dans le texte d'origine"""
+    hashes, starts = [], []
+    for m in WORD_RE.finditer(text):
+        word = m.group().lower()
+        h = cache.get(word)
+        if h is None:
+            h = cache[word] = zlib.crc32(word.encode("utf-8"))
+        hashes.append(h)
+        starts.append(m.start())
+    return np.array(hashes, dtype=np.uint64), np.array(starts, dtype=np.int64)
+
+
+def shingle_hashes(tokens, k):
+    """Hachages des k-grammes de mots, dans l'ordre (texte plus court : un
+    seul shingle). Les répétitions ne changent pas le minimum : pas de unique"""
+    k = min(k, len(tokens))
+    if not k:
+        return np.zeros(0, dtype=np.uint64)
+    n = len(tokens) - k + 1
+    h = np.zeros(n, dtype=np.uint64)
+    for j in range(k):
+        h = h * np.uint64(1000003) + tokens[j:j + n]
+    return (h ^ (h >> np.uint64(29))) & MAX_HASH
+
+
+class MinHasher:
+    """Signatures MinHash de num_perm permutations"""
+
+    def __init__(self, num_perm=128, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        # Multiply-shift : a impair sur 64 bits, 32 bits de poids fort
+        self.a = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.b = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)
+
+    def signatures(self, shingle_sets, block=1 << 16, perm_block=32):
+        """(n, num_perm) uint32 ; un ensemble vide a la signature MAX_HASH"""
+        n = len(shingle_sets)
+        sig = np.full((n, self.num_perm), MAX_HASH, dtype=np.uint64)
+        sizes = np.array([len(s) for s in shingle_sets], dtype=np.int64)
+        docs = np.flatnonzero(sizes)
+        # Par paquets de documents (~block shingles) et de permutations,
+        # pour borner la mémoire de la matrice shingles x permutations
+        start = 0
+        while start < len(docs):
+            stop = start + 1
+            total = sizes[docs[start]]
+            while stop < len(docs) and total + sizes[docs[stop]] <= block:
+                total += sizes[docs[stop]]
+                stop += 1
+            chunk = docs[start:stop]
+            x = np.concatenate([shingle_sets[d] for d in chunk])[:, None]
+            offsets = np.concatenate(([0], np.cumsum(sizes[chunk])[:-1]))
+            for p in range(0, self.num_perm, perm_block):
+                a, b = self.a[p:p + perm_block], self.b[p:p + perm_block]
+                hashed = (x * a + b) >> SHIFT
+                sig[chunk, p:p + perm_block] = np.minimum.reduceat(hashed, offsets, axis=0)
+            start = stop
+        return sig.astype(np.uint32)
+
+
+def candidate_pairs(sig, bands, rows):
+    """Paires (i, j) qui partagent au moins une bande de la signature"""
+    n = len(sig)
+    pairs = []
+    weights = np.uint64(0x9E3779B97F4A7C15) ** np.arange(1, rows + 1, dtype=np.uint64)
+    for band in range(bands):
+        keys = (sig[:, band * rows:(band + 1) * rows].astype(np.uint64) * weights).sum(axis=1)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        same = sorted_keys[1:] == sorted_keys[:-1]
+        # Chaque membre d'un seau est relié au premier du seau
+        group_start = np.maximum.accumulate(np.where(np.concatenate(([False], same)), 0, np.arange(n)))
+        members = np.flatnonzero(np.concatenate(([False], same)))
+        pairs.append(np.stack((order[group_start[members]], order[members]), axis=1))
+    pairs = np.concatenate(pairs) if pairs else np.zeros((0, 2), dtype=np.int64)
+    return np.unique(pairs, axis=0)
+
+
+def connected_components(n, pairs):
+    """Étiquette de composante (plus petit indice) de chaque élément"""
+    labels = np.arange(n)
+    if not len(pairs):
+        return labels
+    a, b = pairs[:, 0], pairs[:, 1]
+    while True:
+        low = np.minimum(labels[a], labels[b])
+        new = labels.copy()
+        np.minimum.at(new, a, low)
+        np.minimum.at(new, b, low)
+        new = new[new]  # saut de pointeur
+        if np.array_equal(new, labels):
+            return labels
+        labels = new
+
+
+def near_duplicates(sig, threshold=0.8, bands=16, rows=8):
+    """Grappes de quasi-doublons : (étiquettes, paires vérifiées, similarités).
+    Les signatures vides (MAX_HASH partout) ne sont jamais regroupées."""
+    assert bands * rows <= sig.shape[1]
+    pairs = candidate_pairs(sig, bands, rows)
+    empty = (sig == np.uint32(MAX_HASH)).all(axis=1)
+    if len(pairs):
+        pairs = pairs[~empty[pairs[:, 0]] & ~empty[pairs[:, 1]]]
+    similarity = (sig[pairs[:, 0]] == sig[pairs[:, 1]]).mean(axis=1) if len(pairs) else np.zeros(0)
+    keep = similarity >= threshold
+    pairs, similarity = pairs[keep], similarity[keep]
+    return connected_components(len(sig), pairs), pairs, similarity
+
+
+def clusters_of(labels):
+    """Indices de chaque grappe de plus d'un élément"""
+    order = np.argsort(labels, kind="stable")
+    bounds = np.flatnonzero(np.diff(labels[order])) + 1
+    return [g for g in np.split(order, bounds) if len(g) > 1]
+
+
+# ============================================
+# ÉTAPE DU PIPELINE
+# ============================================
+
+def split_sentences(text):
+    """Morceaux du texte (phrases avec leur ponctuation et espaces) ;
+    leur concaténation redonne le texte"""
+    return SENTENCE_RE.findall(text)
+
+
+class SignatureBuffer:
+    """Accumule des ensembles de shingles et ne garde que leurs signatures
+    (calculées par paquets de `flush_every`)"""
+
+    def __init__(self, hasher, flush_every=2000):
+        self.hasher = hasher
+        self.flush_every = flush_every
+        self.pending = []
+        self.parts = []
+
+    def add(self, shingles):
+        self.pending.append(shingles)
+        if len(self.pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.parts.append(self.hasher.signatures(self.pending))
+            self.pending = []
+
+    def result(self):
+        self.flush()
+        if not self.parts:
+            return np.zeros((0, self.hasher.num_perm), dtype=np.uint32)
+        return np.concatenate(self.parts)
+
+
+def deduplicate(source, output="articles_dedup.jsonl", report="dedup_report.json",
+                threshold=0.8, num_perm=128, bands=16, rows=8, shingle_size=5,
+                sentence_threshold=0.8, sentence_num_perm=64, sentence_bands=16, sentence_rows=4,
+                sentence_shingle_size=3, min_sentence_words=5):
+    """Retire les articles quasi identiques (on garde le plus long de chaque
+    grappe) puis, dans les articles gardés, les phrases répétées d'un article
+    à l'autre (on garde la première occurrence).
+
+    Deux lectures en flux de source : la première ne garde que les
+    signatures, la seconde écrit les articles gardés en JSONL. Renvoie (et
+    écrit dans report) les grappes retirées."""
+    docs = SignatureBuffer(MinHasher(num_perm))
+    sentences = SignatureBuffer(MinHasher(sentence_num_perm))
+    cache = {}
+
+    # Passe 1 : signatures des articles et des phrases
+    titles, lengths = [], []
+    sentence_doc, sentence_pos = [], []
+    for d, article in enumerate(iter_articles(source)):
+        content = article.get("content", "")
+        tokens, starts = token_hashes(content, cache)
+        titles.append(article["title"])
+        lengths.append(len(tokens))
+        docs.add(shingle_hashes(tokens, shingle_size))
+        # Les phrases réutilisent les mots du document : morceau de chaque
+        # mot, puis k-grammes du document qui restent dans un morceau
+        ends = np.cumsum([len(p) for p in split_sentences(content)])
+        piece = np.searchsorted(ends, starts, side="right")
+        counts = np.bincount(piece, minlength=len(ends))
+        first = np.cumsum(counts) - counts
+        grams = shingle_hashes(tokens, sentence_shingle_size)
+        for j in np.flatnonzero(counts >= min_sentence_words):
+            sentences.add(grams[first[j]:first[j] + counts[j] - sentence_shingle_size + 1])
+            sentence_doc.append(d)
+            sentence_pos.append(j)
+    sentence_doc = np.array(sentence_doc, dtype=np.int64)
+    sentence_pos = np.array(sentence_pos, dtype=np.int64)
+    print(f"  ✓ {len(titles)} articles, {len(sentence_doc)} phrases")
+
+    # Articles : on garde le plus long de chaque grappe
+    labels, _, _ = near_duplicates(docs.result(), threshold, bands, rows)
+    lengths = np.array(lengths)
+    removed_docs = set()
+    doc_clusters = []
+    for group in clusters_of(labels):
+        kept = int(group[np.argmax(lengths[group])])
+        removed = [int(i) for i in group if i != kept]
+        removed_docs.update(removed)
+        doc_clusters.append({"kept": titles[kept], "removed": [titles[i] for i in removed]})
+    print(f"  🗑  {len(removed_docs)} articles quasi dupliqués ({len(doc_clusters)} grappes)")
+
+    # Phrases des articles gardés : on garde la première occurrence
+    alive = np.flatnonzero(~np.isin(sentence_doc, list(removed_docs)))
+    labels, _, _ = near_duplicates(sentences.result()[alive], sentence_threshold,
+                                   sentence_bands, sentence_rows)
+    removed_sentences = {}   # article -> positions des morceaux retirés
+    heads = {}               # (article, position) de la phrase gardée -> grappe
+    sentence_clusters = []
+    for group in clusters_of(labels):
+        group = np.sort(alive[group])
+        for i in group[1:]:
+            removed_sentences.setdefault(int(sentence_doc[i]), set()).add(int(sentence_pos[i]))
+        heads[(int(sentence_doc[group[0]]), int(sentence_pos[group[0]]))] = len(sentence_clusters)
+        sentence_clusters.append({
+            "kept": None,
+            "count": len(group),
+            "articles": sorted({titles[sentence_doc[i]] for i in group}),
+        })
+    print(f"  🗑  {sum(c['count'] - 1 for c in sentence_clusters)} phrases répétées "
+          f"({len(sentence_clusters)} grappes)")
+
+    # Passe 2 : écriture des articles gardés, sans les phrases répétées
+    head_docs = {d for d, _ in heads}
+    written = 0
+    with open(output, 'w', encoding='utf-8') as f:
+        for d, article in enumerate(iter_articles(source)):
+            if d in removed_docs:
+                continue
+            drop = removed_sentences.get(d)
+            if not drop and d not in head_docs:
+                f.write(json.dumps(article, ensure_ascii=False) + "\n")
+                written += 1
+                continue
+            pieces = split_sentences(article.get("content", ""))
+            for j, piece in enumerate(pieces):
+                cluster = heads.get((d, j))
+                if cluster is not None:
+                    sentence_clusters[cluster]["kept"] = piece.strip()
+            if drop:
+                content = "".join(p for j, p in enumerate(pieces) if j not in drop)
+                article = dict(article, content=content)
+            f.write(json.dumps(article, ensure_ascii=False) + "\n")
+            written += 1
+
+    sentence_clusters.sort(key=lambda c: -c["count"])
+    result = {
+        "articles": len(titles),
+        "articles_kept": written,
+        "document_clusters": doc_clusters,
+        "sentence_clusters": sentence_clusters,
+    }
+    with open(report, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"💾 {output}")
+    print(f"💾 {report}")
+    return result
+
+
+if __name__ == "__main__":
+    import os
+
+    source = "output" if os.path.isdir("output") else "articles_raw.json"
+    print(f"🔍 Quasi-doublons (MinHash-LSH) dans {source}...")
+    report = deduplicate(source)
+    for cluster in report["document_clusters"][:10]:
+        print(f"  • {cluster['kept'][:40]:<40} ← {', '.join(cluster['removed'])[:60]}")
+    print(f"\n✅ {report['articles_kept']}/{report['articles']} articles gardés → articles_dedup.jsonl")
@@ -0,0 +1,175 @@
+# language_id.py
+import os
+import re
+import sys
+
+import numpy as np
+
+try:
+    from utils.dataset import model_path
+except ImportError:  # lancé depuis scrapers/ : backend/ n'est pas dans sys.path
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from utils.dataset import model_path
+
+# ============================================
+# IDENTIFICATION DE LANGUE (N-GRAMMES DE CARACTÈRES)
+# ============================================
+#
+# Naive Bayes sur les n-grammes de caractères (1 à 4) du texte en
+# minuscules, lettres seulement, mots séparés par un espace. Les n-grammes
+# sont hachés dans 2^bits cases (pas de vocabulaire à stocker) : le modèle
+# est une table log P(case | langue) de forme (langues, 2^bits), en float32.
+#
+# Le score est vectorisé sur tout un lot de phrases : les phrases sont
+# normalisées ensemble puis concaténées en un tableau de points de code, le
+# hachage de chaque n-gramme prolonge celui du (n-1)-gramme (décalage du
+# tableau), les n-grammes qui chevauchent deux phrases sont masqués, puis
+# les log-probabilités sont sommées par phrase avec bincount.
+
+SEPARATOR = 0
+SPACE = 32
+HASH_MULT = np.uint64(0x100000001B3)
+MODEL_FILE = model_path("language_id.npz")
+
+# Lettres parmi les points de code < 0x3000 (au-delà : considérés lettres)
+LETTERS = np.array([chr(c).isalpha() for c in range(0x3000)], dtype=bool)
+
+
+def normalize(texts):
+    """Points de code des textes, séparés par \0 : minuscules, toute suite de
+    non-lettres devient un espace, chaque texte entouré d'espaces"""
+    joined = " " + " \0 ".join(t.replace("\0", " ") for t in texts).lower() + " "
+    codes = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32)
+    letter = LETTERS[np.minimum(codes, len(LETTERS) - 1)] | (codes >= len(LETTERS))
+    codes = np.where(letter | (codes == SEPARATOR), codes, SPACE)
+    space = codes == SPACE
+    return codes[~(space & np.concatenate(([False], space[:-1])))]
+
+
+def ngram_features(texts, orders=(1, 2, 3, 4), bits=18):
+    """Pour chaque ordre n : (cases, numéro du texte) de ses n-grammes"""
+    codes = normalize(texts)
+    separators = np.concatenate(([0], np.cumsum(codes == SEPARATOR, dtype=np.int32)))
+    codes = codes.astype(np.uint64)
+    mask = np.uint64((1 << bits) - 1)
+    h = np.zeros(len(codes), dtype=np.uint64)
+    for n in range(1, max(orders) + 1):
+        size = len(codes) - n + 1
+        if size <= 0:
+            break
+        # Hachage du n-gramme en i prolongé depuis celui du (n-1)-gramme
+        h = h[:size] * HASH_MULT + codes[n - 1:]
+        if n not in orders:
+            continue
+        # Pas de séparateur dans le n-gramme : il reste dans un seul texte
+        inside = separators[n:n + size] == separators[:size]
+        if n == 1:
+            inside &= codes != SPACE
+        kept = h[inside]
+        yield ((kept ^ (kept >> np.uint64(31)) ^ np.uint64(n)) & mask).astype(np.intp), separators[:size][inside]
+
+
+class LanguageIdentifier:
+    def __init__(self, langs, log_probs, orders=(1, 2, 3, 4)):
+        self.langs = list(langs)
+        self.log_probs = log_probs
+        self.orders = tuple(orders)
+        self.bits = int(np.log2(log_probs.shape[1]))
+
+    # ============================================
+    # ENTRAÎNEMENT / CHARGEMENT
+    # ============================================
+
+    @classmethod
+    def train(cls, samples, orders=(1, 2, 3, 4), bits=18, alpha=0.1, batch=2000):
+        """samples : {langue: textes}. Lissage additif alpha par case."""
+        langs = sorted(samples)
+        counts = np.zeros((len(langs), 1 << bits), dtype=np.float64)
+        for i, lang in enumerate(langs):
+            texts = list(samples[lang])
+            for start in range(0, len(texts), batch):
+                for buckets, _ in ngram_features(texts[start:start + batch], orders, bits):
+                    counts[i] += np.bincount(buckets, minlength=1 << bits)
+        totals = counts.sum(axis=1, keepdims=True)
+        log_probs = np.log((counts + alpha) / (totals + alpha * (1 << bits)))
+        return cls(langs, log_probs.astype(np.float32), orders)
+
+    def save(self, path=MODEL_FILE):
+        np.savez(path, langs=np.array(self.langs), log_probs=self.log_probs,
+                 orders=np.array(self.orders))
+
+    @classmethod
+    def load(cls, path=MODEL_FILE):
+        data = np.load(path)
+        return cls(data["langs"].tolist(), data["log_probs"], data["orders"].tolist())
+
+    # ============================================
+    # PRÉDICTION
+    # ============================================
+
+    def log_likelihoods(self, texts):
+        """(textes, langues) somme des log-probabilités, et nombre de n-grammes"""
+        scores = np.zeros((len(texts), len(self.langs)))
+        sizes = np.zeros(len(texts), dtype=np.int64)
+        for buckets, owners in ngram_features(texts, self.orders, self.bits):
+            for i, table in enumerate(self.log_probs):
+                scores[:, i] += np.bincount(owners, weights=table[buckets], minlength=len(texts))
+            sizes += np.bincount(owners, minlength=len(texts))
+        return scores, sizes
+
+    def posteriors(self, texts):
+        """(textes, langues) probabilités a posteriori (a priori uniforme),
+        et nombre de n-grammes de chaque texte"""
+        scores, sizes = self.log_likelihoods(texts)
+        scores -= scores.max(axis=1, keepdims=True)
+        posterior = np.exp(scores)
+        posterior /= posterior.sum(axis=1, keepdims=True)
+        return posterior, sizes
+
+    def predict(self, texts):
+        """(langue la plus probable, probabilité) de chaque texte, en un seul
+        passage vectorisé. Texte sans lettres : (None, 0.0)"""
+        posterior, sizes = self.posteriors(texts)
+        best = posterior.argmax(axis=1)
+        return [(self.langs[b], float(posterior[t, b])) if sizes[t] else (None, 0.0)
+                for t, b in enumerate(best)]
+
+    def probability(self, texts, lang="mg"):
+        """Probabilité que chaque texte soit en `lang` (0 sans lettres)"""
+        posterior, sizes = self.posteriors(texts)
+        return np.where(sizes > 0, posterior[:, self.langs.index(lang)], 0.0)
+
+
+# ============================================
+# ENTRAÎNEMENT HORS LIGNE
+# ============================================
+
+def wikipedia_sample(lang, pages=300):
+    """Textes de pages aléatoires de la Wikipédia d'une langue"""
+    from scraper_v2 import MalagasyScraper
+
+    scraper = MalagasyScraper(api_url=f"https://{lang}.wikipedia.org/w/api.php",
+                              output_dir=os.path.join("output", f"langid-{lang}"))
+    titles = []
+    while len(titles) < pages:
+        data = scraper.api_get({"action": "query", "list": "random", "rnnamespace": 0,
+                                "rnlimit": min(50, pages - len(titles))})
+        titles.extend(r["title"] for r in data["query"]["random"])
+    return [p["content"] for p in scraper.fetch_pages(titles).values() if p["content"]]
+
+
+if __name__ == "__main__":
+    print("🌍 Entraînement de l'identification de langue...")
+
+    # Pages aléatoires des trois Wikipédias, brutes : pas sentences.txt, que
+    # ce modèle sert lui-même à filtrer (il s'entraînerait sur ses propres
+    # décisions)
+    samples = {lang: wikipedia_sample(lang) for lang in ("mg", "fr", "en")}
+
+    for lang, texts in samples.items():
+        print(f"  ✓ {lang}: {len(texts)} textes, {sum(len(t) for t in texts):,} caractères")
+
+    model = LanguageIdentifier.train(samples)
+    os.makedirs(os.path.dirname(MODEL_FILE), exist_ok=True)
+    model.save()
+    print(f"💾 {MODEL_FILE} ({model.log_probs.nbytes // 1024} Ko)")
@@ -1,4 +1,6 @@
 # organize.py
+# Ancienne méthode (scripts lancés à la main puis fichiers déplacés) :
+# build.py écrit directement dans dataset/ et ne reconstruit que le nécessaire.
 import shutil
 import os
 
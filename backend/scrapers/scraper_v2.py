@@ -1,52 +1,377 @@
 # scraper_v2.py
 import requests
+import argparse
+import glob
 import json
+import os
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+# ============================================
+# CLIENT API : DÉBIT, REPRISES
+# ============================================
+
+# Statuts HTTP temporaires : on réessaie
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# Codes d'erreur MediaWiki temporaires
+RETRY_API_ERRORS = {"maxlag", "ratelimited", "readonly"}
+
+
+class ApiError(Exception):
+    """Erreur définitive de l'API (ou reprises épuisées)"""
+
+
+class RetryableError(Exception):
+    """Erreur temporaire : la requête peut être refaite"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Limiteur de débit partagé entre threads : `rate` requêtes/s,
+    rafales jusqu'à `capacity`"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# ============================================
+# ÉTAT DU CRAWL / SHARDS JSONL
+# ============================================
+
+class CrawlState:
+    """État persistant du crawl : révision connue de chaque page (par
+    pageid) et position d'écriture des shards. Sauvegardé de façon atomique
+    à chaque checkpoint, pour reprendre un crawl interrompu."""
+    
+    def __init__(self, path):
+        self.path = path
+        self.pages = {}     # pageid (str) -> {"title", "revid"}
+        self.shard = 1      # numéro du shard courant
+        self.shard_lines = 0
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.pages = data.get("pages", {})
+            self.shard = data.get("shard", 1)
+            self.shard_lines = data.get("shard_lines", 0)
+    
+    def is_current(self, pageid, revid):
+        """La page est déjà stockée dans cette révision"""
+        known = self.pages.get(str(pageid))
+        return known is not None and revid is not None and known["revid"] == revid
+    
+    def record(self, pageid, revid, title):
+        self.pages[str(pageid)] = {"title": title, "revid": revid}
+    
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"pages": self.pages, "shard": self.shard, "shard_lines": self.shard_lines},
+                      f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+
+class ShardWriter:
+    """Ajoute les articles en JSONL dans output_dir/articles-00001.jsonl,
+    -00002... (nouveau shard tous les shard_size articles)"""
+    
+    def __init__(self, output_dir, state, shard_size=1000):
+        self.output_dir = output_dir
+        self.state = state
+        self.shard_size = shard_size
+        os.makedirs(output_dir, exist_ok=True)
+    
+    def shard_path(self, number):
+        return os.path.join(self.output_dir, f"articles-{number:05d}.jsonl")
+    
+    def append(self, articles):
+        f = None
+        try:
+            for article in articles:
+                if f is None or self.state.shard_lines >= self.shard_size:
+                    if self.state.shard_lines >= self.shard_size:
+                        self.state.shard += 1
+                        self.state.shard_lines = 0
+                    if f is not None:
+                        f.close()
+                    f = open(self.shard_path(self.state.shard), 'a', encoding='utf-8')
+                f.write(json.dumps(article, ensure_ascii=False) + "\n")
+                self.state.shard_lines += 1
+        finally:
+            if f is not None:
+                f.flush()
+                os.fsync(f.fileno())
+                f.close()
+
+
+def load_shards(output_dir):
+    """Articles de tous les shards ; pour une page écrite plusieurs fois
+    (nouvelle révision, reprise après interruption) la dernière version gagne"""
+    articles = {}
+    for path in sorted(glob.glob(os.path.join(output_dir, "articles-*.jsonl"))):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                article = json.loads(line)
+                articles[article.get("id") or article["title"]] = article
+    return list(articles.values())
+
 
 class MalagasyScraper:
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': 'MalagasyProject/1.0'})
-        self.api_url = "https://mg.wikipedia.org/w/api.php"
-        self.articles = []
+    def __init__(self, api_url="https://mg.wikipedia.org/w/api.php", workers=4, rate=5,
+                 batch_size=50, max_retries=4, backoff=0.5, timeout=10, verify=False,
+                 output_dir="output", shard_size=1000):
+        self.api_url = api_url
+        self.workers = workers
+        self.batch_size = batch_size      # 50 titres max par requête (API)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.verify = verify
+        self.limiter = TokenBucket(rate)
+        self.local = threading.local()    # une session HTTP par thread
+        self.articles = []                # articles nouveaux ou modifiés de ce run
+        self.seen = set()                 # titres déjà traités dans ce run
+        self.output_dir = output_dir
+        self.state = CrawlState(os.path.join(output_dir, "crawl_state.json"))
+        self.writer = ShardWriter(output_dir, self.state, shard_size)
     
-    def get_page_content(self, title):
-        """Récupère contenu d'une page par titre"""
+    @property
+    def session(self):
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+            self.local.session.headers.update({'User-Agent': 'MalagasyProject/1.0'})
+        return self.local.session
+    
+    def api_get(self, params):
+        """Une requête API, sous le limiteur de débit, avec reprises
+        (backoff exponentiel + jitter, Retry-After respecté)"""
+        params = dict(params, format="json")
+        error = None
+        
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            try:
+                resp = self.session.get(self.api_url, params=params, timeout=self.timeout, verify=self.verify)
+                if resp.status_code in RETRY_STATUS:
+                    raise RetryableError(f"HTTP {resp.status_code}", resp.headers.get("Retry-After"))
+                if resp.status_code >= 400:
+                    raise ApiError(f"HTTP {resp.status_code} pour {params}")
+                data = resp.json()
+                if "error" in data:
+                    code = data["error"].get("code", "")
+                    if code in RETRY_API_ERRORS:
+                        raise RetryableError(f"API {code}", resp.headers.get("Retry-After"))
+                    raise ApiError(f"API {code}: {data['error'].get('info', '')}")
+                return data
+            except (RetryableError, requests.RequestException, ValueError) as e:
+                error = e
+                if attempt == self.max_retries:
+                    break
+                delay = self.backoff * 2 ** attempt * (1 + random.random() / 2)
+                retry_after = getattr(e, "retry_after", None)
+                if retry_after and str(retry_after).isdigit():
+                    delay = max(delay, int(retry_after))
+                time.sleep(delay)
+        
+        raise ApiError(f"Échec après {self.max_retries + 1} tentatives: {error}")
+    
+    def query_all(self, params):
+        """Suit la pagination (`continue`) : une réponse par page de résultats"""
+        params = dict(params, action="query")
+        cont = {}
+        while True:
+            data = self.api_get({**params, **cont})
+            yield data
+            if "continue" not in data:
+                break
+            cont = data["continue"]
+    
+    # ============================================
+    # PAGES PAR LOTS
+    # ============================================
+    
+    def fetch_batch(self, titles, with_content=True):
+        """Identifiant et révision (prop=info) de jusqu'à 50 titres, plus
+        contenu, liens et catégories si with_content (une suite de requêtes
+        avec continuation)"""
         params = {
-            "action": "query",
-            "format": "json",
-            "titles": title,
-            "prop": "extracts",
-            "explaintext": True
+            "titles": "|".join(titles),
+            "prop": "info",
+            "redirects": True
         }
+        if with_content:
+            params.update({
+                "prop": "info|extracts|links|categories",
+                "explaintext": True,
+                "exlimit": "max",
+                "plnamespace": 0,
+                "pllimit": "max",
+                "clshow": "!hidden",
+                "cllimit": "max"
+            })
+        pages = {}
+        aliases = {}
         
+        for data in self.query_all(params):
+            query = data.get("query", {})
+            for item in query.get("normalized", []) + query.get("redirects", []):
+                aliases[item["from"]] = item["to"]
+            for pid, page in query.get("pages", {}).items():
+                if int(pid) < 0 or "missing" in page:
+                    continue
+                page_data = pages.setdefault(page["title"], {
+                    "pageid": int(pid), "revid": None, "content": "", "links": [], "categories": []
+                })
+                if page.get("lastrevid"):
+                    page_data["revid"] = page["lastrevid"]
+                if page.get("extract"):
+                    page_data["content"] = page["extract"]
+                page_data["links"].extend(l["title"] for l in page.get("links", []))
+                page_data["categories"].extend(c["title"] for c in page.get("categories", []))
+        
+        result = {}
+        for title in titles:
+            resolved = title
+            while resolved in aliases and aliases[resolved] != resolved:
+                resolved = aliases[resolved]
+            if resolved in pages:
+                result[title] = pages[resolved]
+        return result
+    
+    def _fetch_batch_safe(self, titles, with_content=True):
         try:
-            resp = self.session.get(self.api_url, params=params, timeout=10, verify=False)
-            pages = resp.json()["query"]["pages"]
-            for pid, page in pages.items():
-                if pid != "-1" and "extract" in page:
-                    return page.get("extract", "")
-        except:
-            pass
-        return ""
+            return self.fetch_batch(titles, with_content)
+        except ApiError as e:
+            print(f"  ⚠ Lot de {len(titles)} titres ignoré: {e}")
+            return {}
+    
+    def fetch_pages(self, titles, with_content=True):
+        """Récupère des pages par lots de `batch_size` titres, sur `workers`
+        connexions en parallèle : {titre demandé: page_data}"""
+        titles = list(dict.fromkeys(titles))
+        batches = [titles[i:i + self.batch_size] for i in range(0, len(titles), self.batch_size)]
+        pages = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for result in pool.map(lambda batch: self._fetch_batch_safe(batch, with_content), batches):
+                pages.update(result)
+        return pages
+    
+    def get_revisions(self, titles):
+        """{titre demandé: page_data} sans contenu : pageid et revid seulement"""
+        return self.fetch_pages(titles, with_content=False)
+    
+    def get_page(self, title):
+        """Récupère contenu, liens internes et catégories d'une page par titre"""
+        return self.fetch_pages([title]).get(title, {"pageid": None, "revid": None, "content": "",
+                                                     "links": [], "categories": []})
+    
+    def get_page_content(self, title):
+        """Récupère contenu d'une page par titre"""
+        return self.get_page(title)["content"]
+    
+    def make_article(self, title, page_data, source):
+        """Article avec texte, liens et catégories"""
+        content = page_data["content"]
+        return {
+            "id": page_data.get("pageid"),
+            "revid": page_data.get("revid"),
+            "title": title,
+            "content": content,
+            "source": source,
+            "word_count": len(content.split()),
+            "links": sorted(set(page_data["links"])),
+            "categories": sorted(set(page_data["categories"]))
+        }
     
-    def get_category_pages(self, category, limit=50):
-        """Récupère pages d'une catégorie"""
+    def scrape_titles(self, titles, source, min_length=200, label_width=40):
+        """Scrape incrémental : ne télécharge que les pages nouvelles ou
+        modifiées (révision différente de l'état), écrit les articles en JSONL
+        et sauvegarde l'état après chaque paquet (checkpoint)"""
+        
+        # Éviter doublons (dans ce run)
+        titles = [t for t in dict.fromkeys(titles) if t not in self.seen]
+        self.seen.update(titles)
+        
+        revisions = self.get_revisions(titles)
+        for title in titles:
+            if title not in revisions:
+                print(f"  ✗ {title[:label_width]:<{label_width}} (pas trouvé)")
+        todo = [t for t in titles
+                if t in revisions and not self.state.is_current(revisions[t]["pageid"], revisions[t]["revid"])]
+        unchanged = sum(1 for t in titles if t in revisions) - len(todo)
+        if unchanged:
+            print(f"  ↺ {unchanged} pages inchangées depuis le dernier run")
+        
+        chunk = self.batch_size * self.workers
+        added = 0
+        for i in range(0, len(todo), chunk):
+            batch = todo[i:i + chunk]
+            pages = self.fetch_pages(batch)
+            new_articles = []
+            for title in batch:
+                page_data = pages.get(title)
+                if page_data is None:
+                    continue
+                content = page_data["content"]
+                if content and len(content) > min_length:
+                    article = self.make_article(title, page_data, source)
+                    new_articles.append(article)
+                    print(f"  ✓ {title[:label_width]:<{label_width}} ({len(content.split()):>4} mots)")
+                # Noter aussi les pages trop courtes : pas de re-téléchargement
+                self.state.record(page_data["pageid"], page_data["revid"], title)
+            
+            # Checkpoint : shards d'abord, état ensuite
+            self.writer.append(new_articles)
+            self.state.save()
+            self.articles.extend(new_articles)
+            added += len(new_articles)
+        
+        return added
+    
+    def get_category_pages(self, category, limit=None):
+        """Récupère pages d'une catégorie (toutes si limit=None)"""
         params = {
-            "action": "query",
-            "format": "json",
             "list": "categorymembers",
             "cmtitle": f"Category:{category}",
-            "cmlimit": limit,
+            "cmlimit": min(limit or 500, 500),
             "cmtype": "page"
         }
+        members = []
         
         try:
-            resp = self.session.get(self.api_url, params=params, timeout=10, verify=False)
-            return resp.json()["query"]["categorymembers"]
-        except:
-            return []
+            for data in self.query_all(params):
+                members.extend(data.get("query", {}).get("categorymembers", []))
+                if limit and len(members) >= limit:
+                    return members[:limit]
+        except ApiError as e:
+            print(f"  ⚠ Catégorie '{category}': {e}")
+        return members
     
     def scrape_important_pages(self):
         """Scrape pages importantes sur Madagascar"""
@@ -102,24 +427,12 @@ class MalagasyScraper:
         
         print("📥 Scraping pages importantes...")
         
-        for title in important_titles:
-            content = self.get_page_content(title)
-            if content and len(content) > 200:
-                self.articles.append({
-                    "title": title,
-                    "content": content,
-                    "source": "important_pages",
-                    "word_count": len(content.split())
-                })
-                print(f"  ✓ {title:<35} ({len(content.split()):>4} mots)")
-            else:
-                print(f"  ✗ {title:<35} (pas trouvé)")
-            time.sleep(0.2)
+        self.scrape_titles(important_titles, "important_pages", label_width=35)
         
         return len(self.articles)
     
-    def scrape_categories(self):
-        """Scrape pages de catégories malagasy"""
+    def scrape_categories(self, limit=None):
+        """Scrape pages de catégories malagasy (limit membres max par catégorie)"""
         
         categories = [
             "Madagasikara",
@@ -135,26 +448,8 @@ class MalagasyScraper:
         
         for cat in categories:
             print(f"\n  📂 Catégorie: {cat}")
-            pages = self.get_category_pages(cat, limit=20)
-            
-            for page in pages:
-                title = page["title"]
-                
-                # Éviter doublons
-                if any(a["title"] == title for a in self.articles):
-                    continue
-                
-                content = self.get_page_content(title)
-                if content and len(content) > 200:
-                    self.articles.append({
-                        "title": title,
-                        "content": content,
-                        "source": f"category:{cat}",
-                        "word_count": len(content.split())
-                    })
-                    print(f"    ✓ {title[:40]:<40} ({len(content.split()):>4} mots)")
-                
-                time.sleep(0.2)
+            members = self.get_category_pages(cat, limit=limit)
+            self.scrape_titles([m["title"] for m in members], f"category:{cat}")
         
         return len(self.articles)
     
@@ -172,48 +467,33 @@ class MalagasyScraper:
         for term in search_terms:
             params = {
                 "action": "query",
-                "format": "json",
                 "list": "search",
                 "srsearch": term,
                 "srlimit": 10
             }
             
             try:
-                resp = self.session.get(self.api_url, params=params, timeout=10, verify=False)
-                results = resp.json()["query"]["search"]
-                
-                for result in results:
-                    title = result["title"]
-                    
-                    # Éviter doublons
-                    if any(a["title"] == title for a in self.articles):
-                        continue
-                    
-                    content = self.get_page_content(title)
-                    if content and len(content) > 500:  # Articles plus longs
-                        self.articles.append({
-                            "title": title,
-                            "content": content,
-                            "source": f"search:{term}",
-                            "word_count": len(content.split())
-                        })
-                        print(f"  ✓ {title[:45]:<45} ({len(content.split()):>4} mots)")
-                    
-                    time.sleep(0.2)
-                    
-            except Exception as e:
+                results = self.api_get(params)["query"]["search"]
+            except (ApiError, KeyError) as e:
                 print(f"  ⚠ Erreur recherche '{term}': {e}")
+                continue
+            
+            # Articles plus longs
+            self.scrape_titles([r["title"] for r in results], f"search:{term}",
+                               min_length=500, label_width=45)
         
         return len(self.articles)
     
     def save(self, filename="articles_raw.json"):
-        """Sauvegarde les articles"""
+        """Exporte tous les articles des shards (dernière révision de chaque
+        page) en un seul fichier JSON"""
+        articles = load_shards(self.output_dir)
         
         # Trier par nombre de mots (plus longs en premier)
-        self.articles.sort(key=lambda x: x["word_count"], reverse=True)
+        articles.sort(key=lambda x: x["word_count"], reverse=True)
         
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.articles, f, ensure_ascii=False, indent=2)
+            json.dump(articles, f, ensure_ascii=False, indent=2)
         
         return filename
     
@@ -225,15 +505,24 @@ class MalagasyScraper:
         print(f"\n{'='*50}")
         print(f"📊 STATISTIQUES")
         print(f"{'='*50}")
-        print(f"  Articles collectés : {len(self.articles)}")
+        print(f"  Articles collectés : {len(self.articles)} (nouveaux ou modifiés)")
+        print(f"  Pages suivies     : {len(self.state.pages)}")
         print(f"  Mots totaux       : {total_words:,}")
         print(f"  Moyenne par article: {avg_words}")
+        print(f"  Liens internes    : {sum(len(a.get('links', [])) for a in self.articles):,}")
+        print(f"  Catégories        : {len({c for a in self.articles for c in a.get('categories', [])})}")
         print(f"\n  Top 10 articles:")
-        for a in self.articles[:10]:
+        for a in sorted(self.articles, key=lambda x: x["word_count"], reverse=True)[:10]:
             print(f"    • {a['title'][:35]:<35} {a['word_count']:>5} mots")
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Scrape la Wikipédia malagasy en shards JSONL (output/)")
+    parser.add_argument("--export", nargs="?", const="articles_raw.json", metavar="FICHIER",
+                        help="exporte aussi tous les shards en un seul JSON (organize.py) ; "
+                             "build.py et cleaner.py lisent directement output/")
+    args = parser.parse_args()
+    
     print("="*50)
     print("🇲🇬 SCRAPER WIKIPEDIA MALAGASY v2")
     print("="*50 + "\n")
@@ -248,9 +537,11 @@ def main():
     # Stats
     scraper.stats()
     
-    # Sauvegarder
-    filename = scraper.save()
-    print(f"\n💾 Sauvegardé: {filename}")
+    # Les articles sont déjà écrits (shards JSONL) au fil du scraping ;
+    # l'export JSON unique relit et réécrit tout : seulement sur demande
+    print(f"\n💾 Shards: {scraper.output_dir}/articles-*.jsonl")
+    if args.export:
+        print(f"💾 Sauvegardé: {scraper.save(args.export)}")
     print(f"\n✅ Scraping terminé!")
 
 
@@ -1,4 +1,358 @@
-"""TenyMalagasy scraper placeholder"""
+# tenymalagasy_scraper.py
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse
 
-def scrape():
-    return []
+import requests
+
+try:
+    from scraper_v2 import RETRY_STATUS, TokenBucket
+except ImportError:  # importé depuis backend/ (scrapers.tenymalagasy_scraper)
+    from scrapers.scraper_v2 import RETRY_STATUS, TokenBucket
+
+# ============================================
+# DICTIONNAIRE TENYMALAGASY.ORG
+# ============================================
+#
+# Les listes alphabétiques donnent les liens vers les entrées ; chaque
+# entrée est analysée en {mot-vedette, catégories grammaticales,
+# définitions}. Les pages sont téléchargées par un pool borné de threads,
+# avec un débit limité par hôte, et gardées dans un cache HTTP sur disque :
+# un nouveau crawl revalide chaque page (If-None-Match / If-Modified-Since)
+# et une réponse 304 réutilise la copie locale sans retélécharger.
+#
+# Les entrées vont dans un store JSONL en ajout seul : une entrée n'est
+# réécrite que si son contenu a changé, et la dernière version d'un mot
+# gagne à la relecture (comme les shards de scraper_v2). build.py fusionne
+# le store dans lexiques/dictionnaire_mg.json. Le store et le cache restent
+# hors de output/ pour ne pas invalider les nœuds du corpus.
+
+BASE_URL = "https://tenymalagasy.org"
+INDEX_PATH = "/bins/alphaLists?lang=mg&letter={letter}"
+ENTRY_PATH = "/bins/teny2/"
+# Lettres de l'alphabet malagasy
+LETTERS = "abdefghijklmnoprstvyz"
+CACHE_DIR = os.path.join("tenymalagasy", "cache")
+STORE_FILE = os.path.join("tenymalagasy", "entries.jsonl")
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "wbr"}
+
+
+class FetchError(Exception):
+    """Page introuvable ou reprises épuisées"""
+
+
+# ============================================
+# ANALYSE HTML
+# ============================================
+
+class IndexParser(HTMLParser):
+    """Liens vers les entrées d'une liste alphabétique, et page suivante"""
+
+    def __init__(self, page_url):
+        super().__init__()
+        self.page_url = page_url
+        self.entries = []
+        self.next_page = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "a":
+            return
+        attrs = dict(attrs)
+        href = attrs.get("href")
+        if not href:
+            return
+        url = urljoin(self.page_url, href)
+        if "next" in (attrs.get("rel") or "").split():
+            self.next_page = url
+        elif urlparse(url).path.startswith(ENTRY_PATH):
+            self.entries.append(url)
+
+
+class EntryParser(HTMLParser):
+    """Une entrée : mot-vedette (<h1>), catégories (classe "pos") et
+    définitions (<li> sous un élément de classe "definitions", langue prise
+    sur l'attribut lang le plus proche)"""
+
+    def __init__(self):
+        super().__init__()
+        self.stack = []        # (balise, classes, lang)
+        self.headword = None
+        self.pos = []
+        self.definitions = []
+        self.text = None       # texte en cours : (type, lang, profondeur, morceaux)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+        lang = attrs.get("lang") or (self.stack[-1][2] if self.stack else None)
+        in_definitions = any("definitions" in c for _, c, _ in self.stack)
+        self.stack.append((tag, classes, lang))
+        if self.text is not None:
+            return
+        depth = len(self.stack)
+        if tag == "h1" and self.headword is None:
+            self.text = ("headword", lang, depth, [])
+        elif "pos" in classes:
+            self.text = ("pos", lang, depth, [])
+        elif tag == "li" and in_definitions:
+            self.text = ("definition", lang, depth, [])
+
+    def handle_endtag(self, tag):
+        # Balises mal fermées : on dépile jusqu'à la balise ouvrante
+        if not any(t == tag for t, _, _ in self.stack):
+            return
+        while self.stack.pop()[0] != tag:
+            pass
+        if self.text is None or len(self.stack) >= self.text[2]:
+            return
+        kind, lang, _, parts = self.text
+        text = " ".join("".join(parts).split())
+        self.text = None
+        if not text:
+            return
+        if kind == "headword":
+            self.headword = text
+        elif kind == "pos":
+            self.pos.append(text)
+        else:
+            self.definitions.append({"lang": lang, "text": text})
+
+    def handle_data(self, data):
+        if self.text is not None:
+            self.text[3].append(data)
+
+
+def parse_index(html, page_url):
+    parser = IndexParser(page_url)
+    parser.feed(html)
+    return list(dict.fromkeys(parser.entries)), parser.next_page
+
+
+def parse_entry(html, url):
+    parser = EntryParser()
+    parser.feed(html)
+    if not parser.headword:
+        return None
+    return {
+        "headword": parser.headword,
+        "pos": list(dict.fromkeys(parser.pos)),
+        "definitions": parser.definitions,
+        "url": url,
+    }
+
+
+# ============================================
+# CACHE HTTP SUR DISQUE
+# ============================================
+
+class HttpCache:
+    """Une page par fichier (clé SHA-1 de l'URL) : corps, ETag, Last-Modified"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path(self, url):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def get(self, url):
+        path = self.path(url)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def put(self, url, body, etag=None, last_modified=None):
+        path = self.path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"url": url, "etag": etag, "last_modified": last_modified, "body": body},
+                      f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+
+# ============================================
+# STORE DES ENTRÉES
+# ============================================
+
+def entry_hash(entry):
+    data = {k: entry[k] for k in ("headword", "pos", "definitions")}
+    return hashlib.sha1(json.dumps(data, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class DictionaryStore:
+    """Entrées en JSONL (ajout seul) ; la dernière version d'un mot gagne"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            self.entries = {e["headword"]: e for e in load_entries(path)}
+
+    def upsert(self, entry):
+        """Ajoute l'entrée si elle est nouvelle ou modifiée ; renvoie
+        new, updated ou unchanged"""
+        entry = dict(entry, hash=entry_hash(entry))
+        known = self.entries.get(entry["headword"])
+        if known is not None and known.get("hash") == entry["hash"]:
+            return "unchanged"
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.entries[entry["headword"]] = entry
+        return "new" if known is None else "updated"
+
+
+def load_entries(path):
+    """Entrées du store, dernière version de chaque mot"""
+    entries = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                entries[entry["headword"]] = entry
+    return list(entries.values())
+
+
+# ============================================
+# CRAWLER
+# ============================================
+
+class TenyMalagasyCrawler:
+
+    def __init__(self, base_url=BASE_URL, workers=4, rate=2, max_retries=4, backoff=0.5,
+                 timeout=10, cache_dir=CACHE_DIR, store_path=STORE_FILE):
+        self.base_url = base_url.rstrip("/")
+        self.workers = workers
+        self.rate = rate                  # requêtes/s par hôte
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = HttpCache(cache_dir)
+        self.store = DictionaryStore(store_path)
+        self.limiters = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()    # une session HTTP par thread
+        self.counts = {"downloaded": 0, "revalidated": 0}
+
+    @property
+    def session(self):
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+            self.local.session.headers.update({"User-Agent": "MalagasyNLPBot/1.0 (Educational project)"})
+        return self.local.session
+
+    def limiter(self, url):
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.limiters:
+                self.limiters[host] = TokenBucket(self.rate)
+            return self.limiters[host]
+
+    def fetch(self, url):
+        """Corps de la page, revalidé contre le cache (ETag / Last-Modified)"""
+        cached = self.cache.get(url)
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        for attempt in range(self.max_retries + 1):
+            self.limiter(url).acquire()
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                error = str(e)
+            else:
+                if response.status_code == 304 and cached:
+                    with self.lock:
+                        self.counts["revalidated"] += 1
+                    return cached["body"]
+                if response.status_code == 200:
+                    response.encoding = response.encoding or "utf-8"
+                    self.cache.put(url, response.text, response.headers.get("ETag"),
+                                   response.headers.get("Last-Modified"))
+                    with self.lock:
+                        self.counts["downloaded"] += 1
+                    return response.text
+                if response.status_code not in RETRY_STATUS:
+                    raise FetchError(f"HTTP {response.status_code} pour {url}")
+                error = f"HTTP {response.status_code}"
+            if attempt < self.max_retries:
+                time.sleep(self.backoff * 2 ** attempt)
+        raise FetchError(f"{error} pour {url} ({self.max_retries} reprises)")
+
+    def index_entries(self, letter):
+        """URLs des entrées d'une lettre (toutes les pages de la liste)"""
+        url = self.base_url + INDEX_PATH.format(letter=letter)
+        entries = []
+        while url:
+            found, url = parse_index(self.fetch(url), url)
+            entries.extend(found)
+        return list(dict.fromkeys(entries))
+
+    def _index_entries(self, letter):
+        try:
+            return self.index_entries(letter)
+        except FetchError as e:
+            print(f"  ⚠ {letter} : {e}")
+            return None
+
+    def _fetch_entry(self, url):
+        try:
+            return parse_entry(self.fetch(url), url)
+        except FetchError as e:
+            print(f"  ⚠ {e}")
+            return None
+
+    def crawl(self, letters=LETTERS, limit=None):
+        """Crawle les listes puis les entrées ; renvoie les compteurs"""
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            urls = []
+            stats = {"new": 0, "updated": 0, "unchanged": 0, "errors": 0}
+            # Une liste en échec ne compte que pour une erreur : les autres
+            # lettres sont crawlées quand même
+            for letter, found in zip(letters, pool.map(self._index_entries, letters)):
+                if found is None:
+                    stats["errors"] += 1
+                    continue
+                print(f"  📂 {letter} : {len(found)} entrées")
+                urls.extend(found)
+            urls = list(dict.fromkeys(urls))[:limit]
+
+            for entry in pool.map(self._fetch_entry, urls):
+                if entry is None:
+                    stats["errors"] += 1
+                    continue
+                stats[self.store.upsert(entry)] += 1
+        stats.update(self.counts)
+        return stats
+
+
+def scrape(letters=LETTERS, limit=None, **options):
+    """Crawle tenymalagasy.org et renvoie toutes les entrées du store"""
+    crawler = TenyMalagasyCrawler(**options)
+    crawler.crawl(letters, limit)
+    return list(crawler.store.entries.values())
+
+
+if __name__ == "__main__":
+    print("📖 Crawl de tenymalagasy.org...")
+    crawler = TenyMalagasyCrawler()
+    stats = crawler.crawl()
+    print(f"\n📊 {len(crawler.store.entries)} entrées dans {crawler.store.path}")
+    print(f"   nouvelles: {stats['new']} | modifiées: {stats['updated']} | inchangées: {stats['unchanged']}"
+          f" | erreurs: {stats['errors']}")
+    print(f"   téléchargées: {stats['downloaded']} | revalidées (304): {stats['revalidated']}")
+    print(f"\n✅ Crawl terminé!")
@@ -1,73 +1,47 @@
 # scraper.py
-import requests
 import json
-import time
 
-def scrape_wikipedia_malagasy(num_pages=50):
-    """Scrape Wikipedia Malagasy"""
+try:
+    from scraper_v2 import ApiError, MalagasyScraper
+except ImportError:  # importé depuis backend/ (scrapers.wikipedia_scraper)
+    from scrapers.scraper_v2 import ApiError, MalagasyScraper
+
+def scrape_wikipedia_malagasy(num_pages=50, output_dir="output"):
+    """Scrape Wikipedia Malagasy (pages aléatoires)
     
-    print("🔄 Scraping Wikipedia Malagasy...")
+    Incrémental : l'état du crawl (output_dir/crawl_state.json) est partagé
+    avec scraper_v2, seules les pages nouvelles ou modifiées sont
+    téléchargées et ajoutées aux shards JSONL.
+    """
     
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'MalagasyProject/1.0'
-    })
+    print("🔄 Scraping Wikipedia Malagasy...")
     
-    articles = []
-    api_url = "https://mg.wikipedia.org/w/api.php"
+    scraper = MalagasyScraper(output_dir=output_dir)
     
     # Étape 1: Récupérer liste de pages aléatoires
     params = {
         "action": "query",
-        "format": "json",
         "list": "random",
         "rnlimit": num_pages,
         "rnnamespace": 0
     }
     
     try:
-        resp = session.get(api_url, params=params, timeout=15, verify=False)
-        pages = resp.json()["query"]["random"]
+        pages = scraper.api_get(params)["query"]["random"]
         print(f"✓ {len(pages)} pages trouvées")
-    except Exception as e:
+    except (ApiError, KeyError) as e:
         print(f"❌ Erreur: {e}")
         return []
     
-    # Étape 2: Récupérer contenu de chaque page
-    for i, page in enumerate(pages):
-        try:
-            params = {
-                "action": "query",
-                "format": "json",
-                "pageids": page["id"],
-                "prop": "extracts",
-                "explaintext": True
-            }
-            
-            resp = session.get(api_url, params=params, timeout=10, verify=False)
-            data = resp.json()["query"]["pages"][str(page["id"])]
-            
-            content = data.get("extract", "")
-            
-            if content and len(content) > 50:
-                articles.append({
-                    "id": page["id"],
-                    "title": page["title"],
-                    "content": content
-                })
-                print(f"  [{i+1}/{len(pages)}] ✓ {page['title'][:50]}")
-            
-            time.sleep(0.2)
-            
-        except Exception as e:
-            print(f"  [{i+1}/{len(pages)}] ✗ Erreur: {page['title']}")
-            continue
+    # Étape 2: Récupérer contenu des pages nouvelles ou modifiées (par lots)
+    scraper.scrape_titles([page["title"] for page in pages], "random", min_length=50, label_width=50)
     
-    return articles
+    return scraper.articles
 
 
 def save_articles(articles, filename="articles_raw.json"):
-    """Sauvegarde les articles"""
+    """Sauvegarde les articles en un seul JSON (les shards JSONL de output/
+    sont déjà écrits au fil du scraping ; export optionnel)"""
     with open(filename, 'w', encoding='utf-8') as f:
         json.dump(articles, f, ensure_ascii=False, indent=2)
     print(f"\n💾 Sauvegardé: {filename} ({len(articles)} articles)")
@@ -78,7 +52,7 @@ if __name__ == "__main__":
     articles = scrape_wikipedia_malagasy(50)
     
     if articles:
-        save_articles(articles)
-        print(f"\n✅ Terminé! {len(articles)} articles récupérés")
+        print(f"\n💾 Shards: output/articles-*.jsonl")
+        print(f"\n✅ Terminé! {len(articles)} articles nouveaux ou modifiés")
     else:
-        print("\n❌ Aucun article récupéré")
\ No newline at end of file
+        print("\n❌ Aucun article nouveau")
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""Single-pass text analysis
+
+The editor used to call spell check, phonotactics, lemmatization, NER and
+sentiment one by one, each endpoint tokenizing the same text again.
+``AnalysisPipeline`` tokenizes the text once into (word, start, end) spans
+and hands those spans to every selected analyzer, so one request returns
+the merged results of all of them.
+
+The analyzers run one after the other: they are CPU-bound pure Python, so
+threads would only contend for the GIL, and a short edit is analysed in
+less time than a process pool takes to ship the spans to its workers.
+Long texts still get the process-pool document mode of the spell checker.
+"""
+from services import lemmatizer, ner_detector, phonotactic_validator, sentiment_analyzer, spell_checker
+from utils.text_processor import tokenize
+
+
+def _spelling(text, words, options):
+    limit = options.get("limit", 5)
+    if len(text) > options.get("document_threshold", float("inf")):
+        corrections = spell_checker.check_document(
+            text, limit=limit, workers=options.get("workers"),
+            chunk_chars=options.get("chunk_chars", 65536))
+    else:
+        corrections = spell_checker.check_spelling(text, limit=limit, words=words)
+    return {"corrections": corrections}
+
+
+def _phonotactics(text, words, options):
+    # Character-level automaton over the whole text: no tokens needed
+    return phonotactic_validator.validate_text(text)
+
+
+def _lemmas(text, words, options):
+    return lemmatizer.lemmatize(text, words=words)
+
+
+def _entities(text, words, options):
+    return ner_detector.detect(text, words=words)
+
+
+def _sentiment(text, words, options):
+    return sentiment_analyzer.analyze(text, words=words)
+
+
+# Response key -> analyzer(text, words, options)
+ANALYZERS = {
+    "spelling": _spelling,
+    "phonotactics": _phonotactics,
+    "lemmas": _lemmas,
+    "entities": _entities,
+    "sentiment": _sentiment,
+}
+
+
+class AnalysisPipeline:
+    def __init__(self, analyzers=None, **options):
+        names = list(ANALYZERS) if analyzers is None else list(dict.fromkeys(analyzers))
+        unknown = [n for n in names if n not in ANALYZERS]
+        if unknown:
+            raise ValueError(f"unknown analyzers: {', '.join(unknown)}")
+        self.analyzers = names
+        self.options = options
+
+    def run(self, text: str):
+        """Tokenize once, then merge every analyzer's result under its name."""
+        words = tokenize(text).words()
+        result = {"original": text, "tokens": len(words)}
+        for name in self.analyzers:
+            result[name] = ANALYZERS[name](text, words, self.options)
+        return result
+
+
+def analyze(text: str, analyzers=None, **options):
+    return AnalysisPipeline(analyzers, **options).run(text)
@@ -1,4 +1,162 @@
-"""Autocompleter service placeholder"""
+"""Autocompleter service
 
-def suggest(prefix: str, limit: int = 10):
-    return []
+Word completion runs on a prefix trie flattened into NumPy arrays: the
+children of node ``n`` are ``child_chars/child_nodes[child_start[n]:child_start[n + 1]]``
+(sorted by character) and ``topk[n]`` holds the ids of the most frequent
+words below ``n``, computed at build time. A keystroke therefore costs one
+small binary search per prefix character, whatever the vocabulary size.
+Saved tries use the ``utils.artifact`` format and are memory-mapped on load.
+"""
+import os
+
+import numpy as np
+
+from models.ngram_model import NGramModel
+from utils.artifact import StringTable, open_artifact, write_artifact
+from utils.dataset import get_dictionary, get_frequencies, model_path
+from utils.resources import resource
+
+TRIE_FILE = "autocomplete_trie.bin"
+TOP_K = 10
+
+
+class CompletionTrie:
+    def __init__(self, words, counts, child_start, child_chars, child_nodes, topk):
+        self.words = words
+        self.counts = counts
+        self.child_start = child_start
+        self.child_chars = child_chars
+        self.child_nodes = child_nodes
+        self.topk = topk
+
+    @classmethod
+    def build(cls, frequencies: dict, k: int = TOP_K):
+        words = sorted(frequencies, key=lambda w: (-frequencies[w], w))
+        counts = np.array([frequencies[w] for w in words], dtype=np.int64)
+
+        # Pointer trie first; word ids are frequency ranks, so "best" == "smallest id"
+        children = [{}]
+        best = [[]]
+        for wid, word in enumerate(words):
+            node = 0
+            if len(best[0]) < k:
+                best[0].append(wid)
+            for ch in word:
+                nxt = children[node].get(ch)
+                if nxt is None:
+                    nxt = len(children)
+                    children[node][ch] = nxt
+                    children.append({})
+                    best.append([])
+                node = nxt
+                if len(best[node]) < k:
+                    best[node].append(wid)
+
+        # Renumber nodes breadth-first and flatten to CSR arrays
+        order = [0]
+        new_id = {0: 0}
+        for node in order:
+            for ch in sorted(children[node]):
+                new_id[children[node][ch]] = len(order)
+                order.append(children[node][ch])
+        n = len(order)
+        child_start = np.zeros(n + 1, dtype=np.int32)
+        chars, nodes = [], []
+        topk = np.full((n, k), -1, dtype=np.int32)
+        for i, node in enumerate(order):
+            kids = sorted(children[node])
+            child_start[i + 1] = child_start[i] + len(kids)
+            chars.extend(ord(ch) for ch in kids)
+            nodes.extend(new_id[children[node][ch]] for ch in kids)
+            topk[i, :len(best[node])] = best[node]
+        return cls(
+            words,
+            counts,
+            child_start,
+            np.array(chars, dtype=np.uint32),
+            np.array(nodes, dtype=np.int32),
+            topk,
+        )
+
+    def find(self, prefix: str) -> int:
+        """Node id reached by prefix, or -1."""
+        node = 0
+        for ch in prefix:
+            lo, hi = self.child_start[node], self.child_start[node + 1]
+            code = ord(ch)
+            i = lo + int(np.searchsorted(self.child_chars[lo:hi], code))
+            if i >= hi or self.child_chars[i] != code:
+                return -1
+            node = int(self.child_nodes[i])
+        return node
+
+    def complete(self, prefix: str, limit: int = TOP_K):
+        node = self.find(prefix)
+        if node < 0:
+            return []
+        ids = self.topk[node, :limit]
+        return [(self.words[i], int(self.counts[i])) for i in ids[ids >= 0]]
+
+    def save(self, path: str):
+        arrays = {
+            "counts": self.counts,
+            "child_start": self.child_start,
+            "child_chars": self.child_chars,
+            "child_nodes": self.child_nodes,
+            "topk": self.topk,
+        }
+        words = self.words
+        if not isinstance(words, StringTable):
+            words = StringTable.from_strings(words)
+        write_artifact(path, arrays, strings={"words": words})
+
+    @classmethod
+    def load(cls, path: str):
+        artifact = open_artifact(path)
+        return cls(
+            artifact.strings("words"),
+            artifact["counts"],
+            artifact["child_start"],
+            artifact["child_chars"],
+            artifact["child_nodes"],
+            artifact["topk"],
+        )
+
+
+def build_trie(k: int = TOP_K) -> CompletionTrie:
+    """Build from the dictionary, ranked by corpus frequencies."""
+    frequencies = get_frequencies()
+    vocab = {word: frequencies.get(word, 1) for word in get_dictionary()}
+    return CompletionTrie.build(vocab, k)
+
+
+@resource("completion_trie")
+def get_trie() -> CompletionTrie:
+    """Load the saved trie artifact if present, else build it (once per process)."""
+    path = model_path(TRIE_FILE)
+    return CompletionTrie.load(path) if os.path.exists(path) else build_trie()
+
+
+@resource("ngram_model")
+def get_ngram_model() -> NGramModel:
+    """Open stats/ngrams.bin if present, else build the model from ngrams.json."""
+    return NGramModel.from_dataset()
+
+
+def suggest(prefix: str, limit: int = TOP_K):
+    prefix = prefix.strip().lower()
+    if not prefix:
+        return []
+    return [{"word": w, "count": c} for w, c in get_trie().complete(prefix, limit)]
+
+
+def predict_next(context: str, limit: int = 5):
+    """Most likely words to follow context, from the n-gram model."""
+    return [{"word": w, "score": round(s, 6)} for w, s in get_ngram_model().predict(context, limit)]
+
+
+if __name__ == "__main__":
+    path = model_path(TRIE_FILE)
+    trie = build_trie()
+    trie.save(path)
+    print(f"{len(trie.words)} words, {len(trie.child_start) - 1} nodes -> {path}")
@@ -0,0 +1,48 @@
+"""Chatbot service
+
+Answers with the passage of ``corpus/articles_clean.json`` that best
+matches the message under BM25 (see ``models.bm25_index``).
+"""
+import os
+
+from models.bm25_index import BM25Index
+from utils.dataset import load_json, model_path
+from utils.resources import resource
+
+INDEX_FILE = "bm25_index.bin"
+
+
+def build_index() -> BM25Index:
+    return BM25Index.build(load_json("corpus", "articles_clean.json"))
+
+
+@resource("bm25_index")
+def get_index() -> BM25Index:
+    """Map data/models/bm25_index.bin if present, else build (once per process)."""
+    path = model_path(INDEX_FILE)
+    return BM25Index.load(path) if os.path.exists(path) else build_index()
+
+
+def search(query: str, limit: int = 5):
+    index = get_index()
+    return [
+        {
+            "title": index.titles[int(index.doc_article[doc])],
+            "passage": index.passages[doc],
+            "score": round(score, 4),
+        }
+        for doc, score in index.search(query, limit)
+    ]
+
+
+def answer(message: str, limit: int = 3):
+    """Best passage as the reply, with the top passages as sources."""
+    sources = search(message, limit)
+    return {"reply": sources[0]["passage"] if sources else "", "sources": sources}
+
+
+if __name__ == "__main__":
+    path = model_path(INDEX_FILE)
+    index = build_index()
+    index.save(path)
+    print(f"{len(index)} passages, {len(index.terms)} terms, {index.postings.nbytes} postings bytes -> {path}")
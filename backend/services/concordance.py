@@ -0,0 +1,39 @@
+"""Concordance service
+
+Keyword-in-context search over ``corpus/sentences.txt`` with a suffix
+array (see ``models.suffix_index``).
+"""
+import os
+
+from models.suffix_index import SuffixIndex
+from utils.dataset import dataset_path, model_path
+from utils.resources import resource
+
+INDEX_FILE = "suffix_index.bin"
+MAX_PAGE = 200
+
+
+def build_index() -> SuffixIndex:
+    with open(dataset_path("corpus", "sentences.txt"), "r", encoding="utf-8") as f:
+        return SuffixIndex.build(f.read())
+
+
+@resource("concordance_index")
+def get_index() -> SuffixIndex:
+    """Map data/models/suffix_index.bin if present, else build (once per process)."""
+    path = model_path(INDEX_FILE)
+    return SuffixIndex.load(path) if os.path.exists(path) else build_index()
+
+
+def concordance(query: str, offset: int = 0, limit: int = 20, width: int = 40):
+    offset = max(0, offset)
+    limit = max(0, min(limit, MAX_PAGE))
+    total, lines = get_index().concordance(query, offset, limit, max(0, width))
+    return {"query": query, "total": total, "offset": offset, "lines": lines}
+
+
+if __name__ == "__main__":
+    path = model_path(INDEX_FILE)
+    index = build_index()
+    index.save(path)
+    print(f"{len(index)} suffixes -> {path}")
@@ -1,4 +1,95 @@
-"""Knowledge graph / semantic suggestions placeholder"""
+"""Knowledge graph / semantic suggestions
 
-def suggest(text: str):
-    return []
+Semantic suggestions are the approximate nearest neighbours of the mean
+vector of the known words of a text, from word embeddings trained on
+``corpus/sentences.txt`` (see ``models.embedding_model``).
+
+Related articles come from the link graph of the scraped articles (see
+``models.link_graph``): personalized PageRank seeded with the article
+titles mentioned in the text.
+"""
+import os
+
+import numpy as np
+
+from models.embedding_model import EmbeddingModel
+from models.link_graph import LinkGraph
+from utils.dataset import load_json, load_lines, model_path
+from utils.resources import resource
+from utils.text_processor import iter_words
+
+EMBEDDINGS_FILE = "embeddings.bin"
+GRAPH_FILE = "link_graph.bin"
+
+
+def build_embeddings() -> EmbeddingModel:
+    sentences = ([w.lower() for w, _, _ in iter_words(line)] for line in load_lines("corpus", "sentences.txt"))
+    return EmbeddingModel.from_sentences(sentences)
+
+
+@resource("embeddings")
+def get_embeddings() -> EmbeddingModel:
+    """Map data/models/embeddings.bin if present, else train (once per process)."""
+    path = model_path(EMBEDDINGS_FILE)
+    return EmbeddingModel.load(path) if os.path.exists(path) else build_embeddings()
+
+
+def suggest(text: str, limit: int = 10):
+    model = get_embeddings()
+    ids = []
+    for word, _, _ in iter_words(text):
+        i = model.word_id(word.lower())
+        if i >= 0 and i not in ids:
+            ids.append(i)
+    if not ids:
+        return []
+    query = model.vectors[ids].astype(np.float32).mean(axis=0)
+    return [{"word": w, "score": round(s, 4)} for w, s in model.nearest(query, limit, exclude=ids)]
+
+
+def build_graph() -> LinkGraph:
+    return LinkGraph.from_articles(load_json("corpus", "articles_raw.json"))
+
+
+@resource("link_graph")
+def get_graph() -> LinkGraph:
+    """Map data/models/link_graph.bin if present, else build (once per process)."""
+    path = model_path(GRAPH_FILE)
+    return LinkGraph.load(path) if os.path.exists(path) else build_graph()
+
+
+def related(text: str, limit: int = 10):
+    """Articles closest (personalized PageRank) to those mentioned in text."""
+    graph = get_graph()
+    seeds = graph.nodes_in_text(text)
+    if not seeds:
+        return []
+    return [{"title": graph.titles[n], "score": round(s, 6)} for n, s in graph.related(seeds, limit)]
+
+
+def neighbors(title: str, limit: int = 50):
+    graph = get_graph()
+    node = graph.node(title)
+    if node < 0:
+        return []
+    return [graph.titles[int(n)] for n in graph.neighbors(node)[:limit]]
+
+
+def two_hop(title: str, limit: int = 10):
+    graph = get_graph()
+    node = graph.node(title)
+    if node < 0:
+        return []
+    ids, paths = graph.two_hop(node, limit)
+    return [{"title": graph.titles[int(n)], "paths": int(p)} for n, p in zip(ids, paths)]
+
+
+if __name__ == "__main__":
+    path = model_path(EMBEDDINGS_FILE)
+    model = build_embeddings()
+    model.save(path)
+    print(f"{len(model.words)} vectors of {model.vectors.shape[1]} dims -> {path}")
+    path = model_path(GRAPH_FILE)
+    graph = build_graph()
+    graph.save(path)
+    print(f"{len(graph)} nodes, {graph.n_edges} links -> {path}")
@@ -1,4 +1,246 @@
-"""Lemmatizer service placeholder"""
+"""Lemmatizer service
 
-def lemmatize(text: str):
-    return []
+The prefixes, suffixes and rules of ``lemmatizer_rules.json`` are compiled
+into two character tries (prefixes, reversed suffixes), so every affix that
+matches a word is found in a single walk from each end. Stripping an affix
+yields candidate roots, completed by morphophonemic restoration: a nasal
+prefix swallows the root's first consonant (man + tosika -> manosika,
+mam + vaky -> mamaky, man + lela -> mandela) and passive suffixes drop the
+root's final syllable (soratra + ana -> soratana) or add a linking
+consonant (tia + ana -> tiavana). The most frequent
+candidate found in the dictionary wins. A word that is itself in the
+dictionary is kept unless a cheap analysis explains it, so plain words that
+merely look derived (anarana, ankizy, tanana) stay as they are.
+
+Dictionary words are analysed once at build time into a full-form -> lemma
+table; other words go through a bounded LRU cache.
+"""
+import os
+from functools import lru_cache
+
+from utils.artifact import StringTable, open_artifact, write_artifact
+from utils.dataset import get_dictionary, get_frequencies, load_json, model_path
+from utils.resources import resource
+from utils.text_processor import iter_words
+
+TABLE_FILE = "lemma_table.bin"
+CACHE_SIZE = 50000
+MIN_ROOT = 3
+
+VOWELS = set("aeiouyàâéèêëìîïòôù")
+
+# Initial consonants a nasal prefix absorbs, keyed by the prefix's last
+# letter then by what is left at the start of the stem ("" = a vowel).
+NASAL_RESTORATIONS = {
+    "n": {"": ("t", "s", "ts"), "g": ("h", "k"), "dr": ("r",), "d": ("l",), "j": ("z",)},
+    "m": {"": ("v", "f", "p"), "b": ("v",)},
+}
+
+# Root endings dropped in front of a passive/nominal suffix
+SUFFIX_RESTORATIONS = ("a", "y", "ra", "ka", "tra")
+# Weak root endings (soratra, vaka, anarana) listed among the suffixes: they
+# belong to the root and are restored, never stripped
+WEAK_ENDINGS = {"tra", "ka", "na"}
+# Linking consonants inserted between a vowel-final root and the suffix
+# (tia -> fitiavana, atao -> ataovina)
+EPENTHETIC = "vz"
+# Steps beyond a single affix (see Lemmatizer._stems) an analysis of an
+# attested word may take, provided its root is at least as frequent
+MAX_COST = 2
+
+
+class AffixTrie:
+    """Character trie returning every key that is a prefix of a string."""
+
+    def __init__(self, keys, reverse: bool = False):
+        self.root = {}
+        self.reverse = reverse
+        for key, value in keys:
+            node = self.root
+            for ch in (reversed(key) if reverse else key):
+                node = node.setdefault(ch, {})
+            node[None] = (key, value)
+
+    def matches(self, word: str):
+        node = self.root
+        for ch in (reversed(word) if self.reverse else word):
+            node = node.get(ch)
+            if node is None:
+                return
+            if None in node:
+                yield node[None]
+
+
+class Lemmatizer:
+    def __init__(self, rules: dict, dictionary, frequencies):
+        types = {}
+        for rule in rules.get("rules", []):
+            types.setdefault(rule["remove"], rule["type"])
+        prefixes = set(rules.get("prefixes", [])) | {r["remove"] for r in rules.get("rules", []) if r["pattern"].startswith("^")}
+        suffixes = set(rules.get("suffixes", [])) | {r["remove"] for r in rules.get("rules", []) if r["pattern"].endswith("$")}
+        suffixes -= WEAK_ENDINGS
+        self.prefixes = AffixTrie((p, types.get(p, "prefixe")) for p in prefixes)
+        self.suffixes = AffixTrie(((s, types.get(s, "suffixe")) for s in suffixes), reverse=True)
+        # word -> frequency of every dictionary word, for candidate checks
+        self.known = {w: frequencies.get(w, 1) for w in dictionary}
+        self.table = {}
+        self.lemma = lru_cache(maxsize=CACHE_SIZE)(self._lemma)
+
+    def _stems(self, word: str):
+        """Yield (root, prefix, suffix, type, cost) for every affix analysis.
+
+        ``cost`` counts the steps beyond stripping a single affix: a second
+        affix (except the fi-/fan- ... -ana circumfix), a restored final
+        syllable or linking consonant, and a nasal restoration after a
+        vowel-initial prefix (an + tsara). The nasal mutation after m-/f-
+        (mamaky, fanoratana) is the regular case and free.
+        """
+        prefixes = [("", None)] + list(self.prefixes.matches(word))
+        for prefix, ptype in prefixes:
+            rest = word[len(prefix):]
+            if len(rest) < MIN_ROOT:
+                continue
+            stems = [(rest, 0)]
+            table = NASAL_RESTORATIONS.get(prefix[-1:]) if prefix else None
+            if table:
+                nasal_cost = 1 if prefix[0] in VOWELS else 0
+                for onset, initials in table.items():
+                    if onset and rest.startswith(onset) and rest[len(onset):len(onset) + 1] in VOWELS:
+                        stems.extend((i + rest[len(onset):], nasal_cost) for i in initials)
+                    elif not onset and rest[0] in VOWELS:
+                        stems.extend((i + rest, nasal_cost) for i in initials)
+            for stem, cost in stems:
+                yield stem, prefix, "", ptype, cost
+                for suffix, stype in self.suffixes.matches(stem):
+                    base = stem[:-len(suffix)]
+                    if len(base) < MIN_ROOT:
+                        continue
+                    # fi-/fan- ... -ana nominalizations are one circumfix
+                    stacked = cost + 1 if prefix and prefix[0] != "f" else cost
+                    roots = [(base, stacked)] + [(base + e, stacked + 1) for e in SUFFIX_RESTORATIONS]
+                    if base[-1] in EPENTHETIC:
+                        roots.append((base[:-1], stacked + 1))
+                    for root, root_cost in roots:
+                        yield root, prefix, suffix, ptype or stype, root_cost
+
+    @staticmethod
+    def _plausible(prefix: str, suffix: str, root: str) -> bool:
+        """Rule out analyses that mostly fit plain words (anarana, ankizy,
+        tanana) when the word is itself in the dictionary."""
+        if prefix[:1] in VOWELS:
+            # a-, an-, ank-, amp-, if- open many plain words (andro, ankizy)
+            return False
+        # y-final roots keep it as -i- before -ana (vaky -> vakiana)
+        return not (suffix == "ana" and root.endswith("y"))
+
+    def _lemma(self, word: str):
+        """(lemma, prefix, suffix, type) of a lower-cased word."""
+        attested = word in self.known
+        best, best_count, best_cost = None, 0, 0
+        fallback = None
+        for root, prefix, suffix, rtype, cost in self._stems(word):
+            if not prefix and not suffix:
+                continue
+            count = self.known.get(root, 0)
+            if count > best_count and (not attested or self._plausible(prefix, suffix, root)):
+                best, best_count, best_cost = (root, prefix, suffix, rtype), count, cost
+            elif fallback is None and prefix and not suffix and root != word[len(prefix):]:
+                # first nasal restoration, used when no root is attested
+                fallback = (root, prefix, suffix, rtype)
+        if best is not None and attested and best_cost:
+            # A costlier analysis of a dictionary word needs a root at
+            # least as frequent as the word itself
+            if best_cost > MAX_COST or best_count < self.known[word]:
+                best = None
+        if best is not None:
+            return best
+        if fallback is not None and not attested:
+            return fallback
+        return word, "", "", None
+
+    def lookup(self, word: str):
+        word = word.lower()
+        hit = self.table.get(word)
+        if hit is not None:
+            return hit
+        return self.lemma(word)
+
+    def build_table(self):
+        """Analyse every dictionary word once (full form -> lemma)."""
+        self.table = {word: self._lemma(word) for word in self.known}
+        return self.table
+
+    def save_table(self, path: str):
+        forms = sorted(self.table, key=lambda w: w.encode("utf-8"))
+        columns = list(zip(*(self.table[f] for f in forms)))
+        write_artifact(path, {}, strings={
+            "forms": StringTable.from_strings(forms, sort=True),
+            "lemmas": StringTable.from_strings(columns[0]),
+            "prefixes": StringTable.from_strings(columns[1]),
+            "suffixes": StringTable.from_strings(columns[2]),
+            "types": StringTable.from_strings(t or "" for t in columns[3]),
+        })
+
+    def load_table(self, path: str):
+        self.table = LemmaTable(open_artifact(path))
+        return self.table
+
+
+class LemmaTable:
+    """Memory-mapped full-form -> (lemma, prefix, suffix, type) table."""
+
+    def __init__(self, artifact):
+        self.forms = artifact.strings("forms")
+        self.columns = [artifact.strings(n) for n in ("lemmas", "prefixes", "suffixes", "types")]
+
+    def get(self, word: str, default=None):
+        i = self.forms.find(word)
+        if i < 0:
+            return default
+        lemma, prefix, suffix, rtype = (c[i] for c in self.columns)
+        return lemma, prefix, suffix, rtype or None
+
+    def __len__(self):
+        return len(self.forms)
+
+
+def build_lemmatizer() -> Lemmatizer:
+    return Lemmatizer(load_json("lexiques", "lemmatizer_rules.json"), get_dictionary(), get_frequencies())
+
+
+@resource("lemmatizer")
+def get_lemmatizer() -> Lemmatizer:
+    """Rules compiled once per process; the full-form table is mapped from
+    data/models/lemma_table.bin when present, else computed."""
+    lemmatizer = build_lemmatizer()
+    path = model_path(TABLE_FILE)
+    if os.path.exists(path):
+        lemmatizer.load_table(path)
+    else:
+        lemmatizer.build_table()
+    return lemmatizer
+
+
+def lemmatize(text: str, words=None):
+    lemmatizer = get_lemmatizer()
+    result = []
+    for word, start, end in iter_words(text) if words is None else words:
+        lemma, prefix, suffix, rtype = lemmatizer.lookup(word)
+        result.append({
+            "word": word,
+            "lemma": lemma,
+            "start": start,
+            "end": end,
+            "prefix": prefix,
+            "suffix": suffix,
+            "type": rtype,
+        })
+    return result
+
+
+if __name__ == "__main__":
+    path = model_path(TABLE_FILE)
+    lem = build_lemmatizer()
+    lem.build_table()
+    lem.save_table(path)
+    print(f"{len(lem.table)} forms -> {path}")
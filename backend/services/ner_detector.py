@@ -1,4 +1,120 @@
-"""NER detector placeholder"""
+"""NER detector
 
-def detect(text: str):
-    return []
+Gazetteer names are split into normalized tokens (lower-cased, apostrophes
+and hyphens acting as separators, so "Amoron'i Mania", "amoron’i mania" and
+"Alaotra-Mangoro"/"Alaotra Mangoro" all match) and stored in a token trie
+flattened into one ``{(node, token): child}`` dict. Detection is a greedy
+longest-match walk over the token stream: the cost per token depends on
+the longest name, not on how many names the gazetteer holds.
+
+Titles (Andriamatoa, Ramatoa...) and organisation keywords (Fikambanana,
+Banky...) only mark an entity when followed by capitalized words, which
+become part of the PERSON / ORG span.
+"""
+from utils.dataset import load_gazetteer
+from utils.resources import resource
+from utils.text_processor import iter_words
+
+CATEGORY_LABELS = {
+    "cities": "CITY",
+    "regions": "REGION",
+    "titles": "PERSON",
+    "org_keywords": "ORG",
+}
+# Labels whose gazetteer entry is only a trigger for the following names
+TRIGGER_LABELS = {"PERSON", "ORG"}
+# Characters allowed between two tokens of the same entity
+JOINERS = frozenset(" \t'’‘`ʼ-")
+# Lower-case genitive links kept inside a name (Foiben'i Madagasikara)
+CONNECTORS = {"i"}
+
+
+def normalize_token(token: str) -> str:
+    return token.casefold()
+
+
+class GazetteerMatcher:
+    def __init__(self, gazetteer: dict):
+        self.edges = {}
+        self.labels = {}
+        self.size = 1
+        for category, names in gazetteer.items():
+            label = CATEGORY_LABELS.get(category, category.upper())
+            for name in names:
+                self.add(name, label)
+
+    def add(self, name: str, label: str):
+        node = 0
+        for token, _, _ in iter_words(name):
+            key = (node, normalize_token(token))
+            child = self.edges.get(key)
+            if child is None:
+                child = self.edges[key] = self.size
+                self.size += 1
+            node = child
+        if node:
+            self.labels.setdefault(node, label)
+
+    def match(self, tokens, joined=None):
+        """Greedy longest matches over normalized tokens: (first, last + 1, label).
+
+        ``joined[k]`` tells whether token k may continue an entity started
+        before it (no punctuation in between); all tokens may by default.
+        """
+        edges, labels = self.edges, self.labels
+        n = len(tokens)
+        i = 0
+        while i < n:
+            node, best = 0, None
+            j = i
+            while j < n and (j == i or joined is None or joined[j]):
+                node = edges.get((node, tokens[j]))
+                if node is None:
+                    break
+                j += 1
+                label = labels.get(node)
+                if label is not None:
+                    best = (j, label)
+            if best is None:
+                i += 1
+            else:
+                yield i, best[0], best[1]
+                i = best[0]
+
+
+@resource("gazetteer_matcher")
+def get_matcher() -> GazetteerMatcher:
+    return GazetteerMatcher(load_gazetteer())
+
+
+def detect(text: str, words=None):
+    """Entities of text; ``words`` are its (word, start, end) spans if known."""
+    words = list(iter_words(text)) if words is None else words
+    tokens = [normalize_token(w) for w, _, _ in words]
+    joined = [False] + [
+        all(c in JOINERS for c in text[words[k - 1][2]:words[k][1]]) for k in range(1, len(words))
+    ]
+    entities = []
+    last = 0
+    for i, j, label in get_matcher().match(tokens, joined):
+        if i < last:
+            continue
+        if label in TRIGGER_LABELS:
+            if not words[i][0][0].isupper():
+                continue
+            end = j
+            while end < len(words) and joined[end]:
+                if words[end][0][0].isupper():
+                    end += 1
+                elif (tokens[end] in CONNECTORS and end + 1 < len(words) and joined[end + 1]
+                        and words[end + 1][0][0].isupper()):
+                    end += 2
+                else:
+                    break
+            if end == j:
+                continue
+            j = end
+        start, stop = words[i][1], words[j - 1][2]
+        entities.append({"text": text[start:stop], "label": label, "start": start, "end": stop})
+        last = j
+    return entities
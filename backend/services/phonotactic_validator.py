@@ -1,4 +1,149 @@
-"""Phonotactic validator placeholder"""
+"""Phonotactic validator
+
+``phonotactics.json`` is compiled into one Aho-Corasick automaton holding
+both rule kinds: invalid letter combinations, and invalid endings encoded
+as the ending followed by a word-boundary symbol. The automaton is a full
+DFA (failure links folded into the transition table), so a whole document
+is validated in a single linear pass with one table lookup per character.
+It is rebuilt only when the rules file changes.
+"""
+import json
+import os
+
+import numpy as np
+
+from utils.dataset import dataset_path
+from utils.resources import resource
+
+RULES_PATH = ("rules", "phonotactics.json")
+BOUNDARY = "\0"
+# Code points classified through the lookup table; others count as a boundary
+TABLE_SIZE = 0x10000
+
+
+class PatternAutomaton:
+    """Aho-Corasick DFA over letter classes; symbol 0 is "any other letter"."""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        symbols = sorted({ch for p, _ in self.patterns for ch in p} - {BOUNDARY})
+        self.symbol = {ch: i + 1 for i, ch in enumerate(symbols)}
+        self.boundary = len(symbols) + 1
+        self.symbol[BOUNDARY] = self.boundary
+        self._build_classes()
+        self._build_dfa()
+
+    def _build_classes(self):
+        table = np.zeros(TABLE_SIZE + 1, dtype=np.int32)
+        for code in range(TABLE_SIZE):
+            ch = chr(code)
+            if not ch.isalpha():
+                table[code] = self.boundary
+                continue
+            lower = ch.lower()
+            table[code] = self.symbol.get(lower, 0) if len(lower) == 1 else 0
+        table[TABLE_SIZE] = self.boundary
+        self.classes = table
+
+    def _build_dfa(self):
+        n_symbols = self.boundary + 1
+        goto = [{}]
+        out = [[]]
+        for pid, (pattern, _) in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                sym = self.symbol[ch]
+                nxt = goto[state].get(sym)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][sym] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(pid)
+
+        delta = [[0] * n_symbols for _ in goto]
+        fail = [0] * len(goto)
+        queue = []
+        for sym in range(n_symbols):
+            nxt = goto[0].get(sym, 0)
+            delta[0][sym] = nxt
+            if nxt:
+                queue.append(nxt)
+        for state in queue:
+            out[state] = out[state] + out[fail[state]]
+            for sym in range(n_symbols):
+                nxt = goto[state].get(sym)
+                if nxt is None:
+                    delta[state][sym] = delta[fail[state]][sym]
+                else:
+                    fail[nxt] = delta[fail[state]][sym]
+                    delta[state][sym] = nxt
+                    queue.append(nxt)
+        self.delta = delta
+        self.out = [tuple(o) for o in out]
+
+    def classify(self, text: str) -> np.ndarray:
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        return self.classes[np.minimum(codes, TABLE_SIZE)]
+
+    def scan(self, classes):
+        """Yield (pattern id, index of the last character) for every match."""
+        delta, out = self.delta, self.out
+        state = 0
+        for i, sym in enumerate(classes):
+            state = delta[state][sym]
+            if out[state]:
+                for pid in out[state]:
+                    yield pid, i
+
+
+def build_automaton(rules: dict) -> PatternAutomaton:
+    patterns = [(p.lower(), "invalid_combination") for p in rules.get("invalid_combinations", [])]
+    patterns += [(e.lower() + BOUNDARY, "invalid_ending") for e in rules.get("invalid_endings", [])]
+    return PatternAutomaton(patterns)
+
+
+def _rules_stamp():
+    st = os.stat(dataset_path(*RULES_PATH))
+    return st.st_mtime_ns, st.st_size
+
+
+@resource("phonotactic_automaton", stamp=_rules_stamp)
+def get_automaton() -> PatternAutomaton:
+    """Automaton for the current rules file, rebuilt when its mtime/size change."""
+    with open(dataset_path(*RULES_PATH), "r", encoding="utf-8") as f:
+        return build_automaton(json.load(f))
+
+
+def validate_text(text: str):
+    """Every rule violation in text, with offsets, in one pass."""
+    automaton = get_automaton()
+    classes = automaton.classify(text)
+    boundary = automaton.boundary
+    symbols = classes.tolist() + [boundary]
+    issues = []
+    for pid, end in automaton.scan(symbols):
+        pattern, rule = automaton.patterns[pid]
+        if rule == "invalid_ending":
+            start, end = end - len(pattern) + 1, end
+        else:
+            start, end = end - len(pattern) + 1, end + 1
+        word_start = start
+        while word_start > 0 and symbols[word_start - 1] != boundary:
+            word_start -= 1
+        word_end = end
+        while symbols[word_end] != boundary:
+            word_end += 1
+        issues.append({
+            "rule": rule,
+            "pattern": pattern.rstrip(BOUNDARY),
+            "start": start,
+            "end": end,
+            "word": text[word_start:word_end],
+        })
+    return {"valid": not issues, "issues": issues}
+
 
 def validate(word: str):
-    return {"valid": True, "issues": []}
+    return validate_text(word)
@@ -1,4 +1,22 @@
-"""Sentiment analyzer placeholder"""
+"""Sentiment analyzer
 
-def analyze(text: str):
-    return {"polarity": 0.0, "score": 0.0}
+Scores texts with ``SentimentModel`` built once from ``sentiment.json``
+(positive/negative words, negators, intensifiers). ``analyze_batch``
+scores many texts in one vectorized pass.
+"""
+from models.sentiment_model import SentimentModel
+from utils.dataset import load_json
+from utils.resources import resource
+
+@resource("sentiment_model")
+def get_model() -> SentimentModel:
+    return SentimentModel(load_json("lexiques", "sentiment.json"))
+
+
+def analyze(text: str, words=None):
+    """Scores of text; ``words`` are its (word, start, end) spans if known."""
+    return get_model().predict(text, words)
+
+
+def analyze_batch(texts):
+    return get_model().predict_batch(list(texts))
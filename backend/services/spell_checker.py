@@ -1,5 +1,245 @@
-"""Spell checker service placeholder"""
+"""Spell checker service
 
-def check_spelling(text: str):
-    # TODO: implement spell checking logic
-    return []
+Suggestions come from a symmetric-deletion (SymSpell) index: every dictionary
+word is stored under all strings obtained by deleting up to ``max_distance``
+characters from its first ``prefix_length`` letters. At query time the same
+deletions of the input are looked up, so candidates at edit distance 1 or 2
+are found with hash lookups instead of scanning the whole dictionary.
+
+Large documents go through ``check_document``: the text is cut into
+paragraph-aligned chunks scanned in a process pool, then each distinct
+unknown word is looked up once and the results are mapped back to global
+character offsets.
+"""
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.dataset import get_dictionary, get_frequencies, model_path
+from utils.levenshtein import bounded_distance
+from utils.resources import resource
+from utils.text_processor import iter_words
+
+INDEX_FILE = "symspell.pkl"
+INDEX_VERSION = 1
+
+
+class SymSpellIndex:
+    def __init__(self, max_distance: int = 2, prefix_length: int = 7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.words = {}
+        self.deletes = {}
+
+    def _deletes(self, word: str) -> set:
+        out = {word}
+        level = [word]
+        for _ in range(self.max_distance):
+            next_level = []
+            for w in level:
+                if len(w) <= 1:
+                    continue
+                for i in range(len(w)):
+                    d = w[:i] + w[i + 1:]
+                    if d not in out:
+                        out.add(d)
+                        next_level.append(d)
+            level = next_level
+        return out
+
+    def add_word(self, word: str, count: int = 1):
+        if word in self.words:
+            self.words[word] += count
+            return
+        self.words[word] = count
+        key = word[:self.prefix_length]
+        for d in self._deletes(key):
+            self.deletes.setdefault(d, []).append(word)
+
+    def lookup(self, term: str, max_distance: int = None, limit: int = 5):
+        """Return up to ``limit`` (word, distance, count) ranked by distance then frequency."""
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+        if term in self.words:
+            return [(term, 0, self.words[term])]
+
+        term_len = len(term)
+        prefix = term[:self.prefix_length]
+        queue = [prefix]
+        seen_deletes = {prefix}
+        seen_words = set()
+        results = []
+        i = 0
+        while i < len(queue):
+            candidate = queue[i]
+            i += 1
+            if len(prefix) - len(candidate) > max_distance:
+                break
+            for word in self.deletes.get(candidate, ()):
+                if word in seen_words:
+                    continue
+                seen_words.add(word)
+                if abs(len(word) - term_len) > max_distance:
+                    continue
+                d = bounded_distance(term, word, max_distance)
+                if d <= max_distance:
+                    results.append((word, d, self.words[word]))
+            if len(prefix) - len(candidate) < max_distance and len(candidate) > 1:
+                for j in range(len(candidate)):
+                    d = candidate[:j] + candidate[j + 1:]
+                    if d not in seen_deletes:
+                        seen_deletes.add(d)
+                        queue.append(d)
+
+        results.sort(key=lambda r: (r[1], -r[2], r[0]))
+        return results[:limit]
+
+    def __contains__(self, word: str):
+        return word in self.words
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as f:
+            pickle.dump((INDEX_VERSION, self.__dict__), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str):
+        with open(path, "rb") as f:
+            version, state = pickle.load(f)
+        if version != INDEX_VERSION:
+            raise ValueError(f"unsupported spell index version {version}")
+        index = cls.__new__(cls)
+        index.__dict__.update(state)
+        return index
+
+
+def build_index(max_distance: int = 2, prefix_length: int = 7) -> SymSpellIndex:
+    """Build the index from the dictionary, weighted by corpus frequencies."""
+    frequencies = get_frequencies()
+    index = SymSpellIndex(max_distance, prefix_length)
+    for word in get_dictionary():
+        index.add_word(word, frequencies.get(word, 1))
+    return index
+
+
+@resource("spell_index")
+def get_index() -> SymSpellIndex:
+    """Load the saved index artifact if present, else build it (once per process)."""
+    path = model_path(INDEX_FILE)
+    return SymSpellIndex.load(path) if os.path.exists(path) else build_index()
+
+
+def _correction(word, start, end, suggestions):
+    return {"word": word, "start": start, "end": end, "suggestions": suggestions}
+
+
+def _suggest(index, key, limit):
+    return [{"word": w, "distance": d, "count": c} for w, d, c in index.lookup(key, limit=limit)]
+
+
+def check_spelling(text: str, limit: int = 5, words=None):
+    """Return one entry per unknown word with its offsets and ranked suggestions.
+
+    ``words`` are the (word, start, end) spans of text when already tokenized.
+    """
+    index = get_index()
+    corrections = []
+    cache = {}
+    for word, start, end in iter_words(text) if words is None else words:
+        key = word.lower()
+        if len(key) < 2 or key in index:
+            continue
+        if key not in cache:
+            cache[key] = _suggest(index, key, limit)
+        corrections.append(_correction(word, start, end, cache[key]))
+    return corrections
+
+
+# ============================================
+# DOCUMENT MODE (process pool)
+# ============================================
+
+# worker count -> process pool
+_pools = {}
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int):
+    """The process pool of ``workers`` processes, created once per process
+    and per size: requests share it, so it is never shut down or replaced."""
+    pool = _pools.get(workers)
+    if pool is None:
+        with _pool_lock:
+            pool = _pools.get(workers)
+            if pool is None:
+                # Build the index first so forked workers inherit it instead of rebuilding
+                get_index()
+                pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers, initializer=get_index)
+    return pool
+
+
+def split_chunks(text: str, chunk_chars: int = 65536):
+    """Yield (offset, chunk) pieces of text cut at line breaks, about chunk_chars long."""
+    pos, n = 0, len(text)
+    while pos < n:
+        end = pos + chunk_chars
+        if end >= n:
+            end = n
+        else:
+            cut = text.rfind("\n", pos, end)
+            if cut == -1:
+                cut = text.find("\n", end)
+            end = n if cut == -1 else cut + 1
+        yield pos, text[pos:end]
+        pos = end
+
+
+def _scan_chunk(args):
+    """Worker: unknown-word occurrences of one chunk, with global offsets."""
+    offset, chunk = args
+    index = get_index()
+    found = []
+    for word, start, end in iter_words(chunk):
+        key = word.lower()
+        if len(key) >= 2 and key not in index:
+            found.append((word, key, offset + start, offset + end))
+    return found
+
+
+def _lookup_batch(args):
+    """Worker: suggestions for a batch of distinct unknown words."""
+    keys, limit = args
+    index = get_index()
+    return {key: _suggest(index, key, limit) for key in keys}
+
+
+def check_document(text: str, limit: int = 5, workers: int = None, chunk_chars: int = 65536):
+    """Spell check a large text across a process pool.
+
+    Same output as ``check_spelling``; every distinct unknown word is
+    looked up only once whatever the number of occurrences.
+    """
+    chunks = list(split_chunks(text, chunk_chars))
+    if len(chunks) <= 1:
+        return check_spelling(text, limit)
+
+    workers = workers or os.cpu_count() or 1
+    pool = _get_pool(workers)
+    occurrences = [occ for found in pool.map(_scan_chunk, chunks) for occ in found]
+
+    keys = sorted({key for _, key, _, _ in occurrences})
+    size = max(1, -(-len(keys) // (workers * 4)))
+    batches = [(keys[i:i + size], limit) for i in range(0, len(keys), size)]
+    suggestions = {}
+    for result in pool.map(_lookup_batch, batches):
+        suggestions.update(result)
+
+    return [_correction(word, start, end, suggestions[key]) for word, key, start, end in occurrences]
+
+
+if __name__ == "__main__":
+    path = model_path(INDEX_FILE)
+    idx = build_index()
+    idx.save(path)
+    print(f"{len(idx.words)} words, {len(idx.deletes)} deletes -> {path}")
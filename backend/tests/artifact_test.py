@@ -0,0 +1,33 @@
+import numpy as np
+
+from models.ngram_model import NGramModel
+from utils.artifact import StringTable, open_artifact, write_artifact
+
+
+def test_artifact_roundtrip(tmp_path):
+    path = str(tmp_path / "lexicon.bin")
+    words = StringTable.from_strings(["tsara", "fitiavana", "ôvy", "ny"], sort=True)
+    write_artifact(path, {"counts": np.arange(4, dtype=np.int64)}, meta={"lang": "mg"},
+                   strings={"words": words})
+
+    artifact = open_artifact(path)
+    loaded = artifact.strings("words")
+    assert artifact.meta["lang"] == "mg"
+    assert artifact["counts"].tolist() == [0, 1, 2, 3]
+    assert list(loaded) == ["fitiavana", "ny", "tsara", "ôvy"]
+    assert loaded.find("ôvy") == 3
+    assert loaded.find("tsy") == -1
+
+
+def test_ngram_model_saved_and_mapped(tmp_path):
+    model = NGramModel.from_counts(
+        {"ny": 10, "teny": 4, "malagasy": 3},
+        {"ny teny": 4, "teny malagasy": 3},
+        {"ny teny malagasy": 3},
+    )
+    path = str(tmp_path / "ngrams.bin")
+    model.save(path)
+    loaded = NGramModel.load(path)
+    assert loaded.predict("ny teny") == model.predict("ny teny")
+    assert loaded.predict("ny teny")[0][0] == "malagasy"
+    assert loaded.score("teny", "ny") == model.score("teny", "ny")
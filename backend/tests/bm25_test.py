@@ -0,0 +1,25 @@
+import numpy as np
+
+from models.bm25_index import BM25Index, decode_varints, encode_varints
+
+
+def test_varint_roundtrip():
+    values = [0, 1, 127, 128, 300, 2 ** 21, 2 ** 35 + 7]
+    data = np.frombuffer(encode_varints(values), dtype=np.uint8)
+    assert decode_varints(data).tolist() == values
+
+
+def test_maxscore_matches_exhaustive(tmp_path):
+    words = ["vary", "rano", "tany", "ala", "omby", "trano", "lalana", "tanàna"]
+    rng = np.random.default_rng(0)
+    articles = [
+        {"title": f"a{i}", "content_clean": " ".join(rng.choice(words, 30)) + "."}
+        for i in range(400)
+    ]
+    path = str(tmp_path / "bm25.bin")
+    BM25Index.build(articles, max_words=10).save(path)
+    index = BM25Index.load(path)
+    for query in ("vary rano", "tanàna ala omby", "lalana", "tsy misy"):
+        fast = index.search(query, 5)
+        exact = index.search_exhaustive(query, 5)
+        assert np.allclose([s for _, s in fast], [s for _, s in exact])
@@ -0,0 +1,65 @@
+import json
+import os
+
+import scrapers.cleaner as cleaner
+from scrapers.build import Build, dataset_nodes
+
+SENTENCES = [
+    "Ny vary no sakafo fototra hanin'ny Malagasy isan'andro.",
+    "Mamboly vary sy mangahazo ny tantsaha any ambanivohitra.",
+    "Antananarivo no renivohitr'i Madagasikara.",
+    "Nianatra teny malagasy tany an-tsekoly ny ankizy.",
+]
+
+
+def write_corpus(source, n=60, title_suffix=""):
+    os.makedirs(source, exist_ok=True)
+    with open(os.path.join(source, "articles-00001.jsonl"), "w", encoding="utf-8") as f:
+        for i in range(n):
+            content = " ".join(f"{s[:-1]} {i} laharana {i * 7}." for s in SENTENCES)
+            f.write(json.dumps({"id": i, "title": f"Lahatsoratra {i}{title_suffix}",
+                                "content": content}, ensure_ascii=False) + "\n")
+
+
+def make_build(tmp_path):
+    nodes = dataset_nodes(str(tmp_path / "output"), str(tmp_path / "dataset"),
+                          model=str(tmp_path / "language_id.npz"),
+                          dictionary=str(tmp_path / "entries.jsonl"))
+    for node in nodes:
+        if node.name == "clean":
+            node.params = dict(node.params, workers=1, batch_size=4)
+        if node.name == "ngrams":
+            node.params = dict(node.params, workers=1)
+    return Build(nodes, str(tmp_path / "dataset"), workers=1)
+
+
+def test_incremental_build_only_rebuilds_stale_nodes(tmp_path, monkeypatch):
+    write_corpus(str(tmp_path / "output"))
+    assert set(make_build(tmp_path).run().values()) == {"reconstruit"}
+    root = tmp_path / "dataset"
+    for path in ("corpus/articles_clean.json", "corpus/sentences.txt", "stats/ngrams.json",
+                 "lexiques/dictionnaire_mg.json", "lexiques/sentiment.json", "rules/phonotactics.json"):
+        assert (root / path).exists()
+    sentences = (root / "corpus" / "sentences.txt").read_text(encoding="utf-8")
+
+    # Nothing changed: nothing is rebuilt
+    assert set(make_build(tmp_path).run().values()) == {"à jour"}
+
+    # Titles changed: cleaning reruns from its batch cache, and the n-grams
+    # stay current because sentences.txt is byte-identical
+    calls = []
+    original = cleaner.clean_batch
+    monkeypatch.setattr(cleaner, "clean_batch", lambda batch, **kw: calls.append(len(batch)) or original(batch, **kw))
+    write_corpus(str(tmp_path / "output"), title_suffix=" (vaovao)")
+    status = make_build(tmp_path).run()
+    assert status["clean"] == "reconstruit" and status["ngrams"] == "à jour"
+    assert status["lexicons"] == "à jour"
+    assert sum(calls) == 60
+    assert (root / "corpus" / "sentences.txt").read_text(encoding="utf-8") == sentences
+
+    # One article added at the end: only its batch is cleaned again
+    calls.clear()
+    write_corpus(str(tmp_path / "output"), n=61, title_suffix=" (vaovao)")
+    status = make_build(tmp_path).run()
+    assert status["clean"] == "reconstruit"
+    assert 0 < sum(calls) < 60
@@ -0,0 +1,47 @@
+import json
+import os
+from collections import Counter
+
+from scrapers.cleaner import clean_corpus, extract_sentences, extract_words
+
+ARTICLES = [
+    {"id": 1, "title": "Antsirabe", "content": "Antsirabe dia tanàna [1] any Madagasikara. "
+                                                "Ny rano mafana no malaza ao. Jereo https://example.org ny tanàna!"},
+    {"id": 2, "title": "Vary", "content": "Ny vary no sakafo fototra. Mamboly vary ny tantsaha eto."},
+    {"id": 3, "title": "Short", "content": "Hello world"},
+]
+
+
+def write_shards(directory):
+    updated = dict(ARTICLES[1], content="Ny vary dia sakafo fototra sy tsara. Mamboly vary ny tantsaha.")
+    with open(os.path.join(directory, "articles-00001.jsonl"), "w", encoding="utf-8") as f:
+        for article in ARTICLES:
+            f.write(json.dumps(article, ensure_ascii=False) + "\n")
+    with open(os.path.join(directory, "articles-00002.jsonl"), "w", encoding="utf-8") as f:
+        f.write(json.dumps(updated, ensure_ascii=False) + "\n")
+    return [ARTICLES[0], ARTICLES[2], updated]
+
+
+def test_streaming_pipeline_matches_per_article_cleaning(tmp_path):
+    source = tmp_path / "output"
+    source.mkdir()
+    articles = write_shards(str(source))
+    out = tmp_path / "clean"
+
+    stats = clean_corpus(str(source), str(out), workers=2, batch_size=1, max_entries=3)
+
+    expected_words = Counter(w for a in articles for w in extract_words(a["content"]))
+    expected_sentences = [s for a in articles for s in extract_sentences(a["content"])]
+
+    clean = json.loads((out / "articles_clean.json").read_text(encoding="utf-8"))
+    assert [a["title"] for a in clean] == ["Antsirabe", "Short", "Vary"]
+    assert clean[2]["content_clean"].startswith("Ny vary dia")
+    assert "[1]" not in clean[0]["content_clean"] and "https" not in clean[0]["content_clean"]
+    assert (out / "sentences.txt").read_text(encoding="utf-8").split("\n") == expected_sentences
+
+    freq = json.loads((out / "word_frequencies.json").read_text(encoding="utf-8"))
+    assert freq == dict(expected_words)
+    assert list(freq) == sorted(expected_words, key=lambda w: (-expected_words[w], w))
+    assert json.loads((out / "dictionnaire_mg.json").read_text(encoding="utf-8")) == list(freq)
+    assert stats["articles"] == 3 and stats["unique_words"] == len(expected_words)
+    assert stats["words"] == sum(expected_words.values())
@@ -0,0 +1,61 @@
+import json
+import random
+
+import numpy as np
+
+from scrapers.dedup import MinHasher, deduplicate, near_duplicates, shingle_hashes, split_sentences, token_hashes
+
+BOILERPLATE = "Ity lahatsoratra ity dia mbola tsiry ka azonao atao ny manitatra azy."
+
+
+def random_text(rng, vocab, sentences=15):
+    return " ".join(" ".join(rng.choices(vocab, k=10)).capitalize() + "." for _ in range(sentences))
+
+
+def test_minhash_estimates_jaccard_similarity():
+    tokens = np.arange(1, 201, dtype=np.uint64) * np.uint64(7919)
+    a = shingle_hashes(tokens, 1)
+    b = shingle_hashes(tokens[50:250], 1)  # 150 shared of 200 + 50 -> J = 0.6
+    sig = MinHasher(256).signatures([a, b, np.zeros(0, dtype=np.uint64)])
+    assert abs((sig[0] == sig[1]).mean() - 0.6) < 0.1
+    labels, _, _ = near_duplicates(sig, threshold=0.5, bands=64, rows=4)
+    assert labels[1] == labels[0] and labels[2] == 2
+
+
+def test_sentences_concatenate_back_to_the_text():
+    rng = random.Random(0)
+    for text in ("Ny vary. . Tsara!", "...Ary izy", "A? ! B", "Andro\n\nTsara  ", ""):
+        assert "".join(split_sentences(text)) == text
+    for _ in range(500):
+        text = "".join(rng.choice("ab .!?\n") for _ in range(rng.randint(0, 30)))
+        assert "".join(split_sentences(text)) == text
+    # Word positions are offsets in the original text, whose lower case
+    # may be longer (İ -> i̇)
+    text = "İİ vary"
+    _, starts = token_hashes(text, {})
+    assert text[starts[-1]:] == "vary"
+
+
+def test_deduplicate_removes_near_duplicate_articles_and_repeated_sentences(tmp_path):
+    rng = random.Random(0)
+    vocab = [f"teny{i}" for i in range(2000)]
+    articles = [{"id": i, "title": f"T{i}", "content": random_text(rng, vocab)} for i in range(40)]
+    for a in articles[:6]:
+        a["content"] += " " + BOILERPLATE
+    copy = articles[3]["content"].split(" ")
+    copy[4] = "ovaina"
+    articles.append({"id": 99, "title": "T3 (kopia)", "content": " ".join(copy[:-3])})
+    source = tmp_path / "articles.jsonl"
+    source.write_text("".join(json.dumps(a) + "\n" for a in articles), encoding="utf-8")
+
+    report = deduplicate(str(source), str(tmp_path / "out.jsonl"), str(tmp_path / "report.json"))
+
+    assert report["document_clusters"] == [{"kept": "T3", "removed": ["T3 (kopia)"]}]
+    [cluster] = report["sentence_clusters"]
+    assert cluster["kept"] == BOILERPLATE and cluster["count"] == 6
+    kept = [json.loads(line) for line in (tmp_path / "out.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert len(kept) == 40
+    with_boilerplate = [a["title"] for a in kept if BOILERPLATE in a["content"]]
+    assert with_boilerplate == ["T0"]
+    assert kept[1]["content"] == articles[1]["content"][:-len(BOILERPLATE) - 1] + " "
+    assert kept[10]["content"] == articles[10]["content"]
@@ -0,0 +1,22 @@
+import numpy as np
+
+from models.embedding_model import EmbeddingModel
+from utils.artifact import StringTable
+
+
+def test_lsh_finds_exact_neighbours(tmp_path):
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((20, 32))
+    vectors = np.repeat(centers, 10, axis=0) + 0.05 * rng.standard_normal((200, 32))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    words = StringTable.from_strings([f"w{i:03d}" for i in range(200)], sort=True)
+    model = EmbeddingModel.index(words, vectors.astype(np.float16))
+
+    path = str(tmp_path / "embeddings.bin")
+    model.save(path)
+    loaded = EmbeddingModel.load(path)
+    query = loaded.vector("w042")
+    approx = loaded.nearest(query, 5, exclude=[42])
+    exact = loaded.exact_nearest(query, 5, exclude=[42])
+    assert [w for w, _ in approx] == [w for w, _ in exact]
+    assert all(w[:3] == "w04" for w, _ in approx)
@@ -0,0 +1,60 @@
+import scrapers.cleaner as cleaner
+from scrapers.language_id import LanguageIdentifier
+
+SAMPLES = {
+    "mg": [
+        "Antananarivo no renivohitr'i Madagasikara ary tanàna lehibe indrindra eto amin'ny nosy",
+        "Ny vary no sakafo fototra hanin'ny Malagasy isan'andro",
+        "Mamboly vary sy mangahazo ny tantsaha any ambanivohitra",
+        "Nianatra teny malagasy tany an-tsekoly ny ankizy rehetra",
+        "Manana tantara lava sy kolontsaina manankarena ny vahoaka",
+        "Ny ranomasina manodidina ny nosy dia feno trondro sy biby maro",
+    ],
+    "fr": [
+        "Antananarivo est la capitale de Madagascar et la plus grande ville de l'île",
+        "Le riz est la nourriture de base des Malgaches chaque jour",
+        "Les paysans cultivent le riz et le manioc dans les campagnes",
+        "Tous les enfants ont appris le français à l'école primaire",
+        "Le peuple possède une longue histoire et une culture très riche",
+        "La mer qui entoure l'île est pleine de poissons et de nombreux animaux",
+    ],
+    "en": [
+        "Antananarivo is the capital of Madagascar and the largest city on the island",
+        "Rice is the staple food that people eat every single day",
+        "Farmers grow rice and cassava in the countryside",
+        "All the children learned English at the primary school",
+        "The people have a long history and a very rich culture",
+        "The sea around the island is full of fish and many animals",
+    ],
+}
+
+
+def train():
+    return LanguageIdentifier.train(SAMPLES, bits=14)
+
+
+def test_language_identifier_scores_sentences_in_one_pass():
+    model = train()
+    results = model.predict([
+        "Mianatra teny malagasy isan'andro ny tantsaha",
+        "La capitale possède une histoire très riche",
+        "The children eat rice every day",
+        "1990 !",
+    ])
+    assert [lang for lang, _ in results] == ["mg", "fr", "en", None]
+    assert results[0][1] > 0.9
+
+
+def test_cleaner_keeps_only_malagasy_sentences(tmp_path):
+    model_file = str(tmp_path / "langid.npz")
+    train().save(model_file)
+    article = {"id": 1, "title": "Vary", "content": (
+        "Ny vary no sakafo fototra hanin'ny Malagasy. "
+        "Le riz est la nourriture de base des Malgaches. "
+        "Mamboly vary ny tantsaha any ambanivohitra."
+    )}
+    records, sentences, counts = cleaner.clean_batch([article], model_file=model_file)
+    assert sentences == ["Ny vary no sakafo fototra hanin'ny Malagasy",
+                         "Mamboly vary ny tantsaha any ambanivohitra"]
+    assert counts["vary"] == 2 and "riz" not in counts
+    assert 0.5 < records[0]["quality_score"] < 0.8
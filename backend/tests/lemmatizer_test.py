@@ -0,0 +1,33 @@
+from services.lemmatizer import Lemmatizer
+
+RULES = {
+    "prefixes": ["man", "mam", "mi", "fan", "fi", "an", "ank"],
+    "suffixes": ["ana", "ina", "na", "tra"],
+    "rules": [{"pattern": "^man", "remove": "man", "type": "actif"}],
+}
+FREQUENCIES = {
+    "soratra": 36, "vaky": 4, "tia": 13, "tsara": 50, "izy": 406, "tany": 531,
+    "manoratra": 20, "fanoratana": 35, "mamaky": 20, "soratana": 7, "fitiavana": 8,
+    "anarana": 132, "ankizy": 10, "tanana": 22,
+}
+
+
+def lemmatizer():
+    return Lemmatizer(RULES, list(FREQUENCIES), FREQUENCIES)
+
+
+def test_derived_words_reduce_to_their_root():
+    lem = lemmatizer()
+    assert lem.lemma("manosika") == ("tosika", "man", "", "actif")
+    assert lem.lemma("manoratra")[0] == "soratra"
+    assert lem.lemma("fanoratana")[:3] == ("soratra", "fan", "ana")
+    assert lem.lemma("mamaky")[:2] == ("vaky", "mam")
+    assert lem.lemma("soratana")[:3] == ("soratra", "", "ana")
+    assert lem.lemma("fitiavana")[0] == "tia"
+
+
+def test_attested_plain_words_are_not_over_analysed():
+    lem = lemmatizer()
+    table = lem.build_table()
+    for word in ("anarana", "ankizy", "tanana", "tsara", "izy"):
+        assert lem.lemma(word) == table[word] == (word, "", "", None)
@@ -0,0 +1,35 @@
+import random
+
+from utils.levenshtein import (
+    MALAGASY_WEIGHTS,
+    bounded_distance,
+    distance,
+    distance_many,
+    myers_distance,
+)
+
+
+def _random_words(n, rng, alphabet="aeiouyktsr"):
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12))) for _ in range(n)]
+
+
+def test_variants_match_reference():
+    rng = random.Random(0)
+    words = _random_words(400, rng)
+    for a, b in zip(words, reversed(words)):
+        d = distance(a, b)
+        assert myers_distance(a, b) == d
+        for k in range(4):
+            assert bounded_distance(a, b, k) == (d if d <= k else k + 1)
+
+
+def test_distance_many_matches_reference():
+    rng = random.Random(1)
+    candidates = _random_words(300, rng)
+    result = distance_many("fitiavana", candidates)
+    assert result.tolist() == [distance("fitiavana", c) for c in candidates]
+
+
+def test_distance_many_malagasy_weights():
+    result = distance_many("tsiry", ["tsiri", "tsira", "tsiry"], MALAGASY_WEIGHTS)
+    assert result.tolist() == [0.5, 1.0, 0.0]
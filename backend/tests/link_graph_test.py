@@ -0,0 +1,20 @@
+from models.link_graph import CATEGORY, LinkGraph
+
+
+def test_link_graph_queries(tmp_path):
+    articles = [
+        {"title": "Antsirabe", "links": ["Vakinankaratra", "Antananarivo"], "categories": ["Sokajy:Tanàna"]},
+        {"title": "Antananarivo", "links": ["Analamanga"], "categories": ["Sokajy:Tanàna"]},
+        {"title": "Vakinankaratra", "links": ["Betafo"]},
+    ]
+    path = str(tmp_path / "graph.bin")
+    LinkGraph.from_articles(articles).save(path)
+    graph = LinkGraph.load(path)
+
+    node = graph.node("ANTSIRABE")
+    assert graph.kinds[graph.node("Sokajy:Tanàna")] == CATEGORY
+    assert [graph.titles[n] for n in graph.neighbors(node)] == ["Antananarivo", "Sokajy:Tanàna", "Vakinankaratra"]
+    ids, paths = graph.two_hop(node)
+    assert [graph.titles[n] for n in ids] == ["Analamanga", "Betafo"]
+    ranked = [graph.titles[n] for n, _ in graph.related([graph.node("Betafo")])]
+    assert ranked[:2] == ["Vakinankaratra", "Antsirabe"]
@@ -0,0 +1,55 @@
+import threading
+import time
+
+import utils.resources
+from utils.resources import ResourceRegistry, rss_bytes
+
+
+def test_resources_load_once_and_charge_nested_loads_to_themselves():
+    registry = ResourceRegistry()
+    calls = []
+
+    def load_words():
+        calls.append("words")
+        time.sleep(0.05)
+        return ["vary", "rano"]
+
+    def load_index():
+        calls.append("index")
+        return {w: i for i, w in enumerate(registry.get("words"))}
+
+    registry.register("words", load_words)
+    registry.register("index", load_index)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("index"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls == ["index", "words"]
+    assert all(r is results[0] for r in results) and results[0] == {"vary": 0, "rano": 1}
+
+    stats = {r["name"]: r for r in registry.stats()["resources"]}
+    assert stats["words"]["seconds"] >= 0.05
+    assert stats["index"]["seconds"] < 0.05
+    assert stats["index"]["loads"] == stats["words"]["loads"] == 1
+
+
+def test_stamped_resource_reloads_when_stamp_changes():
+    registry = ResourceRegistry()
+    version = [1]
+    registry.register("rules", lambda: f"rules v{version[0]}", stamp=lambda: version[0])
+    assert registry.get("rules") == "rules v1"
+    assert registry.get("rules") == "rules v1"
+    version[0] = 2
+    assert registry.get("rules") == "rules v2"
+    registry.unload("rules")
+    assert registry.preload()["resources"][0]["loads"] == 3
+
+
+def test_rss_is_zero_without_proc(monkeypatch):
+    def missing(*args, **kwargs):
+        raise FileNotFoundError("/proc/self/statm")
+    monkeypatch.setattr(utils.resources, "open", missing, raising=False)
+    assert rss_bytes() == 0
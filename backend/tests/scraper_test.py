@@ -0,0 +1,100 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+from scrapers.scraper_v2 import MalagasyScraper, load_shards
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "mediawiki_api.json")
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """Replays recorded MediaWiki API responses.
+
+    An entry answers a request when its "params" are a subset of the query
+    and it names every continuation parameter (excontinue, cmcontinue...) of
+    the query; "fail_first"
+    makes the first n hits fail with 503.
+    """
+
+    def do_GET(self):
+        params = dict(parse_qsl(urlparse(self.path).query))
+        for i, entry in enumerate(self.server.entries):
+            expected = entry["params"]
+            continuation = {k for k in params if k.endswith("continue") and k != "continue"}
+            if continuation <= set(expected) and all(params.get(k) == v for k, v in expected.items()):
+                self.server.hits[i] += 1
+                if self.server.hits[i] <= entry.get("fail_first", 0):
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                body = json.dumps(entry["response"]).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(body)
+                return
+        self.send_response(404)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ReplayHandler)
+    with open(FIXTURE, "r", encoding="utf-8") as f:
+        server.entries = json.load(f)
+    server.hits = [0] * len(server.entries)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_scraper(server, output_dir):
+    return MalagasyScraper(api_url=f"http://127.0.0.1:{server.server_port}/w/api.php",
+                           rate=100, backoff=0.01, output_dir=str(output_dir))
+
+
+def test_batched_fetch_follows_continuation_and_retries(tmp_path):
+    server = start_server()
+    try:
+        scraper = make_scraper(server, tmp_path)
+        pages = scraper.fetch_pages(["Antsirabe", "vary", "Tsy misy"])
+        assert set(pages) == {"Antsirabe", "vary"}
+        assert pages["Antsirabe"]["links"] == ["Antananarivo", "Betafo", "Vakinankaratra"]
+        assert pages["Antsirabe"]["categories"] == ["Sokajy:Tanàna eto Madagasikara"]
+        assert pages["vary"]["content"].startswith("Ny vary")
+        assert server.hits[:2] == [1, 1]
+
+        members = scraper.get_category_pages("Tanàna")
+        assert [m["title"] for m in members] == ["Antsirabe", "Fianarantsoa", "Mahajanga"]
+        assert server.hits[4] == 3
+    finally:
+        server.shutdown()
+
+
+def test_incremental_scrape_skips_unchanged_pages(tmp_path):
+    server = start_server()
+    titles = ["Antsirabe", "vary", "Tsy misy"]
+    try:
+        first = make_scraper(server, tmp_path)
+        assert first.scrape_titles(titles, "test", min_length=10) == 2
+        assert server.hits[:3] == [1, 1, 1]
+
+        # Same revisions: only the prop=info check is made
+        second = make_scraper(server, tmp_path)
+        assert second.scrape_titles(titles, "test", min_length=10) == 0
+        assert server.hits[:3] == [1, 1, 2]
+
+        # New revision of Antsirabe: fetched again, last version wins
+        server.entries[2]["response"]["query"]["pages"]["301"]["lastrevid"] = 9002
+        server.entries[0]["response"]["query"]["pages"]["301"]["lastrevid"] = 9002
+        third = make_scraper(server, tmp_path)
+        assert third.scrape_titles(titles, "test", min_length=10) == 1
+        articles = {a["title"]: a for a in load_shards(str(tmp_path))}
+        assert len(articles) == 2
+        assert articles["Antsirabe"]["revid"] == 9002
+        assert third.state.pages["301"]["revid"] == 9002
+    finally:
+        server.shutdown()
@@ -1,3 +1,5 @@
+import gc
+
 from app import create_app
 
 
@@ -19,7 +21,238 @@ def test_spell_check_empty():
     assert "original" in data
 
 
+def test_spell_check_suggestions():
+    app = create_app()
+    client = app.test_client()
+    r = client.post("/api/spell-check", json={"text": "Ny fitiavna dia tsara"})
+    assert r.status_code == 200
+    corrections = r.get_json()["corrections"]
+    assert len(corrections) == 1
+    c = corrections[0]
+    assert (c["word"], c["start"], c["end"]) == ("fitiavna", 3, 11)
+    assert c["suggestions"][0]["word"] == "fitiavana"
+
+
+def test_spell_check_document_mode():
+    app = create_app()
+    app.config["SPELLCHECK_CHUNK_CHARS"] = 32
+    client = app.test_client()
+    text = "Ny fitiavna dia tsara.\n\nTsra ny andro.\nNy fitiavna.\n" * 3
+    r = client.post("/api/spell-check", json={"text": text, "mode": "document"})
+    assert r.status_code == 200
+    corrections = r.get_json()["corrections"]
+    assert len(corrections) == 9
+    for c in corrections:
+        assert text[c["start"]:c["end"]] == c["word"]
+    assert corrections[-1]["suggestions"][0]["word"] == "fitiavana"
+
+
+def test_invalid_parameters():
+    app = create_app()
+    client = app.test_client()
+    r = client.post("/api/spell-check", json={"text": 5})
+    assert r.status_code == 400 and "text" in r.get_json()["error"]
+    r = client.post("/api/spell-check", json={"text": "Ny fitiavna", "limit": "dimy"})
+    assert r.status_code == 400 and "limit" in r.get_json()["error"]
+    r = client.post("/api/spell-check", json={"text": "Ny fitiavna", "limit": 10 ** 9})
+    assert r.status_code == 200 and len(r.get_json()["corrections"][0]["suggestions"]) <= 50
+    r = client.post("/api/autocomplete", json={"prefix": "tsa", "limit": None})
+    assert r.status_code == 400
+    r = client.post("/api/autocomplete", json={"prefix": "tsa", "limit": -3})
+    assert r.status_code == 200 and len(r.get_json()["suggestions"]) == 1
+    r = client.post("/api/autocomplete", json={"prefix": "ma", "limit": 50})
+    assert r.status_code == 200 and len(r.get_json()["suggestions"]) == 10  # TOP_K
+    r = client.post("/api/semantic-suggest", json={"text": "vary", "limit": "10a"})
+    assert r.status_code == 400
+    r = client.post("/api/semantic-suggest", json={"text": "vary", "title": 42})
+    assert r.status_code == 400 and "title" in r.get_json()["error"]
+    r = client.post("/api/concordance", json={"query": "vary", "width": "40px"})
+    assert r.status_code == 400 and "width" in r.get_json()["error"]
+    for body in ({"text": "vary", "analyzers": "spelling"}, {"text": "vary", "analyzers": [["lemmas"]]},
+                 {"text": "vary", "limit": "5.5"}, {"text": ["vary"]}):
+        assert client.post("/api/analyze", json=body).status_code == 400
+    r = client.post("/api/chatbot", json={"message": "Inona ny vary?", "limit": [3]})
+    assert r.status_code == 400
+    r = client.post("/api/chatbot", json={"message": {"text": "vary"}})
+    assert r.status_code == 400
+    assert client.post("/api/lemmatize", json={"text": 5}).status_code == 400
+    assert client.post("/api/phonotactic-check", json={"text": 5}).status_code == 400
+    assert client.post("/api/ner", json={"text": 5}).status_code == 400
+    r = client.post("/api/sentiment", json={"texts": ["tsara", 1]})
+    assert r.status_code == 400 and "texts[1]" in r.get_json()["error"]
+
+
+def test_autocomplete():
+    app = create_app()
+    client = app.test_client()
+    r = client.post("/api/autocomplete", json={"prefix": "Mala", "limit": 3})
+    assert r.status_code == 200
+    suggestions = r.get_json()["suggestions"]
+    assert len(suggestions) == 3
+    assert suggestions[0]["word"] == "malagasy"
+    assert all(s["word"].startswith("mala") for s in suggestions)
+
+
+def test_autocomplete_next_words():
+    app = create_app()
+    client = app.test_client()
+    r = client.post("/api/autocomplete", json={"prefix": "", "context": "amin' ny", "limit": 3})
+    assert r.status_code == 200
+    next_words = r.get_json()["next_words"]
+    assert [w["word"] for w in next_words][0] == "teny"
+    assert next_words[0]["score"] >= next_words[-1]["score"]
+
+
+def test_lemmatize():
+    app = create_app()
+    client = app.test_client()
+    r = client.post("/api/lemmatize", json={"text": "Manoratra sy manosika"})
+    assert r.status_code == 200
+    lemmas = r.get_json()["lemmas"]
+    assert [l["lemma"] for l in lemmas] == ["soratra", "sy", "tosika"]
+    assert lemmas[2]["prefix"] == "man" and lemmas[2]["start"] == 13
+
+
+def test_phonotactic_check():
+    app = create_app()
+    client = app.test_client()
+    r = client.post("/api/phonotactic-check", json={"text": "Tsara ny nbola, fa tsy Madagascar"})
+    assert r.status_code == 200
+    data = r.get_json()
+    assert data["valid"] is False
+    issues = [(i["rule"], i["pattern"], i["start"], i["word"]) for i in data["issues"]]
+    assert issues == [
+        ("invalid_combination", "nb", 9, "nbola"),
+        ("invalid_ending", "r", 32, "Madagascar"),
+    ]
+
+
+def test_ner_multi_word_entities():
+    app = create_app()
+    client = app.test_client()
+    text = "Tonga tao Nosy Be sy amoron’i mania i Ramatoa Rasoa."
+    r = client.post("/api/ner", json={"text": text})
+    assert r.status_code == 200
+    entities = [(e["text"], e["label"]) for e in r.get_json()["entities"]]
+    assert entities == [("Nosy Be", "CITY"), ("amoron’i mania", "REGION"), ("Ramatoa Rasoa", "PERSON")]
+
+
+def test_sentiment_batch():
+    app = create_app()
+    client = app.test_client()
+    r = client.post("/api/sentiment", json={"text": "Tena tsara ny sakafo."})
+    assert r.status_code == 200
+    data = r.get_json()
+    assert data["label"] == "positive" and data["score"] > 1
+    texts = ["Tsy tsara ilay izy.", "Ratsy. Tsara!", ""]
+    r = client.post("/api/sentiment", json={"texts": texts})
+    results = r.get_json()["results"]
+    assert [x["label"] for x in results] == ["negative", "neutral", "neutral"]
+    assert [s["label"] for s in results[1]["sentences"]] == ["negative", "positive"]
+
+
+def test_semantic_suggest():
+    app = create_app()
+    client = app.test_client()
+    r = client.post("/api/semantic-suggest", json={"text": "Antsirabe", "limit": 5})
+    assert r.status_code == 200
+    suggestions = r.get_json()["suggestions"]
+    assert len(suggestions) == 5
+    assert all(s["word"] != "antsirabe" for s in suggestions)
+    assert suggestions[0]["score"] >= suggestions[-1]["score"]
+
+
+def test_semantic_related_articles():
+    app = create_app()
+    client = app.test_client()
+    r = client.post("/api/semantic-suggest", json={"text": "Tany Antananarivo", "title": "antananarivo"})
+    assert r.status_code == 200
+    data = r.get_json()
+    assert data["related"][0]["title"] == "Madagasikara"
+    assert "Andrianampoinimerina" in data["neighbors"]
+    assert all(t["title"] not in data["neighbors"] for t in data["two_hop"])
+
+
+def test_chatbot_retrieval():
+    app = create_app()
+    client = app.test_client()
+    r = client.post("/api/chatbot", json={"message": "Inona no renivohitr'i Madagasikara?"})
+    assert r.status_code == 200
+    data = r.get_json()
+    assert "renivohitr" in data["reply"]
+    assert data["sources"][0]["passage"] == data["reply"]
+    r = client.post("/api/chatbot", json={"message": ""})
+    assert r.get_json()["reply"] == ""
+
+
+def test_concordance_pages():
+    app = create_app()
+    client = app.test_client()
+    r = client.post("/api/concordance", json={"query": "Antananarivo", "limit": 5})
+    assert r.status_code == 200
+    data = r.get_json()
+    assert data["total"] > 5 and len(data["lines"]) == 5
+    assert all(line["match"].lower() == "antananarivo" for line in data["lines"])
+    r = client.post("/api/concordance", json={"query": "Antananarivo", "offset": data["total"] - 2})
+    assert len(r.get_json()["lines"]) == 2
+
+
+
+def test_analyze_merges_endpoints():
+    app = create_app()
+    client = app.test_client()
+    text = "Ny fitiavna dia tsara. Tonga tao Nosy Be i Ramatoa Rasoa, fa tsy manosika nbola."
+    r = client.post("/api/analyze", json={"text": text, "limit": 3})
+    assert r.status_code == 200
+    data = r.get_json()
+    assert data["original"] == text
+    single = {
+        "spelling": client.post("/api/spell-check", json={"text": text, "limit": 3}).get_json()["corrections"],
+        "phonotactics": client.post("/api/phonotactic-check", json={"text": text}).get_json(),
+        "lemmas": client.post("/api/lemmatize", json={"text": text}).get_json()["lemmas"],
+        "entities": client.post("/api/ner", json={"text": text}).get_json()["entities"],
+    }
+    sentiment = client.post("/api/sentiment", json={"text": text}).get_json()
+    assert data["spelling"]["corrections"] == single["spelling"]
+    assert data["phonotactics"] == single["phonotactics"]
+    assert data["lemmas"] == single["lemmas"]
+    assert data["entities"] == single["entities"]
+    assert {**data["sentiment"], "text": text} == sentiment
+
+    r = client.post("/api/analyze", json={"text": text, "analyzers": ["entities"]})
+    assert set(r.get_json()) == {"original", "tokens", "entities"}
+    r = client.post("/api/analyze", json={"text": text, "analyzers": ["syntax"]})
+    assert r.status_code == 400
+
+
+def test_resources_are_shared_and_reported():
+    app = create_app()
+    client = app.test_client()
+    data = client.get("/api/resources").get_json()
+    resources = {r["name"]: r for r in data["resources"]}
+    assert {"dictionary", "spell_index", "lemmatizer", "sentiment_model"} <= set(resources)
+    assert all(r["loaded"] and r["loads"] == 1 for r in resources.values())
+    assert gc.get_freeze_count() == 0  # PRELOAD_FREEZE_GC is off by default
+    create_app()
+    again = {r["name"]: r["loads"] for r in client.get("/api/resources").get_json()["resources"]}
+    assert set(again.values()) == {1}
+
 if __name__ == "__main__":
     test_index()
     test_spell_check_empty()
+    test_spell_check_suggestions()
+    test_spell_check_document_mode()
+    test_invalid_parameters()
+    test_autocomplete()
+    test_autocomplete_next_words()
+    test_lemmatize()
+    test_phonotactic_check()
+    test_ner_multi_word_entities()
+    test_sentiment_batch()
+    test_semantic_suggest()
+    test_semantic_related_articles()
+    test_chatbot_retrieval()
+    test_concordance_pages()
+    test_analyze_merges_endpoints()
+    test_resources_are_shared_and_reported()
     print("Smoke tests passed")
@@ -0,0 +1,17 @@
+import re
+
+from models.suffix_index import SuffixIndex
+
+
+def test_counts_match_brute_force(tmp_path):
+    text = "Tsara ny andro.\nNy andro dia tsara be.\nTSARA! Andron'ny tsaratsara\n"
+    path = str(tmp_path / "suffix.bin")
+    SuffixIndex.build(text).save(path)
+    index = SuffixIndex.load(path)
+    for query in ("tsara", "ny andro", "a", "andro", "y a", "\n", "tsy"):
+        expected = len(re.findall(f"(?={re.escape(query)})", text.lower()))
+        assert index.count(query) == expected
+
+    total, lines = index.concordance("andro", offset=1, limit=2, width=6)
+    assert total == 3 and len(lines) == 2
+    assert all("\n" not in line["left"] + line["right"] for line in lines)
@@ -0,0 +1,104 @@
+import json
+import os
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from scrapers.tenymalagasy_scraper import TenyMalagasyCrawler, load_entries
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "tenymalagasy.json")
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """Serves the fixture pages with ETag / Last-Modified revalidation;
+    "fail_first" makes the first n hits of a page fail with 503."""
+
+    def do_GET(self):
+        page = self.server.pages.get(self.path)
+        if page is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        self.server.hits[self.path] += 1
+        if self.server.hits[self.path] <= page.get("fail_first", 0):
+            self.send_response(503)
+            self.end_headers()
+            return
+        etag, modified = page.get("etag"), page.get("last_modified")
+        if (etag and self.headers.get("If-None-Match") == etag) or \
+                (modified and self.headers.get("If-Modified-Since") == modified):
+            self.server.not_modified += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = page["body"].encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if etag:
+            self.send_header("ETag", etag)
+        if modified:
+            self.send_header("Last-Modified", modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    with open(FIXTURE, "r", encoding="utf-8") as f:
+        server.pages = json.load(f)
+    server.hits = Counter()
+    server.not_modified = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_crawler(server, tmp_path):
+    return TenyMalagasyCrawler(base_url=f"http://127.0.0.1:{server.server_port}", workers=3,
+                               rate=200, backoff=0.01, cache_dir=str(tmp_path / "cache"),
+                               store_path=str(tmp_path / "entries.jsonl"))
+
+
+def test_crawl_parses_entries_and_revalidates_from_cache(tmp_path):
+    server = start_server()
+    try:
+        stats = make_crawler(server, tmp_path).crawl(letters="vz")
+        assert (stats["new"], stats["errors"]) == (4, 1)  # vovo is a dead link
+        assert server.hits["/bins/teny2/zaza"] == 2       # retried after a 503
+        entries = {e["headword"]: e for e in load_entries(str(tmp_path / "entries.jsonl"))}
+        assert sorted(entries) == ["varavarana", "vary", "vorona", "zaza"]
+        assert entries["vary"]["pos"] == ["anarana"]
+        assert entries["vary"]["definitions"] == [
+            {"lang": "mg", "text": "Voa fototry ny sakafo malagasy, ambolena an-tanimbary."},
+            {"lang": "en", "text": "rice"},
+            {"lang": "fr", "text": "riz"},
+        ]
+        assert [d["text"] for d in entries["zaza"]["definitions"]] == ["child", "baby"]
+
+        # Second crawl: every page is revalidated; only the edited entry is
+        # downloaded again, the others are answered with 304
+        server.pages["/bins/teny2/vorona"] = dict(server.pages["/bins/teny2/vorona"], etag='"vorona-2"')
+        server.pages["/bins/teny2/vorona"]["body"] = server.pages["/bins/teny2/vorona"]["body"].replace(
+            "bird", "bird (Aves)")
+        stats = make_crawler(server, tmp_path).crawl(letters="vz")
+        assert (stats["new"], stats["updated"], stats["unchanged"]) == (0, 1, 3)
+        assert stats["downloaded"] == 1 and stats["revalidated"] == server.not_modified == 6
+        entries = {e["headword"]: e for e in load_entries(str(tmp_path / "entries.jsonl"))}
+        assert entries["vorona"]["definitions"] == [{"lang": "en", "text": "bird (Aves)"}]
+        with open(tmp_path / "entries.jsonl", encoding="utf-8") as f:
+            assert len(f.readlines()) == 5
+    finally:
+        server.shutdown()
+
+
+def test_failed_index_page_skips_only_its_letter(tmp_path):
+    server = start_server()
+    try:
+        stats = make_crawler(server, tmp_path).crawl(letters="xv")  # no list for x (404)
+        assert (stats["new"], stats["errors"]) == (3, 2)
+        assert sorted(e["headword"] for e in load_entries(str(tmp_path / "entries.jsonl"))) == [
+            "varavarana", "vary", "vorona"]
+    finally:
+        server.shutdown()
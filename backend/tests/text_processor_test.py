@@ -0,0 +1,57 @@
+import random
+import sys
+import unicodedata
+
+from utils.text_processor import (
+    APOSTROPHE,
+    HYPHEN,
+    NUMBER,
+    PUNCT,
+    SHORT_TEXT,
+    WORD,
+    _marked,
+    iter_words,
+    tokenize,
+)
+
+TEXT = "Nandeha tany amin’ny fandraisan-teny i Rakotô, 12 km — 'tsara'!"
+
+
+def test_tokens_keep_offsets_kinds_and_links():
+    for text in (TEXT, TEXT + " " * SHORT_TEXT):  # regex and NumPy scanners
+        tokens = tokenize(text)
+        assert [tokens[i] for i in range(len(tokens))] == [
+            "Nandeha", "tany", "amin", "ny", "fandraisan", "teny", "i", "Rakotô", ",",
+            "12", "km", "—", "'", "tsara", "'", "!",
+        ]
+        assert tokens.kinds.tolist() == [WORD] * 8 + [PUNCT, NUMBER, WORD, PUNCT, PUNCT, WORD, PUNCT, PUNCT]
+        assert tokens.links.tolist()[3] == APOSTROPHE and tokens.links.tolist()[5] == HYPHEN
+        assert sum(tokens.links.tolist()) == APOSTROPHE + HYPHEN
+        assert [text[s:e] for s, e in tokens.compounds()][2:4] == ["amin’ny", "fandraisan-teny"]
+        forms, ids = tokens.forms()
+        assert forms[ids[7]] == "rakotô" and forms[ids[12]] == forms[ids[14]] == "'"
+        assert list(iter_words(text)) == [(w, s, e) for w, s, e in tokens.words()]
+
+
+def test_regex_and_numpy_scanners_agree():
+    rng = random.Random(0)
+    alphabet = list("abô Z'’ʼ-‐_.,1²\n\t😀\x00é") + ["́"]
+    for _ in range(2000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        short, long = tokenize(text), tokenize(text + " " * SHORT_TEXT)
+        for a, b in zip((short.starts, short.ends, short.kinds, short.links),
+                        (long.starts, long.ends, long.kinds, long.links)):
+            assert a.tolist() == b.tolist(), repr(text)
+
+
+def test_combining_marks_stay_in_their_word():
+    text = "Misaotra tompo\u0302ko!"  # ô written as o + U+0302
+    for t in (text, text + " " * SHORT_TEXT):
+        assert [(w, t[s:e]) for w, s, e in tokenize(t).words()] == [
+            ("Misaotra", "Misaotra"), ("tompo\u0302ko", "tompo\u0302ko")]
+        assert list(iter_words(t))[1] == ("tompo\u0302ko", 9, 17)
+
+
+def test_mark_ranges_hold_every_combining_mark():
+    marks = {chr(c) for c in range(sys.maxunicode + 1) if unicodedata.category(chr(c)) == "Mn"}
+    assert _marked()[0] == marks
@@ -0,0 +1,158 @@
+"""Binary, memory-mapped artifact format
+
+An artifact file is a small JSON header followed by raw NumPy arrays::
+
+    b"MGART001" | uint64 header length | header JSON | arrays (64-byte aligned)
+
+The header lists every array (dtype, shape, offset) plus free-form ``meta``.
+``open_artifact`` maps the file read-only and returns zero-copy array views,
+so opening is near-instant and processes forked from the same parent (or
+opening the same file) share the pages. Strings are stored as a
+``StringTable``: one UTF-8 blob plus an offsets array.
+"""
+import json
+import mmap
+import os
+
+import numpy as np
+
+MAGIC = b"MGART001"
+ALIGN = 64
+
+
+class StringTable:
+    """Sequence of strings over (utf-8 blob, offsets); ``find`` needs sorted=True."""
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray, is_sorted: bool = False):
+        self.data = data
+        self.offsets = offsets
+        self.is_sorted = is_sorted
+
+    @classmethod
+    def from_strings(cls, strings, sort: bool = False):
+        encoded = [s.encode("utf-8") for s in strings]
+        if sort:
+            encoded = sorted(set(encoded))
+        sizes = [len(b) for b in encoded]
+        dtype = np.int32 if sum(sizes) < 2 ** 31 else np.int64
+        offsets = np.zeros(len(encoded) + 1, dtype=dtype)
+        np.cumsum(sizes, out=offsets[1:])
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return cls(data, offsets, sort)
+
+    def arrays(self, name: str) -> dict:
+        return {f"{name}.data": self.data, f"{name}.offsets": self.offsets}
+
+    def _bytes(self, i: int) -> bytes:
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes()
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self._bytes(i).decode("utf-8")
+
+    def __iter__(self):
+        blob = self.data.tobytes()
+        bounds = self.offsets.tolist()
+        for i in range(len(bounds) - 1):
+            yield blob[bounds[i]:bounds[i + 1]].decode("utf-8")
+
+    def find(self, s: str) -> int:
+        """Index of s by binary search, or -1."""
+        if not self.is_sorted:
+            raise ValueError("find() needs a sorted string table")
+        key = s.encode("utf-8")
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._bytes(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < len(self) and self._bytes(lo) == key else -1
+
+    def get(self, s: str, default=None):
+        i = self.find(s)
+        return default if i < 0 else i
+
+    def __contains__(self, s: str):
+        return self.find(s) >= 0
+
+
+class Artifact:
+    def __init__(self, arrays: dict, meta: dict, path: str = None, buffer=None):
+        self.arrays = arrays
+        self.meta = meta
+        self.path = path
+        self._buffer = buffer
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    def __contains__(self, name: str):
+        return name in self.arrays
+
+    def strings(self, name: str) -> StringTable:
+        sorted_tables = self.meta.get("_sorted_strings", [])
+        return StringTable(self[f"{name}.data"], self[f"{name}.offsets"], name in sorted_tables)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in self.arrays.values())
+
+
+def write_artifact(path: str, arrays: dict, meta: dict = None, strings: dict = None):
+    """Write arrays (and StringTables) to path atomically."""
+    arrays = {name: np.ascontiguousarray(a) for name, a in arrays.items()}
+    meta = dict(meta or {})
+    for name, table in (strings or {}).items():
+        arrays.update(table.arrays(name))
+        if table.is_sorted:
+            meta.setdefault("_sorted_strings", []).append(name)
+
+    table = {}
+    offset = 0
+    for name, a in arrays.items():
+        offset = -(-offset // ALIGN) * ALIGN
+        table[name] = {"dtype": a.dtype.str, "shape": list(a.shape), "offset": offset}
+        offset += a.nbytes
+    header = json.dumps({"meta": meta, "arrays": table}, ensure_ascii=False).encode("utf-8")
+    base = -(-(len(MAGIC) + 8 + len(header)) // ALIGN) * ALIGN
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header)
+        for name, a in arrays.items():
+            f.write(b"\0" * (base + table[name]["offset"] - f.tell()))
+            f.write(a.tobytes())
+    os.replace(tmp, path)
+
+
+def open_artifact(path: str) -> Artifact:
+    """Memory-map an artifact; arrays are read-only views into the file."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"{path}: empty artifact")
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path}: not an artifact file")
+    header_len = int.from_bytes(buffer[len(MAGIC):len(MAGIC) + 8], "little")
+    start = len(MAGIC) + 8
+    header = json.loads(buffer[start:start + header_len].decode("utf-8"))
+    base = -(-(start + header_len) // ALIGN) * ALIGN
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        count = int(np.prod(shape, dtype=np.int64))
+        if count == 0:
+            arrays[name] = np.zeros(shape, dtype=dtype)
+        else:
+            arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count,
+                                         offset=base + spec["offset"]).reshape(shape)
+    return Artifact(arrays, header["meta"], path, buffer)
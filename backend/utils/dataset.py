@@ -0,0 +1,152 @@
+"""Dataset file helpers
+
+Lexicons are read from the binary artifacts written by ``convert_dataset``
+(``python -m utils.dataset``) when they exist, memory-mapped so startup is
+near-instant and forked workers share pages; otherwise the JSON sources are
+parsed into the same in-memory structures.
+"""
+import json
+import os
+
+import numpy as np
+
+from config.config import Config
+from utils.artifact import StringTable, open_artifact, write_artifact
+from utils.resources import resource
+
+DICTIONARY_BIN = ("lexiques", "dictionnaire_mg.bin")
+FREQUENCIES_BIN = ("stats", "word_frequencies.bin")
+GAZETTEER_BIN = ("lexiques", "ner_gazetteer.bin")
+NGRAMS_BIN = ("stats", "ngrams.bin")
+
+
+def dataset_path(*parts: str) -> str:
+    return os.path.join(Config.DATASET_DIR, *parts)
+
+
+def model_path(*parts: str) -> str:
+    return os.path.join(Config.MODELS_DIR, *parts)
+
+
+def load_json(*parts: str):
+    with open(dataset_path(*parts), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_lines(*parts: str):
+    with open(dataset_path(*parts), "r", encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+class Lexicon:
+    """Sorted words with their counts; a read-only mapping word -> count."""
+
+    def __init__(self, words: StringTable, counts: np.ndarray):
+        self.words = words
+        self.counts = counts
+
+    @classmethod
+    def from_dict(cls, counts: dict):
+        words = StringTable.from_strings(counts, sort=True)
+        return cls(words, np.array([counts[w] for w in words], dtype=np.int64))
+
+    def get(self, word: str, default=None):
+        i = self.words.find(word)
+        return default if i < 0 else int(self.counts[i])
+
+    def __contains__(self, word: str):
+        return word in self.words
+
+    def __len__(self):
+        return len(self.words)
+
+    def __iter__(self):
+        return iter(self.words)
+
+    def items(self):
+        return zip(self.words, self.counts.tolist())
+
+
+def _open_bin(parts):
+    path = dataset_path(*parts)
+    return open_artifact(path) if os.path.exists(path) else None
+
+
+def load_dictionary() -> StringTable:
+    """Dictionary words (lower-cased, sorted)."""
+    artifact = _open_bin(DICTIONARY_BIN)
+    if artifact is not None:
+        return artifact.strings("words")
+    words = load_json("lexiques", "dictionnaire_mg.json")
+    return StringTable.from_strings((w.lower() for w in words), sort=True)
+
+
+def load_frequencies() -> Lexicon:
+    """Corpus word frequencies."""
+    artifact = _open_bin(FREQUENCIES_BIN)
+    if artifact is not None:
+        return Lexicon(artifact.strings("words"), artifact["counts"])
+    return Lexicon.from_dict(load_json("stats", "word_frequencies.json"))
+
+
+@resource("dictionary")
+def get_dictionary() -> StringTable:
+    """The dictionary, shared by every service of the process."""
+    return load_dictionary()
+
+
+@resource("frequencies")
+def get_frequencies() -> Lexicon:
+    """Corpus word frequencies, shared by every service of the process."""
+    return load_frequencies()
+
+
+def load_gazetteer() -> dict:
+    """NER gazetteer as {category: [names]}."""
+    artifact = _open_bin(GAZETTEER_BIN)
+    if artifact is None:
+        return load_json("lexiques", "ner_gazetteer.json")
+    categories = artifact.meta["categories"]
+    gazetteer = {c: [] for c in categories}
+    for name, label in zip(artifact.strings("names"), artifact["labels"].tolist()):
+        gazetteer[categories[label]].append(name)
+    return gazetteer
+
+
+def convert_dataset():
+    """Write binary artifacts next to the JSON lexicons; returns their paths."""
+    from models.ngram_model import NGramModel
+
+    written = []
+
+    words = load_json("lexiques", "dictionnaire_mg.json")
+    path = dataset_path(*DICTIONARY_BIN)
+    write_artifact(path, {}, strings={"words": StringTable.from_strings((w.lower() for w in words), sort=True)})
+    written.append(path)
+
+    freq = Lexicon.from_dict(load_json("stats", "word_frequencies.json"))
+    path = dataset_path(*FREQUENCIES_BIN)
+    write_artifact(path, {"counts": freq.counts}, strings={"words": freq.words})
+    written.append(path)
+
+    gazetteer = load_json("lexiques", "ner_gazetteer.json")
+    categories = list(gazetteer)
+    names = [n for c in categories for n in gazetteer[c]]
+    labels = np.array([i for i, c in enumerate(categories) for _ in gazetteer[c]], dtype=np.uint8)
+    path = dataset_path(*GAZETTEER_BIN)
+    write_artifact(path, {"labels": labels}, meta={"categories": categories},
+                   strings={"names": StringTable.from_strings(names)})
+    written.append(path)
+
+    ngrams = load_json("stats", "ngrams.json")
+    model = NGramModel.from_counts(load_json("stats", "word_frequencies.json"),
+                                   ngrams["bigrams"], ngrams["trigrams"])
+    path = dataset_path(*NGRAMS_BIN)
+    model.save(path)
+    written.append(path)
+    return written
+
+
+if __name__ == "__main__":
+    for p in convert_dataset():
+        print(f"{os.path.getsize(p):>10,} B  {p}")
@@ -1,4 +1,27 @@
-"""Levenshtein distance helper"""
+"""Levenshtein distance helpers
+
+- ``distance``: reference full-matrix implementation
+- ``bounded_distance``: banded DP that gives up once ``max_distance`` is exceeded
+- ``myers_distance``: bit-parallel (Myers/Hyyrö) version for words up to 64 chars
+- ``distance_many``: one query against many candidates in a single NumPy pass,
+  optionally with weighted substitutions (see ``MALAGASY_WEIGHTS``)
+"""
+import numpy as np
+
+MYERS_MAX_LENGTH = 64
+
+# Cheap substitutions for common Malagasy spelling confusions: "o" is
+# pronounced /u/ (French-influenced "ou"/"u"), "i" is written "y" word-finally,
+# and accented vowels are often typed without the accent.
+MALAGASY_WEIGHTS = {
+    ("o", "u"): 0.5,
+    ("i", "y"): 0.5,
+    ("o", "ô"): 0.25,
+    ("a", "à"): 0.25,
+    ("e", "é"): 0.25,
+    ("e", "è"): 0.25,
+}
+
 
 def distance(a: str, b: str) -> int:
     # Simple implementation
@@ -12,3 +35,140 @@ def distance(a: str, b: str) -> int:
             cur = min(dp[j] + 1, prev + (a[i-1] != b[j-1]), dp[j-1] + 1)
             prev, dp[j] = dp[j], cur
     return dp[-1]
+
+
+def bounded_distance(a: str, b: str, max_distance: int) -> int:
+    """Distance if it is <= max_distance, otherwise max_distance + 1.
+
+    Only the diagonal band |i - j| <= max_distance is filled and the scan
+    stops as soon as a whole row exceeds the threshold.
+    """
+    if a == b:
+        return 0
+    over = max_distance + 1
+    if abs(len(a) - len(b)) > max_distance:
+        return over
+
+    # Common prefix/suffix never contribute to the distance
+    start = 0
+    end_a, end_b = len(a), len(b)
+    while start < end_a and start < end_b and a[start] == b[start]:
+        start += 1
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    la, lb = len(a), len(b)
+    if la == 0 or lb == 0:
+        return la or lb
+
+    prev = [j if j <= max_distance else over for j in range(lb + 1)]
+    for i in range(1, la + 1):
+        lo = max(1, i - max_distance)
+        hi = min(lb, i + max_distance)
+        cur = [over] * (lb + 1)
+        if i <= max_distance:
+            cur[0] = i
+        row_min = cur[lo - 1]
+        ca = a[i - 1]
+        for j in range(lo, hi + 1):
+            c = prev[j - 1] + (ca != b[j - 1])
+            if prev[j] + 1 < c:
+                c = prev[j] + 1
+            if cur[j - 1] + 1 < c:
+                c = cur[j - 1] + 1
+            if c > over:
+                c = over
+            cur[j] = c
+            if c < row_min:
+                row_min = c
+        if row_min > max_distance:
+            return over
+        prev = cur
+    return min(prev[lb], over)
+
+
+def myers_distance(a: str, b: str) -> int:
+    """Bit-parallel edit distance; falls back to ``distance`` past 64 chars."""
+    if a == b:
+        return 0
+    if len(a) > len(b):
+        a, b = b, a
+    m = len(a)
+    if m == 0:
+        return len(b)
+    if m > MYERS_MAX_LENGTH:
+        return distance(a, b)
+
+    peq = {}
+    for i, ch in enumerate(a):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+    for ch in b:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return score
+
+
+def _encode(words, width):
+    """Pad words to ``width`` and view them as a (n, width) array of code points."""
+    padded = "".join(w.ljust(width, "\0") for w in words)
+    return np.frombuffer(padded.encode("utf-32-le"), dtype=np.uint32).reshape(len(words), width)
+
+
+def distance_many(query: str, candidates, weights: dict = None) -> np.ndarray:
+    """Distance from ``query`` to every candidate, computed together.
+
+    The DP runs one row per query character, each row being a handful of
+    array operations over all candidates at once. ``weights`` maps
+    unordered character pairs to a substitution cost (default 1); the
+    result is an int array without weights and a float array with them.
+    """
+    n = len(candidates)
+    if n == 0:
+        return np.zeros(0, dtype=np.float64 if weights else np.int64)
+    lengths = np.fromiter((len(c) for c in candidates), dtype=np.int64, count=n)
+    width = int(lengths.max())
+    if width == 0:
+        return np.full(n, len(query), dtype=np.float64 if weights else np.int64)
+    codes = _encode(candidates, width)
+
+    pair_costs = {}
+    for (x, y), cost in (weights or {}).items():
+        pair_costs.setdefault(x, []).append((ord(y), cost))
+        pair_costs.setdefault(y, []).append((ord(x), cost))
+
+    dtype = np.float32 if weights else np.int16
+    steps = np.arange(width + 1, dtype=dtype)
+    row = np.broadcast_to(steps, (n, width + 1)).copy()
+    best = np.empty_like(row)
+    deletion = np.empty((n, width), dtype=dtype)
+    for i, ch in enumerate(query, start=1):
+        sub_cost = (codes != ord(ch)).astype(dtype)
+        for other, cost in pair_costs.get(ch, ()):
+            sub_cost[codes == other] = cost
+        best[:, 0] = i
+        # substitution/match from the diagonal, deletion from above
+        np.add(row[:, :-1], sub_cost, out=best[:, 1:])
+        np.add(row[:, 1:], 1, out=deletion)
+        np.minimum(best[:, 1:], deletion, out=best[:, 1:])
+        # insertions: cur[j] = min_k<=j (best[k] + j - k), a running minimum
+        best -= steps
+        np.minimum.accumulate(best, axis=1, out=row)
+        row += steps
+
+    result = row[np.arange(n), lengths]
+    return result.astype(np.float64 if weights else np.int64)
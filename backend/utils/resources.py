@@ -0,0 +1,144 @@
+"""Shared NLP resources
+
+Every lexicon, index and model the services use is registered under a name
+with the function that loads it (``@resource("name")``). The decorated
+function becomes the getter: the first call loads the resource, behind a
+per-resource lock, and every later call, from any service or thread, gets
+the same object. A resource with a ``stamp`` (e.g. a file's mtime and size)
+is loaded again when the stamp changes.
+
+``registry.preload()`` loads everything up front. ``create_app`` calls it
+so that a prefork server started with the app preloaded (gunicorn
+``--preload``) forks workers that share the loaded objects and mapped
+artifacts copy-on-write. For such servers only (``PRELOAD_FREEZE_GC``),
+``gc.freeze`` then keeps the collector from writing to them; it also keeps
+every object allocated so far out of collection for good, so tests and the
+development server leave it off.
+
+The load time and resident memory growth of each resource are recorded,
+excluding the resources it loads in turn, and served by ``/api/resources``.
+Memory is read from /proc (Linux); elsewhere it is reported as 0.
+"""
+import gc
+import os
+import threading
+import time
+from functools import wraps
+
+
+def rss_bytes() -> int:
+    """Current resident set size of the process, or 0 where it cannot be
+    read. Peak RSS (getrusage) is not used: it never goes down, so its
+    deltas would not be per-resource memory."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+class Resource:
+    def __init__(self, name, loader, stamp=None):
+        self.name = name
+        self.loader = loader
+        self.stamp = stamp
+        self.lock = threading.RLock()
+        self.loaded = False
+        self.value = None
+        self.stamp_value = None
+        self.loads = 0
+        self.seconds = 0.0
+        self.memory = 0
+
+    def fresh(self):
+        return self.loaded and (self.stamp is None or self.stamp() == self.stamp_value)
+
+
+class ResourceRegistry:
+    def __init__(self):
+        self.resources = {}
+        self.local = threading.local()
+
+    def register(self, name, loader, stamp=None):
+        """Add a resource; registering a name again (module reloaded)
+        replaces it."""
+        self.resources[name] = Resource(name, loader, stamp)
+
+    def get(self, name):
+        res = self.resources[name]
+        if res.fresh():
+            return res.value
+        with res.lock:
+            if not res.fresh():
+                self._load(res)
+        return res.value
+
+    def _load(self, res):
+        # Time and memory of nested loads are charged to the nested resource
+        stack = self.local.__dict__.setdefault("stack", [])
+        stack.append([0.0, 0])
+        stamp = res.stamp() if res.stamp else None
+        memory, started = rss_bytes(), time.perf_counter()
+        try:
+            res.value = res.loader()
+        finally:
+            seconds, memory = time.perf_counter() - started, rss_bytes() - memory
+            nested_seconds, nested_memory = stack.pop()
+            if stack:
+                stack[-1][0] += seconds
+                stack[-1][1] += memory
+        res.seconds = seconds - nested_seconds
+        res.memory = memory - nested_memory
+        res.stamp_value = stamp
+        res.loads += 1
+        res.loaded = True
+
+    def preload(self, names=None, freeze=False):
+        """Load the named (default: all) resources now; returns the stats.
+
+        ``freeze`` moves everything allocated so far to the permanent GC
+        generation: only for a process that is about to fork workers.
+        """
+        for name in names or list(self.resources):
+            self.get(name)
+        if freeze:
+            gc.collect()
+            gc.freeze()
+        return self.stats()
+
+    def unload(self, name):
+        res = self.resources[name]
+        with res.lock:
+            res.loaded, res.value = False, None
+
+    def stats(self):
+        resources = [
+            {
+                "name": res.name,
+                "loaded": res.loaded,
+                "seconds": round(res.seconds, 4),
+                "memory_bytes": res.memory,
+                "loads": res.loads,
+            }
+            for res in self.resources.values()
+        ]
+        return {
+            "resources": resources,
+            "total_seconds": round(sum(r.seconds for r in self.resources.values() if r.loaded), 4),
+            "rss_bytes": rss_bytes(),
+        }
+
+
+registry = ResourceRegistry()
+
+
+def resource(name, stamp=None):
+    """Register the decorated loader as ``name``; return its shared getter."""
+    def decorator(loader):
+        registry.register(name, loader, stamp)
+
+        @wraps(loader)
+        def getter():
+            return registry.get(name)
+        return getter
+    return decorator
@@ -1,4 +1,222 @@
-"""Text processing helpers"""
+"""Text processing helpers
+
+``tokenize`` is the tokenizer every service shares. It returns a ``Tokens``
+record of parallel arrays: start/end offsets into the original string
+(so offsets are exact and nothing is copied), token kind and a link flag.
+Substrings and normalized forms are only built when asked for.
+
+- WORD: a run of letters, accents included (ô, à..., precomposed or as
+  combining marks). An apostrophe or a hyphen between two letters joins two
+  words: amin'ny gives "amin" + "ny" and fandraisan-teny gives
+  "fandraisan" + "teny", the second word being linked to the first
+  (``links``). This is how the corpus cleaner splits words when it builds
+  the dictionary; ``compounds`` gives the whole spans back.
+- NUMBER: a run of decimal digits.
+- PUNCT: any other visible character, one token each.
+
+Long texts are scanned with NumPy over a code point class table; short
+ones, where array setup would dominate, with an equivalent regex.
+"""
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+
+# Token kinds
+WORD, NUMBER, PUNCT = 1, 2, 3
+# Link of a word to the previous one
+APOSTROPHE, HYPHEN = 1, 2
+
+APOSTROPHES = "'’ʼ‘`"
+HYPHENS = "-‐‑"
+# Code point classes
+_SPACE, _LETTER, _DIGIT, _OTHER, _APOSTROPHE, _HYPHEN = range(6)
+_KIND_OF_CLASS = np.array([0, WORD, NUMBER, PUNCT, PUNCT, PUNCT], dtype=np.int8)
+TABLE_SIZE = 0x10000
+# Texts shorter than this go through the regex scanner
+SHORT_TEXT = 512
+
+
+# Letters: word characters except digits, "_" and the letter apostrophe ʼ.
+# Nonspacing combining marks (category Mn) count as letters too, so that a
+# decomposed "ô" (o + U+0302) stays inside its word, with offsets into the
+# text as written; the regex class with them is slower and only used for
+# texts that have some (see _marked).
+LETTER = r"[^\W\d_ʼ]"
+# Code points that can hold combining marks (none in planes 2 to 13)
+_MARK_RANGES = (range(0x300, 0x20000), range(0xE0000, 0xE1000))
+
+
+def _token_re(letter):
+    return re.compile(
+        rf"(?P<word>{letter}+)"
+        r"|(?P<number>\d+)"
+        rf"|(?<={letter})(?P<join>[{re.escape(APOSTROPHES + HYPHENS)}])(?={letter})"
+        r"|(?P<punct>\S)"
+    )
+
+
+WORD_RE, _TOKEN_RE = re.compile(LETTER + "+"), _token_re(LETTER)
+
+
+@lru_cache(maxsize=None)
+def _marked():
+    """(marks, word regex, token regex) with combining marks as letters;
+    built the first time a text is not ASCII."""
+    marks = frozenset(chr(c) for r in _MARK_RANGES for c in r if unicodedata.category(chr(c)) == "Mn")
+    letter = rf"(?:{LETTER}|[{''.join(map(re.escape, sorted(marks)))}])"
+    return marks, re.compile(letter + "+"), _token_re(letter)
+_APOSTROPHE_FORMS = str.maketrans({c: "'" for c in APOSTROPHES})
+
+
+def _char_class(ch: str) -> int:
+    if ch in APOSTROPHES:
+        return _APOSTROPHE
+    if ch in HYPHENS:
+        return _HYPHEN
+    if ch.isspace():
+        return _SPACE
+    if ch.isdecimal():
+        return _DIGIT
+    # Same letters as the regex classes (LETTER, or with marks)
+    if ch.isalnum() or unicodedata.category(ch) == "Mn":
+        return _LETTER
+    return _OTHER
+
+
+_CLASSES = np.array([_char_class(chr(c)) for c in range(TABLE_SIZE)] + [_OTHER], dtype=np.int8)
+
+
+class Tokens:
+    """Tokens of one text as parallel arrays (offsets, kinds, links)."""
+
+    __slots__ = ("text", "starts", "ends", "kinds", "links", "_forms")
+
+    def __init__(self, text, starts, ends, kinds, links):
+        self.text = text
+        self.starts = starts
+        self.ends = ends
+        self.kinds = kinds
+        self.links = links
+        self._forms = None
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, i):
+        return self.text[self.starts[i]:self.ends[i]]
+
+    def spans(self, kind=None):
+        """(start, end) of every token, or of the tokens of one kind."""
+        starts, ends = self.starts, self.ends
+        if kind is not None:
+            keep = self.kinds == kind
+            starts, ends = starts[keep], ends[keep]
+        return list(zip(starts.tolist(), ends.tolist()))
+
+    def words(self):
+        """(word, start, end) of every WORD token."""
+        text = self.text
+        return [(text[s:e], s, e) for s, e in self.spans(WORD)]
+
+    def forms(self):
+        """Normalized forms (lower case, one apostrophe) and the form id of
+        every token. Each distinct form is built and interned once."""
+        if self._forms is None:
+            text = self.text
+            ids, by_raw, by_form, forms = [], {}, {}, []
+            for s, e in zip(self.starts.tolist(), self.ends.tolist()):
+                raw = text[s:e]
+                fid = by_raw.get(raw)
+                if fid is None:
+                    form = sys.intern(raw.lower().translate(_APOSTROPHE_FORMS))
+                    fid = by_form.get(form)
+                    if fid is None:
+                        fid = by_form[form] = len(forms)
+                        forms.append(form)
+                    by_raw[raw] = fid
+                ids.append(fid)
+            self._forms = forms, np.array(ids, dtype=np.int32)
+        return self._forms
+
+    def compounds(self):
+        """(start, end) of words joined by apostrophes or hyphens, taken
+        whole (amin'ny, fandraisan-teny); other words as they are."""
+        words = np.flatnonzero(self.kinds == WORD)
+        if not len(words):
+            return []
+        linked = self.links[words] != 0
+        # a linked word always follows a word: no token lies in between
+        heads = words[~linked]
+        tails = words[np.concatenate((~linked[1:], [True]))]
+        return list(zip(self.starts[heads].tolist(), self.ends[tails].tolist()))
+
+
+def _regexes(text):
+    """(word regex, token regex) for text: with combining marks only when
+    it has some."""
+    if not text.isascii():
+        marks, word_re, token_re = _marked()
+        if not marks.isdisjoint(text):
+            return word_re, token_re
+    return WORD_RE, _TOKEN_RE
+
+
+def _scan_regex(text):
+    starts, ends, kinds, links = [], [], [], []
+    link = 0
+    for m in _regexes(text)[1].finditer(text):
+        group = m.lastgroup
+        if group == "join":
+            link = APOSTROPHE if m.group() in APOSTROPHES else HYPHEN
+            continue
+        starts.append(m.start())
+        ends.append(m.end())
+        kinds.append(WORD if group == "word" else NUMBER if group == "number" else PUNCT)
+        links.append(link)
+        link = 0
+    return (np.array(starts, dtype=np.int32), np.array(ends, dtype=np.int32),
+            np.array(kinds, dtype=np.int8), np.array(links, dtype=np.int8))
+
+
+def _scan_numpy(text):
+    codes = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    classes = _CLASSES[np.minimum(codes, TABLE_SIZE)]
+    for i in np.flatnonzero(codes >= TABLE_SIZE).tolist():
+        classes[i] = _char_class(chr(codes[i]))
+    before = np.concatenate(([_SPACE], classes[:-1]))
+    after = np.concatenate((classes[1:], [_SPACE]))
+    join = ((classes == _APOSTROPHE) | (classes == _HYPHEN)) & (before == _LETTER) & (after == _LETTER)
+    kind = _KIND_OF_CLASS[classes]
+    kind[join] = 0
+    single = kind == PUNCT
+    begins = (kind != 0) & (single | (kind != np.concatenate(([0], kind[:-1]))))
+    stops = (kind != 0) & (single | (kind != np.concatenate((kind[1:], [0]))))
+    starts = np.flatnonzero(begins).astype(np.int32)
+    ends = np.flatnonzero(stops).astype(np.int32) + 1
+    links = np.zeros(len(starts), dtype=np.int8)
+    previous = starts[starts > 0] - 1
+    links[starts > 0] = np.where(join[previous],
+                                 np.where(classes[previous] == _APOSTROPHE, APOSTROPHE, HYPHEN), 0)
+    return starts, ends, kind[starts], links
+
+
+def tokenize(text: str) -> Tokens:
+    scan = _scan_regex if len(text) < SHORT_TEXT else _scan_numpy
+    return Tokens(text, *scan(text))
+
 
 def normalize(text: str):
-    return text.strip()
+    """Trimmed text with every apostrophe variant written as '."""
+    return text.strip().translate(_APOSTROPHE_FORMS)
+
+
+def iter_words(text: str):
+    """Yield (word, start, end) for every word in text (the WORD tokens)."""
+    if len(text) >= SHORT_TEXT:
+        yield from tokenize(text).words()
+        return
+    for m in _regexes(text)[0].finditer(text):
+        yield m.group(), m.start(), m.end()
@@ -2,3 +2,27 @@
 
 def is_text_payload(payload: dict, key: str = "text") -> bool:
     return isinstance(payload, dict) and key in payload and isinstance(payload[key], str)
+
+
+def int_param(payload: dict, key: str, default: int, low: int, high: int) -> int:
+    """payload[key] (default when absent) as an int clamped to [low, high].
+    Raises ValueError when it is not an integer."""
+    value = payload.get(key, default)
+    if isinstance(value, bool):
+        raise ValueError(f"{key} must be an integer")
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} must be an integer") from None
+    return min(max(value, low), high)
+
+
+def str_param(payload: dict, key: str, default=""):
+    """payload[key] (default when absent or null); ValueError when it is
+    not a string."""
+    value = payload.get(key)
+    if value is None:
+        return default
+    if not isinstance(value, str):
+        raise ValueError(f"{key} must be a string")
+    return value